@@ -36,13 +36,24 @@ Değerlendirme Metrikleri:
 - Yakınsama Bölümü: Hareketli ortalama kazanma oranı belirli eşik üstüne çıktığında kaydedilir.
 - Q-Değer Varyansı: Q tablosunun kararlılığının basit bir göstergesi (düşük = stabil).
 - Minimax Performansı: Optimal rakibe karşı turnuva sonuçları (en zor test).
+- Optimalite: Sabit rakiplere karşı Q*'a ortalama uzaklık ve greedy aksiyon uyumu.
+- Politika Kalitesi: Eğitim boyunca greedy hamlenin minimax-optimal olma oranı.
 
 Çıktılar:
 --------
-- results.json: Deneyin tüm özet verileri (config, training, tournament, q_variance)
+- results.json: Deneyin tüm özet verileri (config, training, tournament, q_variance, q_memory,
+  histories: indirgenmiş eğitim geçmişleri)
 - tournament.csv: Turnuva karşılaştırmaları (CSV formatı)
+- events.jsonl: Eğitim boyunca akan olaylar (aşama işaretleri, ara özetler, profil)
+- agents/*.npz: Öğrenmiş ajan çiftleri (lig ve sonraki analizler için)
+- artifacts.npz: Q tabloları, ham skorlar, geçmişler, ısı haritası sayıları ve manifest
+  (ArtifactBundle ile dizi başına bellek eşlemli okunur)
+- optimal_q.npz: Random/Minimax rakiplerine karşı Q* tabloları (değer iterasyonu)
+- visitation/*.npy: Aşama/ajan başına ham durum ziyaret sayaçları (--visitation-dump)
+- trajectories/: İkili yörünge günlüğü (--record-trajectories; TrajectoryLog ile okunur)
 - training.png: Eğitim sürecinde hareketli ortalama kazanma oranı trendi (seaborn lineplot)
 - tournament.png: Turnuva kazanma/beraberlik/mağlubiyet oranları (seaborn stacked bar)
+- policy_quality.png: Eğitim boyunca minimax-optimal greedy hamle oranı
 - heatmap_q.png: Q-Learning ajanının hücre tercih yoğunluğu (seaborn heatmap, flare colormap)
 - heatmap_sarsa.png: SARSA ajanının hücre tercih yoğunluğu (seaborn heatmap, flare colormap)
 
@@ -52,6 +63,22 @@ python tictactoe_rl.py                    # Varsayılan ayarlar
 python tictactoe_rl.py --plot            # Grafikleri açık (varsayılan)
 python tictactoe_rl.py --no-plot         # Grafikleri kapalı
 python tictactoe_rl.py --self-play-episodes 10000  # Daha fazla bölüm
+python tictactoe_rl.py --step-size visit  # 1/N(s,a) adım büyüklüğü + kapsama
+python tictactoe_rl.py --trace-lambda 0.8  # SARSA(λ) / Q(λ) uygunluk izleri
+python tictactoe_rl.py --afterstate      # Afterstate değer ajanları (9 kat küçük tablo)
+python tictactoe_rl.py --planning dyna --compare-planning  # Dyna-Q / öncelikli süpürme
+python tictactoe_rl.py --q-storage csr   # Yalnızca yasal aksiyonları saklayan Q tablosu
+python tictactoe_rl.py --actors 4        # Aktör–öğrenen dağıtık self-play
+python tictactoe_rl.py --phase-workers 4  # Bağımsız aşamalar paralel (aynı sonuç)
+python tictactoe_rl.py --adaptive-tournament  # Sonuç belli olunca duran turnuva
+python tictactoe_rl.py --visitation      # Aşama/ajan başına durum kapsaması
+python tictactoe_rl.py --record-trajectories  # Oyunları ikili günlüğe kaydet
+python tictactoe_rl.py offline outputs/trajectories  # Kayıtlardan offline FQI / SARSA
+python tictactoe_rl.py --board-rows 4 --board-cols 4 --win-length 4  # 4x4x4 oyunu
+python tictactoe_rl.py rebuild-results outputs/events.jsonl  # Olay akışından results.json
+python tictactoe_rl.py report outputs     # Kayıtlı artefaktlardan grafik/CSV/özet
+python tictactoe_rl.py league runs/ random minimax --games 200  # Tam devre lig + Elo
+python tictactoe_rl.py match "python bot.py" --opponents outputs/agents  # Harici bot maçları
 """
 
 # ============================================================================
@@ -59,11 +86,36 @@ python tictactoe_rl.py --self-play-episodes 10000  # Daha fazla bölüm
 # ============================================================================
 
 import argparse  # Komut satırı argümanlarını ayrıştırmak için
+import asyncio  # Harici bot süreçleriyle eşzamanlı oyunlar için
+import atexit  # Süreç çıkışında tamponlanmış olayları diske yazmak için
+import copy  # Aşama süreçlerine giden ajanların dizisiz kopyaları için
 import csv  # CSV formatında çıktı yazmak için
+import hashlib  # Önbellek anahtarları (içerik adresleme) için
+import heapq  # Öncelikli süpürme (prioritized sweeping) kuyruğu için
 import json  # JSON formatında çıktı yazmak için
+import math  # Güven aralıkları ve SPRT log-olabilirlik oranı için
+import multiprocessing as mp  # Aktör–öğrenen eğitiminde aktör süreçleri ve kuyruk
+import os  # Atomik dosya değiştirme ve önbellek LRU zamanları için
+import pickle  # Aşama önbelleği girdilerini saklamak için
 import random  # Rastgelelik ve epsilon-greedy keşif için
-from dataclasses import asdict, dataclass  # Veri sınıfları için
+import shlex  # Harici bot komut satırlarını ayrıştırmak için
+import struct  # Artefakt paketindeki zip yerel başlıklarını okumak için
+import sys  # Alt komut ayrıştırma için
+import threading  # Arka plan artefakt yazıcısı için
+import time  # Olay zaman damgaları ve aşama süre ölçümü için
+import zipfile  # Artefakt paketi (.npz) üyelerine tembel erişim için
+from concurrent.futures import (  # Lig eşleşmeleri ve aşamalar için süreç havuzu
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+from contextlib import contextmanager  # Aşama başlangıç/bitiş işaretleri için
+from dataclasses import asdict, dataclass, replace  # Veri sınıfları için
+from functools import partial  # Turnuva karşılaşması aşamaları için
+from multiprocessing import shared_memory  # Aktörlere politika anlık görüntüsü
 from pathlib import Path  # Dosya yolları için
+from queue import Empty, Queue  # Aktör kuyruğu zaman aşımı ve yazma kuyruğu için
+from statistics import NormalDist  # Güven düzeyinden z değeri için
 
 import numpy as np  # Sayısal işlemler, Q tablosu, vektörizasyon
 
@@ -83,6 +135,11 @@ try:
 except ImportError:  # pragma: no cover
     pd = None
 
+try:
+    import resource  # Unix: tepe bellek (max RSS) profil örnekleri için
+except ImportError:  # pragma: no cover
+    resource = None
+
 # ============================================================================
 # SABİTLER (Oyun Kuralları ve MDP Tanımı)
 # ============================================================================
@@ -113,6 +170,39 @@ POWER_3 = [3**i for i in range(9)]
 DRAW = 3
 
 
+# CACHE_VERSION: Sonuç önbelleği anahtarına giren kod sürümü: modül kaynağının
+# özeti. Elle artırılan bir etiket unutulduğunda eski kodun girdileri sessizce
+# kullanılıyordu; kaynaktaki her değişiklik (grafik/log dahil) önbelleği yeniler.
+# Kaynak okunamazsa None olur ve önbellek kapatılır.
+def source_fingerprint():
+    try:
+        return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()[:16]
+    except (NameError, OSError):
+        return None
+
+
+CACHE_VERSION = source_fingerprint()
+
+# CLASSIC_DIMS: Önceden sayılmış STATE_INDEX'in geçerli olduğu (satır, sütun, k) boyutu.
+CLASSIC_DIMS = (3, 3, 3)
+
+# LAZY_INITIAL_CAPACITY: m×n×k tahtalarda Q tablosunun başlangıç satır kapasitesi.
+# Durumlar ilk ziyarette indekslendiği için tablo gerektikçe ikiye katlanarak büyür.
+LAZY_INITIAL_CAPACITY = 4096
+
+# Q değer tipi seçenekleri: float32 (varsayılan), float16 (yarı bellek) ve
+# int16 (sabit ölçekli tamsayı, yarı bellek). Güncelleme aritmetiği her durumda
+# float64 ile yapılır; yalnızca saklanan değer yuvarlanır.
+Q_DTYPE_CHOICES = ("float32", "float16", "int16")
+
+# Adım büyüklüğü programları: sabit α, 1/N(s,a) veya polinom 1/N(s,a)^ω.
+STEP_SIZE_CHOICES = ("constant", "visit", "polynomial")
+
+# int16 modunda saklanan tamsayı * ölçek = Q değeri. 2^-14 ile aralık ±2'dir;
+# ödüller [-1, 1] olduğundan Q değerleri bu aralıkta kalır.
+DEFAULT_INT16_Q_SCALE = 2.0**-14
+
+
 def decode_state(state_index):
     """
     Taban-3 kodlanmış durum indeksini 3x3 tahta dizisine dönüştürür.
@@ -262,6 +352,153 @@ STATE_INDEX = generate_valid_state_mapping()
 VALID_STATE_COUNT = len(STATE_INDEX)
 
 
+def generate_win_lines(rows, cols, k):
+    """
+    m×n tahtada k uzunluğundaki tüm kazanma çizgilerini programatik olarak üretir.
+
+    Hücreler satır öncelikli (row-major) indekslenir: hücre = satır * cols + sütun.
+    Dört yön taranır: yatay, dikey, sol üst -> sağ alt ve sağ üst -> sol alt
+    çaprazları. 3x3x3 için WIN_LINES ile aynı 8 çizgiyi (farklı sırada) verir.
+
+    Argümanlar:
+        rows (int): Satır sayısı (m)
+        cols (int): Sütun sayısı (n)
+        k (int): Kazanmak için gereken ardışık taş sayısı
+
+    Dönüş:
+        tuple[tuple[int]]: Her biri k hücre indeksinden oluşan kazanma çizgileri
+    """
+    lines = []
+    for row in range(rows):
+        for col in range(cols):
+            for d_row, d_col in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + d_row * (k - 1)
+                end_col = col + d_col * (k - 1)
+                if not (0 <= end_row < rows and 0 <= end_col < cols):
+                    continue
+                lines.append(
+                    tuple(
+                        (row + d_row * step) * cols + (col + d_col * step)
+                        for step in range(k)
+                    )
+                )
+    return tuple(lines)
+
+
+def legal_action_mask(boards, win_lines):
+    """
+    Durum tahtaları için vektörize yasal aksiyon maskesi.
+
+    Boş hücreler yasaldır; terminal durumlarda (kazanan var veya tahta dolu)
+    hiçbir aksiyon yasal değildir.
+
+    Argümanlar:
+        boards (np.ndarray): (n_states, n_cells) tahta dizisi (0/1/2)
+        win_lines (tuple[tuple[int]]): Kazanma çizgileri
+
+    Dönüş:
+        np.ndarray: (n_states, n_cells) bool maske
+    """
+    boards = np.asarray(boards)
+    terminal = np.all(boards != 0, axis=1)
+    lines = np.array(win_lines)
+    for player in (1, 2):
+        terminal |= np.any(np.all(boards[:, lines] == player, axis=2), axis=1)
+    return (boards == 0) & ~terminal[:, None]
+
+
+# STATE_BOARDS: STATE_INDEX sırasıyla tüm geçerli tahtalar (5478, 9).
+# LEGAL_ACTIONS: Aynı sırayla yasal aksiyon maskesi; vektörize politika analizleri için.
+STATE_BOARDS = np.array(list(STATE_INDEX), dtype=np.int8)
+LEGAL_ACTIONS = legal_action_mask(STATE_BOARDS, WIN_LINES)
+
+
+def tictactoe_transitions():
+    """
+    3x3 oyun grafiğinin vektörize geçiş tabloları (STATE_INDEX sırasıyla).
+
+    Dönüş:
+        tuple: (next_state, mover, winner)
+            - next_state (np.ndarray): (n_states, 9) int32; s'de sıradaki oyuncu a'ya
+              oynayınca ulaşılan durum indeksi, yasal olmayan aksiyonlar için -1
+            - mover (np.ndarray): (n_states,) sıradaki oyuncu (1=X, 2=O)
+            - winner (np.ndarray): (n_states,) 0 devam, 1/2 kazanan, DRAW beraberlik
+    """
+    boards = STATE_BOARDS.astype(np.int32)
+    powers = np.array(POWER_3, dtype=np.int32)
+    codes = boards @ powers
+    code_to_index = np.full(3**9, -1, dtype=np.int32)
+    code_to_index[codes] = np.arange(len(codes), dtype=np.int32)
+
+    x_count = np.count_nonzero(boards == 1, axis=1)
+    o_count = np.count_nonzero(boards == 2, axis=1)
+    mover = np.where(x_count == o_count, 1, 2).astype(np.int8)
+
+    next_codes = codes[:, None] + mover[:, None].astype(np.int32) * powers[None, :]
+    next_state = np.where(
+        LEGAL_ACTIONS, code_to_index[np.where(LEGAL_ACTIONS, next_codes, 0)], -1
+    )
+
+    lines = np.array(WIN_LINES)
+    winner = np.zeros(len(codes), dtype=np.int8)
+    winner[np.all(boards != 0, axis=1)] = DRAW
+    for player in (1, 2):
+        winner[np.any(np.all(boards[:, lines] == player, axis=2), axis=1)] = player
+    return next_state.astype(np.int32), mover, winner
+
+
+# STATE_TRANSITIONS: (next_state, mover, winner) tabloları; AFTERSTATES[s, a], s'de
+# sıradaki oyuncu a'ya oynayınca oluşan tahtanın (afterstate) STATE_INDEX indeksidir.
+STATE_TRANSITIONS = tictactoe_transitions()
+AFTERSTATES = STATE_TRANSITIONS[0]
+
+
+class LazyStateIndex:
+    """
+    Büyük tahtalar için ihtiyaç anında (lazy) durum indeksleyici.
+
+    3x3 tahtada tüm geçerli durumlar önceden sayılabilir (STATE_INDEX), ancak
+    4x4 (3^16 ≈ 43 milyon) veya 5x5 (3^25 ≈ 8.5e11) tahtalarda bu mümkün değildir.
+    Bu sınıf tahtayı taban-3 tamsayı koduna çevirir ve bir durumla ilk kez
+    karşılaşıldığında ona sıradaki kompakt indeksi atar. Böylece indeks uzayı
+    yalnızca gerçekten ziyaret edilen durumlar kadar büyür.
+    """
+
+    def __init__(self, n_cells):
+        self.powers = [3**i for i in range(n_cells)]
+        self.codes = {}
+
+    def __len__(self):
+        return len(self.codes)
+
+    def encode(self, board):
+        # Taban-3 kod: boş hücreler (0) toplama katkı yapmadığı için atlanır.
+        code = 0
+        for value, power in zip(board, self.powers):
+            if value:
+                code += value * power
+        return self.index_code(code)
+
+    def index_code(self, code):
+        # Taban-3 kodun kompakt indeksi; ilk kez görülen koda sıradaki indeks atanır.
+        index = self.codes.get(code)
+        if index is None:
+            index = len(self.codes)
+            self.codes[code] = index
+        return index
+
+    def code_array(self):
+        # İndeks sırasıyla taban-3 kodlar (ajan kaydı ve yeniden eşleme için).
+        return np.fromiter(self.codes, dtype=np.int64, count=len(self.codes))
+
+    def boards(self):
+        # İndeks sırasıyla görülen tahtalar; dict ekleme sırasını korur.
+        # Not: int64 taban-3 çözümleme 39 hücreye kadar (3^39 < 2^63) geçerlidir.
+        codes = self.code_array()
+        powers = np.array(self.powers, dtype=np.int64)
+        return ((codes[:, None] // powers) % 3).astype(np.int8)
+
+
 @dataclass
 class Config:
     """
@@ -308,20 +545,100 @@ class Config:
     epsilon_end: float = 0.01  # Bitiş: %1 rastgele (neredeyse tam sömürü)
     epsilon_decay: float = 0.995  # Her bölümde epsilon *= 0.995
 
+    # --- Adım Büyüklüğü Programı ---
+    step_size: str = "constant"  # "constant" (α), "visit" (1/N) veya "polynomial"
+    step_size_power: float = 0.8  # Polinom program: α = 1/N(s,a)^ω
+    visit_counts: bool = False  # Sabit α'da da N(s,a) tut (kapsama istatistikleri)
+
+    # --- Uygunluk İzleri (λ) ---
+    trace_lambda: float = 0.0  # > 0 ise SARSA(λ) / Watkins Q(λ) kullanılır
+
+    # --- Afterstate Değerleri ---
+    afterstate: bool = False  # Q(s,a) yerine hamle sonrası tahta değeri V(b) (3x3)
+
+    # --- Model Tabanlı Planlama (Q-Learning) ---
+    planning: str = (
+        "none"  # "none", "dyna" (Dyna-Q) veya "prioritized" (öncelikli süpürme)
+    )
+    planning_steps: int = 10  # Gerçek adım başına model yedeklemesi
+    planning_theta: float = 1e-4  # Öncelikli süpürmede kuyruk eşiği (|TD hatası|)
+
     # --- Eğitim Ayarları ---
     self_play_episodes: int = 5000  # Self-play bölümleri (X ve O aynı algoritma)
     cross_play_episodes: int = 5000  # Cross-play bölümleri (Q vs SARSA)
     baseline_episodes: int = 3000  # Random rakibe karşı bölümler
 
+    # --- Aktör–Öğrenen (dağıtık self-play) ---
+    actors: int = 0  # > 0 ise self-play bu kadar aktör süreciyle üretilir
+    actor_batch_episodes: int = 16  # Aktör başına kuyruğa gönderilen yığın (bölüm)
+    actor_sync_episodes: int = 64  # Politika yayın/yenileme aralığı (bölüm)
+
+    # --- Aşama Zamanlayıcı ---
+    phase_workers: int = 1  # Bağımsız aşamalar için süreç sayısı (1 = sıralı, 0 = CPU)
+
     # --- Değerlendirme Ayarları ---
     tournament_games: int = 500  # Turnuva oyun sayısı (her karşılaşma için)
+    tournament_adaptive: bool = False  # Sonuç belli olunca karşılaşmayı durdur
+    tournament_batch: int = 50  # Uyarlanır modda durma denetimleri arası oyun
+    tournament_ci_width: float = 0.1  # Hedef güven aralığı genişliği
+    tournament_confidence: float = 0.95  # Aralık güven düzeyi / SPRT hata oranları
+    tournament_sprt_delta: float = 0.1  # SPRT hipotezleri: P(kazanma) = 0.5 ± delta
 
     # --- Görselleştirme ve Logging ---
     moving_avg_window: int = 200  # Hareketli ortalama pencere genişliği
+    history_points: int = 2000  # Geçmiş başına saklanan/çizilen nokta (0 = tümü)
+    history_downsample: str = "lttb"  # İndirgeme: "lttb" (şekil korur) veya "minmax"
     log_interval: int = 500  # Eğitim log aralığı (0 = kapalı)
     convergence_threshold: float = 0.8  # Yakınsama eşiği (80% kazanç)
 
+    # --- Tahta Boyutu (m×n×k) ---
+    board_rows: int = 3  # Satır sayısı (m)
+    board_cols: int = 3  # Sütun sayısı (n)
+    win_length: int = 3  # Kazanmak için gereken ardışık taş (k)
+
+    # --- Q Depolama ---
+    q_storage: str = "dense"  # "dense", "sparse" (ziyaret edilenler) veya "csr" (yasal)
+    q_dtype: str = "float32"  # Saklama tipi: "float32", "float16" veya "int16"
+    q_int16_scale: float = DEFAULT_INT16_Q_SCALE  # int16 modunda sabit ölçek
+
+    # --- Olay Akışı (JSONL) ---
+    event_log: bool = True  # output_dir/events.jsonl akışını yaz
+    event_interval: int = 100  # Eğitim ara özeti aralığı (bölüm)
+    event_flush_every: int = 64  # Bu kadar olay birikince diske yaz
+    event_flush_seconds: float = 5.0  # En geç bu kadar saniyede bir diske yaz
+
+    # --- Sonuç Önbelleği ---
+    cache: bool = True  # Aynı girdili aşamaları önbellekten yükle
+    cache_dir: str = ".rl_cache"  # Önbellek klasörü
+    cache_max_mb: float = 512.0  # Boyut sınırı (aşılınca LRU tahliyesi)
+
+    # --- Durum Ziyaret Sayaçları ---
+    visitation: bool = False  # Aşama/ajan başına durum ziyaretleri (results.json)
+    visitation_interval: int = 500  # Kapsama eğrisi kayıt aralığı (bölüm)
+    visitation_dump: bool = False  # Ham sayaçları output_dir/visitation/*.npy yaz
+
+    # --- Yörünge Kaydı ---
+    record_trajectories: bool = False  # Oyunları output_dir/trajectories'e kaydet
+    trajectory_flush_episodes: int = 4096  # Bu kadar bölümde bir diske ekle
+
+    # --- Optimal Referans ---
+    optimal_baseline: bool = True  # 3x3'te Q* (Random/Minimax) ve aşama başına hata
+    quality_interval: int = (
+        100  # Minimax-optimal hamle oranı ölçüm aralığı (0 = kapalı)
+    )
+
+    # --- Artefakt Yazımı ---
+    background_io: bool = True  # JSON/CSV/grafik/ajan dosyalarını arka planda yaz
+    bundle: bool = True  # Sayısal artefaktları output_dir/artifacts.npz'ye yaz
+    bundle_compress: bool = False  # Paketi sıkıştır (memmap yerine açarak okunur)
+
+    # --- Grafikler ---
+    plot_format: str = "png"  # Grafik biçimi: "png", "svg", "pdf" veya "jpg"
+    plot_dpi: int = 300  # Raster grafik çözünürlüğü
+    plot_workers: int = 0  # Çizim süreç sayısı (0 = otomatik, 1 = sıralı)
+
     # --- Diğer ---
+    save_agents: bool = True  # Ajan çiftlerini output_dir/agents/*.npz olarak kaydet
     seed: int = 42  # Rastgelelik tohumu (tekrarlanabilirlik için)
     output_dir: str = "outputs"  # Çıktı klasörü
 
@@ -333,6 +650,14 @@ class AgentPair:
     agent_o: "Agent"
 
 
+@dataclass
+class ExperimentResult:
+    # run_experiment çıktısı: kaydedilen özet, öğrenen ajanlar (ad -> ajan) ve ortam.
+    payload: dict
+    agents: dict
+    env: "TicTacToeEnv"
+
+
 # Oyuncu değişimi: X (1) <-> O (2).
 def opponent(player):
     return 2 if player == 1 else 1
@@ -361,19 +686,28 @@ def encode_state(board):
 
 
 # Eğitim sırasında tekrar eden özet işleri için ortak fonksiyon.
-def record_training_summary(label, scores, config, training_log, histories):
+def record_training_summary(
+    label, scores, config, training_log, histories, event_log=None
+):
     # Hareketli ortalama ve yakınsama bilgilerini tek noktadan hesaplanır.
     summary = summarize_scores(scores)
     summary["convergence_episode"] = convergence_episode(
         scores, config.moving_avg_window, config.convergence_threshold
     )
     training_log[label] = summary
-    histories[label] = moving_average(scores, config.moving_avg_window)
+    histories[label] = training_history(
+        scores,
+        config.moving_avg_window,
+        config.history_points,
+        config.history_downsample,
+    )
+    if event_log is not None:
+        event_log.emit("training_summary", label=label, summary=summary)
     return summary
 
 
 # Ajan çiftini yapılandıran yardımcı: Q-Learning veya SARSA için kullanılır.
-def build_agent_pair(name, agent_cls, prefix, n_states, config):
+def build_agent_pair(name, agent_cls, prefix, n_states, config, n_actions=9):
     # Aynı hiperparametrelerle X ve O oyuncuları oluşturulur.
     return AgentPair(
         name,
@@ -385,6 +719,14 @@ def build_agent_pair(name, agent_cls, prefix, n_states, config):
             config.epsilon_start,
             config.epsilon_end,
             config.epsilon_decay,
+            n_actions=n_actions,
+            q_storage=config.q_storage,
+            q_dtype=config.q_dtype,
+            q_scale=config.q_int16_scale,
+            step_size=config.step_size,
+            step_size_power=config.step_size_power,
+            visit_counts=config.visit_counts,
+            **agent_cls.config_kwargs(config),
         ),
         agent_cls(
             f"{prefix}-O",
@@ -394,15 +736,49 @@ def build_agent_pair(name, agent_cls, prefix, n_states, config):
             config.epsilon_start,
             config.epsilon_end,
             config.epsilon_decay,
+            n_actions=n_actions,
+            q_storage=config.q_storage,
+            q_dtype=config.q_dtype,
+            q_scale=config.q_int16_scale,
+            step_size=config.step_size,
+            step_size_power=config.step_size_power,
+            visit_counts=config.visit_counts,
+            **agent_cls.config_kwargs(config),
         ),
     )
 
 
+# Ortam fabrikası: klasik 3x3x3 için önceden sayılmış STATE_INDEX, diğerleri için m×n×k.
+def make_env(config):
+    dims = (config.board_rows, config.board_cols, config.win_length)
+    if dims == CLASSIC_DIMS:
+        return TicTacToeEnv()
+    return MNKEnv(*dims)
+
+
+def is_classic_board(env):
+    # Klasik 3x3x3 ortamı mı? Sınıf kimliği yerine boyutlara bakılır: önbellekten
+    # veya başka bir modül adıyla (__main__ / tictactoe_rl) yüklenen ortamlarda da doğru.
+    return (env.rows, env.cols, env.k) == CLASSIC_DIMS
+
+
 class TicTacToeEnv:
     # Ortamın MDP geçişi: (tahta, aksiyon, oyuncu) -> (yeni_tahta, kazanan, done)
+    rows = 3
+    cols = 3
+    k = 3
+    n_actions = 9
+    n_states = VALID_STATE_COUNT
+
     def reset(self):
         return [0] * 9
 
+    def encode_state(self, board):
+        return encode_state(board)
+
+    def legal_action_mask(self):
+        return LEGAL_ACTIONS
+
     def step(self, board, action, player):
         if board[action] != 0:
             raise ValueError("Invalid action: cell already occupied")
@@ -413,6 +789,71 @@ class TicTacToeEnv:
         return new_board, winner, done
 
 
+class MNKEnv:
+    """
+    Genelleştirilmiş m×n×k oyun ortamı (rows x cols tahta, k taşı dizen kazanır).
+
+    TicTacToeEnv ile aynı arayüzü (reset, step, encode_state, n_actions, n_states)
+    sunar; bu sayede ajanlar, play_episode ve turnuva değişmeden çalışır.
+
+    Verimlilik:
+    ----------
+    - Kazanma çizgileri generate_win_lines() ile bir kez üretilir.
+    - Her hücre için o hücreden geçen çizgiler önceden gruplanır; step() yalnızca
+      son hamlenin geçtiği çizgileri kontrol eder (tüm çizgiler yerine).
+    - Durumlar LazyStateIndex ile ilk ziyarette indekslenir; durum uzayı önceden
+      sayılmaz. n_states şu ana kadar görülen durum sayısıdır ve büyüyebilir.
+    """
+
+    def __init__(self, rows=3, cols=3, k=3):
+        if rows < 1 or cols < 1 or k < 1:
+            raise ValueError("rows, cols ve k pozitif olmalıdır")
+        if k > max(rows, cols):
+            raise ValueError(f"k={k} tahtaya sığmıyor ({rows}x{cols})")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.n_actions = rows * cols
+        self.win_lines = generate_win_lines(rows, cols, k)
+        self.lines_through = tuple(
+            tuple(line for line in self.win_lines if cell in line)
+            for cell in range(self.n_actions)
+        )
+        self.state_index = LazyStateIndex(self.n_actions)
+
+    @property
+    def n_states(self):
+        return len(self.state_index)
+
+    def reset(self):
+        return [0] * self.n_actions
+
+    def encode_state(self, board):
+        return self.state_index.encode(board)
+
+    def legal_action_mask(self):
+        # Şu ana kadar indekslenen durumlar için yasal aksiyon maskesi.
+        return legal_action_mask(self.state_index.boards(), self.win_lines)
+
+    def step(self, board, action, player):
+        if board[action] != 0:
+            raise ValueError("Invalid action: cell already occupied")
+        new_board = list(board)
+        new_board[action] = player
+        # Yalnızca son hamlenin geçtiği çizgiler yeni bir kazanç oluşturabilir.
+        if any(
+            all(new_board[cell] == player for cell in line)
+            for line in self.lines_through[action]
+        ):
+            winner = player
+        elif 0 not in new_board:
+            winner = DRAW
+        else:
+            winner = 0
+        done = winner != 0
+        return new_board, winner, done
+
+
 class Agent:
     """
     Tüm ajanlar için taban (base) sınıf.
@@ -513,6 +954,411 @@ class Agent:
         self.pending_action = None
 
 
+class SparseQTable:
+    """
+    Yalnızca ziyaret edilen durumları saklayan seyrek (sparse) Q tablosu.
+
+    Yoğun (dense) tablo np.zeros((n_states, n_actions)) her durum için satır ayırır;
+    büyük tahtalarda durumların çoğu hiç ziyaret edilmez. Bu sınıf açık adresleme
+    (open addressing, doğrusal yoklama) kullanan bir hash tablosu ile durum
+    anahtarlarını dizi tabanlı satırlara eşler. Satır, duruma ilk yazıldığında açılır.
+
+    Yapı:
+    -----
+    - keys: Slot başına durum anahtarı (int64, boş slot = -1)
+    - slots: Slot başına satır numarası (int32)
+    - values: (kapasite, n_actions) satır deposu; ikiye katlanarak büyür
+
+    Arayüz numpy dizisi ile aynıdır: q[s] satırı, q[s, a] tek değeri okur ve
+    q[s, a] = v yazar. Böylece Q-Learning/SARSA güncellemeleri ve greedy seçim
+    yoğun ve seyrek depolamada aynı kodla çalışır. Hiç yazılmamış durumlar için
+    salt okunur sıfır satırı döner (tablo büyümez).
+    """
+
+    # Doldurma oranı bu eşiği geçince slot dizisi ikiye katlanır (yoklama zinciri kısa kalır).
+    MAX_LOAD = 0.5
+
+    def __init__(self, n_actions, dtype=np.float32, capacity=1024):
+        self.n_actions = n_actions
+        self.dtype = np.dtype(dtype)
+        self.size = 0
+        self._allocate_slots(capacity)
+        self.values = np.zeros((capacity // 2, n_actions), dtype=self.dtype)
+        self._zero_row = np.zeros(n_actions, dtype=self.dtype)
+        self._zero_row.flags.writeable = False
+
+    def _allocate_slots(self, capacity):
+        self.keys = np.full(capacity, -1, dtype=np.int64)
+        self.slots = np.zeros(capacity, dtype=np.int32)
+        self.mask = capacity - 1
+
+    def _probe(self, key):
+        # Knuth çarpımsal hash + doğrusal yoklama: anahtarın veya ilk boş slotun konumu.
+        keys = self.keys
+        position = (key * 2654435761) & self.mask
+        while True:
+            stored = keys[position]
+            if stored == key or stored == -1:
+                return position
+            position = (position + 1) & self.mask
+
+    def row_index(self, key, create=False):
+        # Durumun satır numarası; yoksa -1 (create=True ise yeni satır açılır).
+        position = self._probe(key)
+        if self.keys[position] == key:
+            return int(self.slots[position])
+        if not create:
+            return -1
+        if (self.size + 1) > self.MAX_LOAD * len(self.keys):
+            self._rehash(2 * len(self.keys))
+            position = self._probe(key)
+        if self.size == len(self.values):
+            grown = np.zeros((2 * len(self.values), self.n_actions), dtype=self.dtype)
+            grown[: self.size] = self.values
+            self.values = grown
+        row = self.size
+        self.keys[position] = key
+        self.slots[position] = row
+        self.size += 1
+        return row
+
+    def _rehash(self, capacity):
+        used = self.keys >= 0
+        old_keys = self.keys[used]
+        old_rows = self.slots[used]
+        self._allocate_slots(capacity)
+        for key, row in zip(old_keys.tolist(), old_rows.tolist()):
+            position = self._probe(key)
+            self.keys[position] = key
+            self.slots[position] = row
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            state, action = index
+            if isinstance(state, np.ndarray):
+                # Durum dizisiyle toplu okuma (ör. afterstate adayları): q[states, a].
+                return np.array(
+                    [self[int(key), action] for key in state], dtype=self.values.dtype
+                )
+            row = self.row_index(state)
+            if row < 0:
+                return self._zero_row[action]
+            return self.values[row, action]
+        row = self.row_index(index)
+        if row < 0:
+            return self._zero_row
+        return self.values[row]
+
+    def __setitem__(self, index, value):
+        # Satır önce açılır: row_index() values dizisini büyütüp değiştirebilir.
+        if not isinstance(index, tuple):
+            row = self.row_index(index, create=True)
+            self.values[row] = value
+            return
+        state, action = index
+        row = self.row_index(state, create=True)
+        self.values[row, action] = value
+
+    def stored_values(self):
+        # Yalnızca açılmış satırlar (istatistikler için kopyasız görünüm).
+        return self.values[: self.size]
+
+    @property
+    def nbytes(self):
+        # Ayrılmış tüm bellek: anahtar/slot dizileri + satır deposu.
+        return self.keys.nbytes + self.slots.nbytes + self.values.nbytes
+
+    def to_dense(self, n_states):
+        # Yoğun (n_states, n_actions) kopyası; ziyaret edilmeyen satırlar sıfır kalır.
+        dense = np.zeros((n_states, self.n_actions), dtype=self.dtype)
+        used = (self.keys >= 0) & (self.keys < n_states)
+        dense[self.keys[used]] = self.values[self.slots[used]]
+        return dense
+
+
+def csr_layout(legal_mask):
+    """
+    Yasal aksiyon maskesinden CSR satır düzeni (aynı maskeli tablolar paylaşır).
+
+    Dönüş:
+        tuple: (offsets, actions, legal_bits)
+            offsets: Durum başına satır başlangıcı (int32, n_states + 1)
+            actions: Değer başına aksiyon numarası, satır içinde artan (uint8)
+            legal_bits: Durum başına yasal aksiyon bit maskesi (uint16/32/64)
+    """
+    legal_mask = np.asarray(legal_mask, dtype=bool)
+    n_actions = legal_mask.shape[1]
+    if n_actions > 63:
+        raise ValueError("CSR Q tablosu en fazla 63 aksiyonu destekler")
+    offsets = np.zeros(len(legal_mask) + 1, dtype=np.int32)
+    np.cumsum(legal_mask.sum(axis=1), out=offsets[1:])
+    actions = np.nonzero(legal_mask)[1].astype(np.uint8)
+    bits_dtype = np.uint16 if n_actions <= 16 else np.uint32
+    if n_actions > 32:
+        bits_dtype = np.uint64
+    legal_bits = (
+        (legal_mask.astype(np.uint64) << np.arange(n_actions, dtype=np.uint64))
+        .sum(axis=1)
+        .astype(bits_dtype)
+    )
+    return offsets, actions, legal_bits
+
+
+class CSRQTable:
+    """
+    Yalnızca yasal aksiyonları saklayan sıkıştırılmış satır (CSR) Q tablosu.
+
+    Yoğun tablo her durum için n_actions değer ayırır; oysa çoğu durumda boş hücre
+    sayısı daha azdır, terminal durumlarda hiç yoktur. Bu düzende değerler tek bir
+    düz dizide tutulur ve s durumunun satırı values[offsets[s]:offsets[s + 1]]
+    dilimidir. Satırdaki aksiyonlar actions dizisinde artan sırayla durur.
+    Satır içi konum, yasal aksiyon bit maskesinde a'dan küçük bitlerin sayısıdır.
+    3x3'te 49.302 hücre yerine 16.167 değer saklanır.
+
+    Yapı:
+    -----
+    - offsets, actions, legal_bits: Satır düzeni (csr_layout; aynı maskeli
+      tablolar arasında paylaşılır, nbytes'a girmez)
+    - values: Düz değer dizisi (Q tablosunun dtype'ı)
+
+    Arayüz yoğun tabloyla aynıdır: q[s] satırı yoğun (n_actions) vektör olarak,
+    q[s, a] tek değeri döndürür ve q[s, a] = v yazar. Yasal olmayan hücreler
+    örtük sıfırdır ve yazılamaz. row_max() bu örtük sıfırları da sayar, yani
+    yoğun np.max(q[s]) ile aynı sonucu verir. legal_max() ve legal_argmax() tüm
+    satırlar veya durum dizileri üzerinde vektörize çalışır (PolicyQualityTracker
+    CSR ajanlarda tabloyu yoğunlaştırmadan greedy aksiyonları böyle alır).
+    """
+
+    def __init__(self, layout, n_actions, dtype=np.float32):
+        self.offsets, self.actions, self.legal_bits = layout
+        self.n_actions = n_actions
+        self.dtype = np.dtype(dtype)
+        self.values = np.zeros(int(self.offsets[-1]), dtype=self.dtype)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @property
+    def shape(self):
+        return len(self), self.n_actions
+
+    @property
+    def nbytes(self):
+        # Yalnızca bu tablonun değerleri (paylaşılan düzen için layout_nbytes).
+        return self.values.nbytes
+
+    @property
+    def layout_nbytes(self):
+        return self.offsets.nbytes + self.actions.nbytes + self.legal_bits.nbytes
+
+    def position(self, state, action):
+        # (s, a) değerinin düz dizideki konumu; yasal değilse -1.
+        bits = self.legal_bits.item(state)
+        if not (bits >> action) & 1:
+            return -1
+        return self.offsets.item(state) + (bits & ((1 << action) - 1)).bit_count()
+
+    def row(self, state):
+        # (aksiyonlar, değerler) dilimleri; değerler görünümdür (yazılabilir).
+        start, end = self.offsets.item(state), self.offsets.item(state + 1)
+        return self.actions[start:end], self.values[start:end]
+
+    def legal_values(self, state):
+        # Yasal aksiyonların değerleri (artan aksiyon sırasıyla) Python listesi olarak;
+        # aksiyon seçiminde yoğun satırı yeniden kurmadan karşılaştırma için.
+        return self.values[
+            self.offsets.item(state) : self.offsets.item(state + 1)
+        ].tolist()
+
+    def __getitem__(self, index):
+        if isinstance(index, tuple):
+            state, action = index
+            position = self.position(state, action)
+            return self.values[position] if position >= 0 else self.dtype.type(0)
+        actions, values = self.row(index)
+        dense = np.zeros(self.n_actions, dtype=self.dtype)
+        dense[actions] = values
+        return dense
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, tuple):
+            actions, values = self.row(index)
+            values[:] = np.asarray(value, dtype=self.dtype)[actions]
+            return
+        state, action = index
+        position = self.position(state, action)
+        if position < 0:
+            raise IndexError(
+                f"CSR Q tablosu: {action} aksiyonu {state} durumunda yasal değil"
+            )
+        self.values[position] = value
+
+    def row_max(self, state):
+        # Yoğun tabloyla aynı anlam: yasal değerlerin ve örtük sıfırların en büyüğü.
+        start, end = self.offsets[state], self.offsets[state + 1]
+        if start == end:
+            return self.dtype.type(0)
+        value = self.values[start:end].max()
+        if end - start < self.n_actions and value < 0:
+            return self.dtype.type(0)
+        return value
+
+    def _gather(self, states):
+        # Seçili satırların değerleri art arda dizilir: (satır uzunlukları, her
+        # satırın dizideki başlangıcı, düz konumlar).
+        if states is None:
+            states = np.arange(len(self))
+        states = np.asarray(states, dtype=np.int64)
+        starts = self.offsets[states].astype(np.int64)
+        lengths = self.offsets[states + 1] - starts
+        bounds = np.cumsum(lengths) - lengths
+        flat = np.repeat(starts - bounds, lengths) + np.arange(int(lengths.sum()))
+        return lengths, bounds, flat
+
+    def legal_max(self, states=None):
+        # Satır başına yalnızca yasal aksiyonlar üzerinden en büyük değer
+        # (yasal aksiyonu olmayan satırlar için 0).
+        lengths, bounds, flat = self._gather(states)
+        result = np.zeros(len(lengths), dtype=self.dtype)
+        filled = lengths > 0
+        if filled.any():
+            result[filled] = np.maximum.reduceat(self.values[flat], bounds[filled])
+        return result
+
+    def legal_argmax(self, states=None):
+        # Satır başına yasal aksiyonlar arasında argmax (eşitlikte ilk aksiyon);
+        # yasal aksiyonu olmayan satırlar için -1. greedy_actions() ile aynı sonuç.
+        lengths, bounds, flat = self._gather(states)
+        result = np.full(len(lengths), -1, dtype=np.int64)
+        filled = lengths > 0
+        if filled.any():
+            values = self.values[flat]
+            best = np.maximum.reduceat(values, bounds[filled])
+            # En büyük değere eşit ilk konum: eşit olmayanlar dizi sonuna itilir.
+            hits = np.where(
+                values == np.repeat(best, lengths[filled]),
+                np.arange(len(flat)),
+                len(flat),
+            )
+            first = np.minimum.reduceat(hits, bounds[filled])
+            result[filled] = self.actions[flat[first]]
+        return result
+
+    def stored_values(self):
+        return self.values
+
+    def to_dense(self, n_states=None):
+        # Yoğun (n_states, n_actions) kopyası; yasal olmayan hücreler sıfır.
+        n_states = len(self) if n_states is None else n_states
+        dense = np.zeros((n_states, self.n_actions), dtype=self.dtype)
+        rows = min(n_states, len(self))
+        end = int(self.offsets[rows])
+        row_ids = np.repeat(np.arange(rows), np.diff(self.offsets[: rows + 1]))
+        dense[row_ids, self.actions[:end]] = self.values[:end]
+        return dense
+
+
+# Q depolama seçenekleri: yoğun numpy dizisi, seyrek hash tablosu veya yalnızca
+# yasal aksiyonları saklayan CSR düzeni (3x3, STATE_INDEX'ten türetilir).
+Q_STORAGE_CHOICES = ("dense", "sparse", "csr")
+
+# 3x3 CSR satır düzeni: ilk csr tablosunda bir kez kurulur, tüm tablolar paylaşır.
+_CSR_LAYOUT = {}
+
+
+def make_q_table(storage, n_states, n_actions, dtype=np.float32):
+    # Q tablosu fabrikası: tüm arka uçlar aynı indeksleme arayüzünü sunar.
+    if storage == "dense":
+        return np.zeros((max(n_states, 1), n_actions), dtype=dtype)
+    if storage == "sparse":
+        return SparseQTable(n_actions, dtype=dtype)
+    if storage == "csr":
+        # Satır düzeni önceden sayılmış durum uzayından gelir (yalnızca 3x3 Q(s, a)).
+        if (n_states, n_actions) != LEGAL_ACTIONS.shape:
+            raise ValueError(
+                "csr depolama yalnızca 3x3 durum-aksiyon tablolarında kullanılabilir "
+                "(m×n×k durumları tembel indekslenir, afterstate tablosu tek sütundur)"
+            )
+        if "layout" not in _CSR_LAYOUT:
+            _CSR_LAYOUT["layout"] = csr_layout(LEGAL_ACTIONS)
+        return CSRQTable(_CSR_LAYOUT["layout"], n_actions, dtype=dtype)
+    raise ValueError(f"Bilinmeyen Q depolama türü: {storage}")
+
+
+def q_table_array(agent, n_states):
+    # Depolama türünden bağımsız yoğun (n_states, n_actions) Q görünümü/kopyası.
+    # int16 tablolar ölçekle çarpılarak float32 Q değerlerine çevrilir.
+    if isinstance(agent.q, (SparseQTable, CSRQTable)):
+        table = agent.q.to_dense(n_states)
+    else:
+        table = agent.q[:n_states]
+    if agent.q_scale:
+        return table.astype(np.float32) * np.float32(agent.q_scale)
+    return table
+
+
+def q_memory(agent):
+    # Bellek muhasebesi: results.json için depolama türü, satır sayısı ve bayt.
+    dtype = str(agent.q.dtype)
+    if isinstance(agent.q, SparseQTable):
+        return {
+            "storage": "sparse",
+            "dtype": dtype,
+            "rows": len(agent.q),
+            "bytes": agent.q.nbytes,
+        }
+    if isinstance(agent.q, CSRQTable):
+        # Satır düzeni aynı maskeli tüm tablolarca paylaşılır (layout_bytes ayrı).
+        return {
+            "storage": "csr",
+            "dtype": dtype,
+            "rows": len(agent.q),
+            "values": len(agent.q.values),
+            "bytes": agent.q.nbytes,
+            "layout_bytes": agent.q.layout_nbytes,
+        }
+    return {
+        "storage": "dense",
+        "dtype": dtype,
+        "rows": agent.q.shape[0],
+        "bytes": agent.q.nbytes,
+    }
+
+
+def visit_coverage(agent, n_states, legal_mask):
+    """
+    Ziyaret sayısı tablosundan kapsama istatistikleri (results.json için).
+
+    legal_mask (n_states, n_actions) yasal çiftleri işaretler; afterstate
+    ajanlarında (tek sütun) payda indekslenen durum sayısıdır. Sayaçlar kapalıysa
+    None döner.
+    """
+    if agent.visits is None:
+        return None
+    if isinstance(agent.visits, (SparseQTable, CSRQTable)):
+        counts = agent.visits.to_dense(n_states)
+    else:
+        counts = agent.visits[:n_states]
+    if counts.shape[1] == legal_mask.shape[1]:
+        counts = np.where(legal_mask[:n_states], counts, 0)
+        possible = int(legal_mask[:n_states].sum())
+    else:
+        possible = counts.size
+    seen = counts[counts > 0]
+    return {
+        "visited_pairs": int(seen.size),
+        "possible_pairs": possible,
+        "coverage": seen.size / possible if possible else 0.0,
+        "visited_states": int((counts > 0).any(axis=1).sum()),
+        "total_visits": int(seen.sum()),
+        "max_visits": int(seen.max()) if seen.size else 0,
+        "median_visits": float(np.median(seen)) if seen.size else 0.0,
+    }
+
+
 class BaseLearningAgent(Agent):
     """
     Öğrenen ajanlar için ortak taban sınıf.
@@ -525,10 +1371,16 @@ class BaseLearningAgent(Agent):
 
     Q Tablosu Yapısı:
     ----------------
-    - Boyut: (n_states, 9) → (5478, 9) for Tic-Tac-Toe
+    - Boyut: (n_states, n_actions) → (5478, 9) for Tic-Tac-Toe
     - Q[s, a]: Durum s'de aksiyon a'nın beklenen kümülatif ödülü
     - Başlangıç: Sıfır matris (tüm değerler 0)
     - Öğrenme sürecinde güncellenir (stokastik yaklaşım)
+    - m×n×k tahtalarda durumlar tembel indekslendiği için tablo, yeni bir durum
+      indeksi görüldüğünde kapasitesi ikiye katlanarak büyütülür (ensure_state)
+    - q_storage="sparse" ile SparseQTable kullanılır: yalnızca ziyaret edilen
+      durumlar için satır açılır, arayüz (q[s], q[s, a]) aynı kalır
+    - q_storage="csr" ile CSRQTable kullanılır: yalnızca yasal (s, a) değerleri
+      düz bir dizide saklanır (3x3)
 
     Epsilon-Greedy Stratejisi:
     ------------------------
@@ -540,19 +1392,41 @@ class BaseLearningAgent(Agent):
     is_learning = True
 
     def __init__(
-        self, name, n_states, alpha, gamma, epsilon_start, epsilon_end, epsilon_decay
+        self,
+        name,
+        n_states,
+        alpha,
+        gamma,
+        epsilon_start,
+        epsilon_end,
+        epsilon_decay,
+        n_actions=9,
+        q_storage="dense",
+        q_dtype="float32",
+        q_scale=DEFAULT_INT16_Q_SCALE,
+        step_size="constant",
+        step_size_power=0.8,
+        visit_counts=False,
     ):
         """
         Öğrenen ajanı başlatır.
 
         Argümanlar:
             name (str): Ajanın tanımlayıcı adı
-            n_states (int): Durum uzayı boyutu (geçerli durum sayısı)
+            n_states (int): Durum uzayı boyutu (geçerli durum sayısı veya başlangıç
+                kapasitesi; tembel indekslenen tahtalarda tablo büyüyebilir)
             alpha (float): Öğrenme oranı (0 < alpha ≤ 1)
             gamma (float): İndirgeme faktörü (0 ≤ gamma ≤ 1)
             epsilon_start (float): Başlangıç keşif oranı (0 ≤ epsilon ≤ 1)
             epsilon_end (float): Bitiş keşif oranı (0 ≤ epsilon ≤ 1)
             epsilon_decay (float): Her bölümde epsilon *= decay (0 < decay ≤ 1)
+            n_actions (int): Aksiyon sayısı (tahtadaki hücre sayısı, 3x3 için 9)
+            q_storage (str): Q tablosu arka ucu ("dense", "sparse" veya "csr")
+            q_dtype (str): Saklama tipi ("float32", "float16" veya "int16")
+            q_scale (float): int16 modunda tamsayı başına Q değeri (sabit ölçek)
+            step_size (str): "constant" (α), "visit" (1/N) veya "polynomial" (1/N^ω)
+            step_size_power (float): Polinom programın üssü ω (0.5 < ω ≤ 1)
+            visit_counts (bool): Sabit α ile de ziyaret sayılarını tut (kapsama için)
         """
         super().__init__()
         self.name = name
@@ -568,24 +1442,113 @@ class BaseLearningAgent(Agent):
 
         # --- Q Tablosu (Değer Fonksiyonu) ---
         # Q[s, a] = durum s'de aksiyon a'nın beklenen kümülatif ödülü
-        # 9 aksiyon: tüm hücreler için, geçersizler aksiyon seçiminde filtrelenir
-        self.q = np.zeros((n_states, 9), dtype=np.float32)
+        # n_actions aksiyon: tüm hücreler için, geçersizler aksiyon seçiminde filtrelenir
+        if q_dtype not in Q_DTYPE_CHOICES:
+            raise ValueError(f"Bilinmeyen Q değer tipi: {q_dtype}")
+        self.q = make_q_table(q_storage, n_states, n_actions, dtype=np.dtype(q_dtype))
+        # int16 için sabit ölçek; float tiplerde None (değer doğrudan saklanır).
+        self.q_scale = q_scale if q_dtype == "int16" else None
+
+        # --- Ziyaret Sayıları N(s,a) ---
+        # Q ile aynı düzende uint32 tablo; yalnızca sayaç gerektiğinde ayrılır.
+        # Kapalıyken (None) güncelleme başına maliyet tek bir None kontrolüdür.
+        if step_size not in STEP_SIZE_CHOICES:
+            raise ValueError(f"Bilinmeyen adım büyüklüğü programı: {step_size}")
+        if step_size == "polynomial" and not 0.5 < step_size_power <= 1.0:
+            # ω ≤ 0.5 için adımların kareleri toplamı ıraksar (Robbins–Monro koşulu).
+            raise ValueError("step_size_power (0.5, 1] aralığında olmalı")
+        self.step_size = step_size
+        self.step_size_power = step_size_power
+        self.visits = None
+        if visit_counts or step_size != "constant":
+            self.visits = make_q_table(q_storage, n_states, n_actions, dtype=np.uint32)
+
+    @classmethod
+    def config_kwargs(cls, config):
+        # Alt sınıfa özgü yapıcı argümanları (ör. trace_lambda) Config'ten okunur.
+        return {}
+
+    def ensure_state(self, state):
+        # Tembel indekslenen tahtalarda yeni durum için tablo kapasitesi ikiye katlanır.
+        # Seyrek tablo satırları ilk yazımda kendisi açtığı için büyütme gerekmez.
+        if isinstance(self.q, np.ndarray) and state >= self.q.shape[0]:
+            capacity = max(state + 1, 2 * self.q.shape[0])
+            grown = np.zeros((capacity, self.q.shape[1]), dtype=self.q.dtype)
+            grown[: self.q.shape[0]] = self.q
+            self.q = grown
+            if self.visits is not None:
+                counts = np.zeros((capacity, self.q.shape[1]), dtype=np.uint32)
+                counts[: self.visits.shape[0]] = self.visits
+                self.visits = counts
+
+    def learning_rate(self, state, action):
+        """
+        Gerçek deneyimle yapılan güncelleme için adım büyüklüğü.
+
+        Sayaçlar açıksa N(s,a) bir artırılır; program "visit" ise 1/N(s,a)
+        (örnek ortalaması), "polynomial" ise 1/N(s,a)^ω döner. Seyrek ziyaret
+        edilen çiftler ilk güncellemelerde büyük adım atar, sık ziyaret edilenlerin
+        adımı küçülerek salınım söner. "constant" programda her zaman α döner.
+        """
+        if self.visits is None:
+            return self.alpha
+        self.visits[state, action] += 1
+        return self.scheduled_rate(state, action)
+
+    def scheduled_rate(self, state, action):
+        # N(s,a)'yı değiştirmeden programın adımı (planlama yedeklemeleri için).
+        if self.visits is None or self.step_size == "constant":
+            return self.alpha
+        count = max(int(self.visits[state, action]), 1)
+        if self.step_size == "visit":
+            return 1.0 / count
+        return count**-self.step_size_power
 
     def select_action(self, state, valid_moves, board, player, explore=True):
         # Keşif: epsilon olasılığıyla rastgele aksiyon.
         if explore and random.random() < self.epsilon:
             return random.choice(valid_moves)
         # Sömürü: mevcut Q değerlerinden en iyisini seç.
-        q_values = self.q[state]
-        best_value = max(q_values[action] for action in valid_moves)
+        self.ensure_state(state)
+        values = self.action_values(state, valid_moves)
+        best_value = max(values)
         best_actions = [
-            action for action in valid_moves if q_values[action] == best_value
+            action for action, value in zip(valid_moves, values) if value == best_value
         ]
         return random.choice(best_actions)
 
+    def action_values(self, state, valid_moves):
+        # Geçerli aksiyonların ham Q değerleri (valid_moves sırasıyla). CSR tablosunda
+        # satır zaten boş hücrelerin artan sırasıdır; yoğun satır kurulmaz.
+        if isinstance(self.q, CSRQTable):
+            return self.q.legal_values(state)
+        q_values = self.q[state]
+        return [q_values[action] for action in valid_moves]
+
     def decay_epsilon(self):
         self.epsilon = max(self.epsilon_end, self.epsilon * self.epsilon_decay)
 
+    # --- Hassasiyetten bağımsız Q erişimi ---
+    # Güncellemeler bu yardımcılar üzerinden float64 aritmetiği ile yapılır;
+    # saklama tipine (float32/float16/int16) yuvarlama yalnızca yazarken olur.
+    # Aksiyon seçimi ham değerleri karşılaştırır (ölçek pozitif, sıralama korunur).
+
+    def q_value(self, state, action):
+        value = float(self.q[state, action])
+        return value * self.q_scale if self.q_scale else value
+
+    def q_max(self, state):
+        if isinstance(self.q, CSRQTable):
+            value = float(self.q.row_max(state))
+        else:
+            value = float(np.max(self.q[state]))
+        return value * self.q_scale if self.q_scale else value
+
+    def store_q(self, state, action, value):
+        if self.q_scale:
+            value = min(max(round(value / self.q_scale), -32768), 32767)
+        self.q[state, action] = value
+
 
 class QLearningAgent(BaseLearningAgent):
     """
@@ -640,7 +1603,8 @@ class QLearningAgent(BaseLearningAgent):
            - Devam: hedef = reward + γ * max_a' Q(s',a')
         3. Q değerini güncelle: Q(s,a) ← Q(s,a) + α [hedef - Q(s,a)]
         """
-        current = self.q[state, action]
+        self.ensure_state(state if next_state is None else max(state, next_state))
+        current = self.q_value(state, action)
 
         if done or next_state is None:
             # Terminal durum: ödül son
@@ -648,10 +1612,11 @@ class QLearningAgent(BaseLearningAgent):
         else:
             # Devam: gelecekteki maksimum Q değerini kullan
             # max_a' Q(s',a') → bir sonraki durumun en iyi aksiyonu
-            target = reward + self.gamma * np.max(self.q[next_state])
+            target = reward + self.gamma * self.q_max(next_state)
 
         # Stokastik gradyan inişi benzeri güncelleme
-        self.q[state, action] = current + self.alpha * (target - current)
+        step = self.learning_rate(state, action)
+        self.store_q(state, action, current + step * (target - current))
 
 
 class SarsaAgent(BaseLearningAgent):
@@ -712,7 +1677,8 @@ class SarsaAgent(BaseLearningAgent):
             next_action SARSA için kritiktir çünkü algoritma isminden gelen
             State-Action-Reward-State-Action zinciri gereklidir.
         """
-        current = self.q[state, action]
+        self.ensure_state(state if next_state is None else max(state, next_state))
+        current = self.q_value(state, action)
 
         if done or next_state is None or next_action is None:
             # Terminal durum: ödül son
@@ -720,119 +1686,517 @@ class SarsaAgent(BaseLearningAgent):
         else:
             # Devam: seçilen sonraki aksiyonun Q değerini kullan
             # Q(s',a') → epsilon-greedy ile seçilen aksiyonun değeri
-            target = reward + self.gamma * self.q[next_state, next_action]
+            target = reward + self.gamma * self.q_value(next_state, next_action)
 
         # Stokastik gradyan inişi benzeri güncelleme
-        self.q[state, action] = current + self.alpha * (target - current)
+        step = self.learning_rate(state, action)
+        self.store_q(state, action, current + step * (target - current))
 
 
-class RandomAgent(Agent):
-    name = "Random"
+class EligibilityTraceMixin:
+    """
+    λ-getirisi (λ-return) için seyrek uygunluk izleri (eligibility traces).
 
-    def select_action(self, state, valid_moves, board, player, explore=True):
-        return random.choice(valid_moves)
+    Tek adımlı güncellemede ödül yalnızca terminal durumda geldiği için kredi her
+    bölümde bir hamle geriye yayılır. İzlerle her TD hatası, bu bölümde ziyaret
+    edilen tüm (durum, aksiyon) çiftlerine e(s,a) ağırlığıyla dağıtılır:
 
+        δ = hedef - Q(s,a);  e(s,a) = 1 (replacing trace)
+        her (s_i, a_i) için: Q(s_i,a_i) += α δ e_i;  e_i *= γλ
 
-class MinimaxAgent(Agent):
-    name = "Minimax"
+    İzler tablo boyutunda bir dizi yerine yalnızca bu bölümde ziyaret edilen
+    birkaç çifti tutan bir dict'tir (Tic-Tac-Toe'da oyuncu başına en fazla 5).
+    play_episode'daki pending_state akışı değişmez: update() aynı argümanlarla
+    çağrılır; izler reset_pending() ile bölüm sınırlarında temizlenir.
+    """
 
-    def __init__(self):
-        super().__init__()
-        self.cache = {}
+    def __init__(self, *args, trace_lambda=0.9, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.trace_lambda = trace_lambda
+        self.traces = {}
 
-    def select_action(self, state, valid_moves, board, player, explore=True):
-        return minimax_action(board, player, self.cache)
+    @classmethod
+    def config_kwargs(cls, config):
+        return {"trace_lambda": config.trace_lambda}
 
+    def reset_pending(self):
+        super().reset_pending()
+        self.traces.clear()
+
+    def backup_traces(self, state, action, target, done):
+        # TD hatası mevcut (s,a) için hesaplanır ve izli tüm çiftlere dağıtılır.
+        # Adım büyüklüğü güncel (s,a) çiftinin programından alınır ve izli tüm
+        # çiftlere aynı α_t olarak uygulanır (N yalnızca ziyaret edilen çift için artar).
+        delta = target - self.q_value(state, action)
+        step = self.learning_rate(state, action)
+        self.traces[(state, action)] = 1.0
+        decay = self.gamma * self.trace_lambda
+        for (trace_state, trace_action), trace in self.traces.items():
+            self.store_q(
+                trace_state,
+                trace_action,
+                self.q_value(trace_state, trace_action) + step * delta * trace,
+            )
+            self.traces[(trace_state, trace_action)] = trace * decay
+        if done:
+            self.traces.clear()
 
-def minimax_action(board, player, cache):
-    best_value = -2
-    best_actions = []
-    for action in valid_actions(board):
-        next_board = list(board)
-        next_board[action] = player
-        value = -minimax_value(next_board, opponent(player), cache)
-        if value > best_value:
-            best_value = value
-            best_actions = [action]
-        elif value == best_value:
-            best_actions.append(action)
-    return random.choice(best_actions)
 
+class SarsaLambdaAgent(EligibilityTraceMixin, SarsaAgent):
+    """
+    SARSA(λ) ajanı: on-policy hedef r + γ Q(s',a') ile seyrek izli güncelleme.
 
-def minimax_value(board, player, cache):
-    key = (tuple(board), player)
-    if key in cache:
-        return cache[key]
-    winner = check_winner(board)
-    if winner != 0:
-        if winner == player:
-            return 1
-        if winner == DRAW:
-            return 0
-        return -1
-    best_value = -2
-    for action in valid_actions(board):
-        next_board = list(board)
-        next_board[action] = player
-        value = -minimax_value(next_board, opponent(player), cache)
-        best_value = max(best_value, value)
-        if best_value == 1:
-            break
-    cache[key] = best_value
-    return best_value
+    λ = 0 tek adımlı SARSA'ya, λ = 1 Monte Carlo getirisine karşılık gelir.
+    """
 
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        self.ensure_state(state if next_state is None else max(state, next_state))
+        if done or next_state is None or next_action is None:
+            target = reward
+            done = True
+        else:
+            target = reward + self.gamma * self.q_value(next_state, next_action)
+        self.backup_traces(state, action, target, done)
 
-def score_from_winner(winner, player_id):
-    # Skor metrikleri: kazanma 1, beraberlik 0, kaybetme -1.
-    if winner == DRAW:
-        return 0
-    if winner == player_id:
-        return 1
-    return -1
 
+class QLambdaAgent(EligibilityTraceMixin, QLearningAgent):
+    """
+    Watkins Q(λ) ajanı: off-policy hedef r + γ max_a' Q(s',a') ile seyrek izli güncelleme.
 
-def play_episode(
-    env,
-    agent_x,
-    agent_o,
-    train_x=True,
-    train_o=True,
-    explore_x=True,
-    explore_o=True,
-    track_actions=None,
-    track_player_id=None,
-):
-    # Tek bölüm simülasyonu: iki ajan sırayla hamle yapar.
-    # MDP akışı: (durum, aksiyon, oyuncu) -> (yeni_durum, ödül, done)
-    board = env.reset()
-    agent_x.reset_pending()
-    agent_o.reset_pending()
-    player = 1
+    Hedef politika greedy olduğu için, sonraki aksiyon keşif amaçlı (greedy olmayan)
+    seçildiğinde izler kesilir; aksi halde greedy olmayan davranışın getirisi
+    önceki çiftlere yanlışlıkla yayılırdı.
+    """
 
-    while True:
-        agent = agent_x if player == 1 else agent_o
-        train_agent = train_x if player == 1 else train_o
-        explore = explore_x if player == 1 else explore_o
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.greedy_choice = True
 
-        state = encode_state(board)
-        moves = valid_actions(board)
-        action = agent.select_action(state, moves, board, player, explore=explore)
+    def select_action(self, state, valid_moves, board, player, explore=True):
+        action = super().select_action(state, valid_moves, board, player, explore)
+        # Seçilen aksiyon yasal aksiyonlar arasında en iyi mi? (iz kesme kararı için)
+        self.ensure_state(state)
+        values = self.action_values(state, valid_moves)
+        self.greedy_choice = values[valid_moves.index(action)] == max(values)
+        return action
 
-        # Isı haritası için hamle sayımı: izlenen oyuncunun hücre seçimi kaydedilir.
-        if track_actions is not None and track_player_id == player:
-            track_actions[action] += 1
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        self.ensure_state(state if next_state is None else max(state, next_state))
+        if done or next_state is None:
+            target = reward
+            done = True
+        else:
+            target = reward + self.gamma * self.q_max(next_state)
+        self.backup_traces(state, action, target, done)
+        if not done and not self.greedy_choice:
+            self.traces.clear()
 
-        # Ara güncelleme: önceki hamle için ödül 0 kabul edilir (Q-Learning ve SARSA).
-        # Böylece terminal ödül gelene kadar beklemek zorunda kalmayız.
-        if train_agent and agent.pending_state is not None:
-            agent.update(
-                agent.pending_state,
-                agent.pending_action,
-                reward=0.0,
-                next_state=state,
-                next_action=action,
-                done=False,
-            )
+
+class AfterstateAgent(BaseLearningAgent):
+    """
+    Afterstate (hamle sonrası tahta) değer ajanları için ortak taban sınıf.
+
+    Hamleler deterministik olduğu için farklı (durum, aksiyon) çiftleri çoğu kez
+    aynı tahtaya çıkar; Q(s, a) yerine hamle sonrası tahtanın tek bir değeri
+    V(b) öğrenilir ve Q(s, a) = V(AFTERSTATES[s, a]) olarak okunur. Böylece:
+    - Tablo (n_states, 1) boyutundadır (9 kat küçük)
+    - Aynı tahtaya çıkan tüm hamleler deneyimi paylaşır (daha hızlı yakınsama)
+
+    update() arayüzü değişmez: play_episode'un verdiği (durum, aksiyon) çifti
+    AFTERSTATES üzerinden afterstate indeksine çevrilir. Afterstate'ler
+    STATE_INDEX ile indekslendiği için yalnızca 3x3 tahtada kullanılabilir.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs["n_actions"] = 1
+        super().__init__(*args, **kwargs)
+
+    def select_action(self, state, valid_moves, board, player, explore=True):
+        if explore and random.random() < self.epsilon:
+            return random.choice(valid_moves)
+        # Aday hamlelerin afterstate değerleri tek vektörize okumayla alınır.
+        values = self.q[AFTERSTATES[state, valid_moves], 0]
+        best_value = values.max()
+        best_actions = [
+            action for action, value in zip(valid_moves, values) if value == best_value
+        ]
+        return random.choice(best_actions)
+
+    def afterstate_max(self, state):
+        # max_a V(AFTERSTATES[s, a]) yasal aksiyonlar üzerinden.
+        value = float(self.q[AFTERSTATES[state][LEGAL_ACTIONS[state]], 0].max())
+        return value * self.q_scale if self.q_scale else value
+
+    def backup(self, state, action, target):
+        afterstate = int(AFTERSTATES[state, action])
+        current = self.q_value(afterstate, 0)
+        step = self.learning_rate(afterstate, 0)
+        self.store_q(afterstate, 0, current + step * (target - current))
+
+
+class AfterstateQLearningAgent(AfterstateAgent):
+    """
+    Afterstate Q-Learning: V(b) ← V(b) + α [r + γ max_a' V(b'(s',a')) - V(b)].
+    """
+
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        if done or next_state is None:
+            target = reward
+        else:
+            target = reward + self.gamma * self.afterstate_max(next_state)
+        self.backup(state, action, target)
+
+
+class AfterstateSarsaAgent(AfterstateAgent):
+    """
+    Afterstate SARSA: V(b) ← V(b) + α [r + γ V(b'(s',a')) - V(b)], a' seçilen aksiyon.
+    """
+
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        if done or next_state is None or next_action is None:
+            target = reward
+        else:
+            target = reward + self.gamma * self.q_value(
+                int(AFTERSTATES[next_state, next_action]), 0
+            )
+        self.backup(state, action, target)
+
+
+class ModelBasedAgent(QLearningAgent):
+    """
+    Gözlenen geçişlerden öğrenilen model ile planlama yapan Q-Learning tabanı.
+
+    Gerçek bölümler (ajan + rakip hamleleri, Python döngüsü) pahalıdır; modelden
+    üretilen deneyim ise yalnızca bir tablo güncellemesidir. Her gerçek adımda
+    gözlenen (r, s') sonucu model[(s, a)] sayaçlarına eklenir (s' ajanın bir
+    sonraki karar durumu, terminalde None) ve planning_steps kadar ek Q-Learning
+    yedeklemesi yapılır.
+
+    Rakip hamlesi stokastik olduğu için model yalnızca son sonucu değil, sonuçların
+    gözlem sıklığını tutar: {(r, s'): sayı}. Anahtarlar ortamın durum indeksleridir
+    (STATE_INDEX veya m×n×k için LazyStateIndex), model her tahta boyutunda çalışır.
+    """
+
+    def __init__(self, *args, planning_steps=10, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.planning_steps = planning_steps
+        self.model = {}
+
+    @classmethod
+    def config_kwargs(cls, config):
+        return {"planning_steps": config.planning_steps}
+
+    def observe(self, state, action, reward, next_state, done):
+        outcomes = self.model.setdefault((state, action), {})
+        outcome = (reward, None if done else next_state)
+        outcomes[outcome] = outcomes.get(outcome, 0) + 1
+
+    def expected_target(self, state, action):
+        # Modeldeki sonuç sıklıklarıyla beklenen hedef: E[r + γ max_a' Q(s',a')].
+        outcomes = self.model[(state, action)]
+        total = 0.0
+        for (reward, next_state), count in outcomes.items():
+            if next_state is not None:
+                self.ensure_state(max(state, next_state))
+                reward += self.gamma * self.q_max(next_state)
+            total += count * reward
+        return total / sum(outcomes.values())
+
+    def plan_backup(self, state, action, target):
+        # Model yedeklemesi: N(s,a) yalnızca gerçek deneyimle artar; adım, gerçek
+        # ziyaret sayısına göre programdan (sabit programda α) alınır.
+        current = self.q_value(state, action)
+        step = self.scheduled_rate(state, action)
+        self.store_q(state, action, current + step * (target - current))
+
+
+class DynaQAgent(ModelBasedAgent):
+    """
+    Dyna-Q: her gerçek güncellemeden sonra modelde görülmüş (s, a) çiftleri
+    arasından düzgün rastgele örneklenen planning_steps ek yedekleme.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.model_keys = []  # O(1) düzgün örnekleme için model anahtarları listesi
+
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        super().update(state, action, reward, next_state, next_action, done)
+        if (state, action) not in self.model:
+            self.model_keys.append((state, action))
+        self.observe(state, action, reward, next_state, done or next_state is None)
+        for _ in range(self.planning_steps):
+            # Örnek model deneyimi: (s, a) düzgün, sonucu gözlem sıklığıyla seçilir.
+            plan_state, plan_action = random.choice(self.model_keys)
+            outcomes = self.model[(plan_state, plan_action)]
+            ((plan_reward, plan_next),) = random.choices(
+                list(outcomes), weights=list(outcomes.values())
+            )
+            if plan_next is not None:
+                self.ensure_state(max(plan_state, plan_next))
+                plan_reward += self.gamma * self.q_max(plan_next)
+            self.plan_backup(plan_state, plan_action, plan_reward)
+
+
+class PrioritizedSweepingAgent(ModelBasedAgent):
+    """
+    Öncelikli süpürme: planlama yedeklemeleri TD hatası büyüklüğüne göre sıralanır.
+
+    Öncelik |E[r + γ max_a' Q(s',a')] - Q(s,a)| (model sıklıklarıyla beklenen
+    hedef) eşik (theta) üzerindeyse (s, a) bir max-heap'e (heapq, negatif öncelik)
+    eklenir; çekilen çiftler aynı beklenen hedefle yedeklenir. Her gerçek adımda en fazla
+    planning_steps çift kuyruktan çekilip yedeklenir; değeri değişen durumun
+    modeldeki öncülleri (predecessors) yeni önceliklerle kuyruğa eklenir. Böylece
+    terminal ödül, tek bir gerçek adımda birçok hamle geriye yayılabilir.
+    Kuyrukta aynı çiftin birden fazla girdisi olabilir (tembel silme yerine).
+    """
+
+    def __init__(self, *args, planning_theta=1e-4, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.planning_theta = planning_theta
+        self.queue = []
+        self.predecessors = {}  # s' -> {(s, a)}
+
+    @classmethod
+    def config_kwargs(cls, config):
+        return {
+            "planning_steps": config.planning_steps,
+            "planning_theta": config.planning_theta,
+        }
+
+    def push(self, state, action):
+        priority = abs(
+            self.expected_target(state, action) - self.q_value(state, action)
+        )
+        if priority > self.planning_theta:
+            heapq.heappush(self.queue, (-priority, state, action))
+
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        done = done or next_state is None
+        if self.visits is not None:
+            # Gerçek adımda doğrudan güncelleme yok; yalnızca ziyaret sayılır.
+            self.ensure_state(state)
+            self.visits[state, action] += 1
+        self.observe(state, action, reward, next_state, done)
+        if not done:
+            self.predecessors.setdefault(next_state, set()).add((state, action))
+        self.push(state, action)
+        for _ in range(self.planning_steps):
+            if not self.queue:
+                break
+            _, plan_state, plan_action = heapq.heappop(self.queue)
+            self.plan_backup(
+                plan_state, plan_action, self.expected_target(plan_state, plan_action)
+            )
+            for pred_state, pred_action in self.predecessors.get(plan_state, ()):
+                self.push(pred_state, pred_action)
+
+
+def learning_agent_classes(config):
+    # Config'e göre (Q-Learning sınıfı, SARSA sınıfı): afterstate veya λ > 0 ise
+    # ilgili varyantlar, aksi halde tek adımlı tablo ajanları.
+    if config.afterstate:
+        if config.trace_lambda > 0 or config.planning != "none":
+            raise ValueError(
+                "afterstate modu uygunluk izleri veya planlama ile birlikte kullanılamaz"
+            )
+        if (config.board_rows, config.board_cols, config.win_length) != CLASSIC_DIMS:
+            raise ValueError("afterstate modu yalnızca 3x3x3 tahtada kullanılabilir")
+        return AfterstateQLearningAgent, AfterstateSarsaAgent
+    if config.trace_lambda > 0:
+        if config.planning != "none":
+            raise ValueError("uygunluk izleri planlama ile birlikte kullanılamaz")
+        return QLambdaAgent, SarsaLambdaAgent
+    if config.planning in PLANNING_AGENT_CLASSES:
+        # Planlama yalnızca Q-Learning tarafına uygulanır (model tabanlı off-policy).
+        return PLANNING_AGENT_CLASSES[config.planning], SarsaAgent
+    return QLearningAgent, SarsaAgent
+
+
+# Planlama modu -> Q-Learning tabanlı planlayıcı ajan sınıfı.
+PLANNING_AGENT_CLASSES = {
+    "dyna": DynaQAgent,
+    "prioritized": PrioritizedSweepingAgent,
+}
+PLANNING_CHOICES = ("none",) + tuple(PLANNING_AGENT_CLASSES)
+
+
+def compare_planning(config, modes=PLANNING_CHOICES):
+    """
+    Planlayıcı ajanları düz Q-Learning ile karşılaştırır (Random'a karşı, X rolü).
+
+    Her mod aynı tohum ve hiperparametrelerle baseline_episodes bölüm eğitilir;
+    yakınsama bölümü (hareketli ortalama kazanma oranı eşiği), son pencere
+    kazanma oranı ve duvar saati süresi raporlanır. Planlama gerçek bölüm başına
+    maliyeti artırır; amaç daha az gerçek bölümde yakınsamaktır.
+
+    Dönüş:
+        dict: {mod: {"convergence_episode", "final_win_rate", "seconds"}}
+    """
+    env = make_env(config)
+    n_states = env.n_states or LAZY_INITIAL_CAPACITY
+    report = {}
+    for mode in modes:
+        random.seed(config.seed)
+        np.random.seed(config.seed)
+        agent_cls = PLANNING_AGENT_CLASSES.get(mode, QLearningAgent)
+        agent = build_agent_pair(
+            mode, agent_cls, "Q", n_states, config, env.n_actions
+        ).agent_x
+        started = time.perf_counter()
+        scores = train_vs_random(env, agent, config.baseline_episodes)
+        window = scores[-config.moving_avg_window :]
+        report[mode] = {
+            "convergence_episode": convergence_episode(
+                scores, config.moving_avg_window, config.convergence_threshold
+            ),
+            "final_win_rate": summarize_scores(window)["win_rate"],
+            "seconds": time.perf_counter() - started,
+        }
+        print(
+            f"[planning] {mode}: yakınsama {report[mode]['convergence_episode']}, "
+            f"son kazanma {report[mode]['final_win_rate']:.2%}, "
+            f"{report[mode]['seconds']:.2f} sn"
+        )
+    return report
+
+
+def q_action_values(agent, n_states):
+    # (n_states, n_actions) aksiyon değeri görünümü; afterstate ajanlarında
+    # Q(s, a) = V(AFTERSTATES[s, a]), yasal olmayan aksiyonlar 0.
+    table = q_table_array(agent, n_states)
+    if isinstance(agent, AfterstateAgent):
+        values = table[np.where(LEGAL_ACTIONS, AFTERSTATES, 0), 0]
+        return np.where(LEGAL_ACTIONS, values, 0).astype(table.dtype)[:n_states]
+    return table
+
+
+class RandomAgent(Agent):
+    name = "Random"
+
+    def select_action(self, state, valid_moves, board, player, explore=True):
+        return random.choice(valid_moves)
+
+
+class MinimaxAgent(Agent):
+    name = "Minimax"
+
+    def __init__(self):
+        super().__init__()
+        self.cache = {}
+
+    def select_action(self, state, valid_moves, board, player, explore=True):
+        return minimax_action(board, player, self.cache)
+
+
+def minimax_action(board, player, cache):
+    best_value = -2
+    best_actions = []
+    for action in valid_actions(board):
+        next_board = list(board)
+        next_board[action] = player
+        value = -minimax_value(next_board, opponent(player), cache)
+        if value > best_value:
+            best_value = value
+            best_actions = [action]
+        elif value == best_value:
+            best_actions.append(action)
+    return random.choice(best_actions)
+
+
+def minimax_value(board, player, cache):
+    key = (tuple(board), player)
+    if key in cache:
+        return cache[key]
+    winner = check_winner(board)
+    if winner != 0:
+        if winner == player:
+            return 1
+        if winner == DRAW:
+            return 0
+        return -1
+    best_value = -2
+    for action in valid_actions(board):
+        next_board = list(board)
+        next_board[action] = player
+        value = -minimax_value(next_board, opponent(player), cache)
+        best_value = max(best_value, value)
+        if best_value == 1:
+            break
+    cache[key] = best_value
+    return best_value
+
+
+def score_from_winner(winner, player_id):
+    # Skor metrikleri: kazanma 1, beraberlik 0, kaybetme -1.
+    if winner == DRAW:
+        return 0
+    if winner == player_id:
+        return 1
+    return -1
+
+
+def play_episode(
+    env,
+    agent_x,
+    agent_o,
+    train_x=True,
+    train_o=True,
+    explore_x=True,
+    explore_o=True,
+    track_actions=None,
+    track_player_id=None,
+    observers=None,
+):
+    # Tek bölüm simülasyonu: iki ajan sırayla hamle yapar.
+    # MDP akışı: (durum, aksiyon, oyuncu) -> (yeni_durum, ödül, done)
+    # observers: her hamlede on_step(ajan, oyuncu, durum, aksiyon), bölüm sonunda
+    # on_end(kazanan) çağrılan gözlemciler (ör. TrajectoryRecorder); None iken
+    # hamle başına tek bir koşul kontrolü dışında maliyet yoktur.
+    board = env.reset()
+    agent_x.reset_pending()
+    agent_o.reset_pending()
+    player = 1
+
+    while True:
+        agent = agent_x if player == 1 else agent_o
+        train_agent = train_x if player == 1 else train_o
+        explore = explore_x if player == 1 else explore_o
+
+        state = env.encode_state(board)
+        moves = valid_actions(board)
+        action = agent.select_action(state, moves, board, player, explore=explore)
+
+        # Isı haritası için hamle sayımı: izlenen oyuncunun hücre seçimi kaydedilir.
+        if track_actions is not None and track_player_id == player:
+            track_actions[action] += 1
+        if observers:
+            for observer in observers:
+                observer.on_step(agent, player, state, action)
+
+        # Ara güncelleme: önceki hamle için ödül 0 kabul edilir (Q-Learning ve SARSA).
+        # Böylece terminal ödül gelene kadar beklemek zorunda kalmayız.
+        if train_agent and agent.pending_state is not None:
+            agent.update(
+                agent.pending_state,
+                agent.pending_action,
+                reward=0.0,
+                next_state=state,
+                next_action=action,
+                done=False,
+            )
             agent.pending_state = None
             agent.pending_action = None
 
@@ -866,6 +2230,9 @@ def play_episode(
                 )
                 opponent_agent.pending_state = None
                 opponent_agent.pending_action = None
+            if observers:
+                for observer in observers:
+                    observer.on_end(winner)
             break
 
         if train_agent:
@@ -943,6 +2310,9 @@ def train_self_play(
     log_interval=0,
     log_window=200,
     label="Self-play",
+    event_log=None,
+    quality=None,
+    observers=None,
 ):
     # Self-play: iki öğrenen ajan karşılıklı oynar.
     # Aynı algoritmanın farklı rolleri (X/O) birlikte öğrenir.
@@ -956,6 +2326,7 @@ def train_self_play(
             train_o=True,
             explore_x=True,
             explore_o=True,
+            observers=observers,
         )
         scores.append(score_from_winner(winner, player_id=1))
         agent_x.decay_epsilon()
@@ -964,6 +2335,12 @@ def train_self_play(
             (episode + 1) % log_interval == 0 or (episode + 1) == episodes
         ):
             log_training_progress(label, episode + 1, episodes, scores, log_window)
+        if event_log is not None and (episode + 1) % event_log.interval == 0:
+            event_log.emit_interval(
+                label, episode + 1, episodes, scores, log_window, agent_x
+            )
+        if quality is not None and (episode + 1) % quality.interval == 0:
+            quality.record(label, episode + 1, agent_x, agent_o)
     return scores
 
 
@@ -975,6 +2352,9 @@ def train_vs_random(
     log_interval=0,
     log_window=200,
     label="Baseline",
+    event_log=None,
+    quality=None,
+    observers=None,
 ):
     # Baz çizgi: öğrenen ajan rastgele ajanla oynar.
     # Rastgele ajan öğrenmez; sadece karşılaştırma için kullanılır.
@@ -983,12 +2363,24 @@ def train_vs_random(
     for episode in range(episodes):
         if agent_first:
             winner = play_episode(
-                env, agent, random_agent, train_x=True, train_o=False, explore_x=True
+                env,
+                agent,
+                random_agent,
+                train_x=True,
+                train_o=False,
+                explore_x=True,
+                observers=observers,
             )
             scores.append(score_from_winner(winner, player_id=1))
         else:
             winner = play_episode(
-                env, random_agent, agent, train_x=False, train_o=True, explore_o=True
+                env,
+                random_agent,
+                agent,
+                train_x=False,
+                train_o=True,
+                explore_o=True,
+                observers=observers,
             )
             scores.append(score_from_winner(winner, player_id=2))
         agent.decay_epsilon()
@@ -996,6 +2388,16 @@ def train_vs_random(
             (episode + 1) % log_interval == 0 or (episode + 1) == episodes
         ):
             log_training_progress(label, episode + 1, episodes, scores, log_window)
+        if event_log is not None and (episode + 1) % event_log.interval == 0:
+            event_log.emit_interval(
+                label, episode + 1, episodes, scores, log_window, agent
+            )
+        if quality is not None and (episode + 1) % quality.interval == 0:
+            # Ajan yalnızca kendi rolünde öğrenir; ölçüm o rolün durumlarında yapılır.
+            if agent_first:
+                quality.record(label, episode + 1, agent_x=agent)
+            else:
+                quality.record(label, episode + 1, agent_o=agent)
     return scores
 
 
@@ -1007,6 +2409,9 @@ def train_cross_play(
     log_interval=0,
     log_window=200,
     label="Cross-play",
+    event_log=None,
+    quality=None,
+    observers=None,
 ):
     # Çapraz eğitim: Q-Learning ve SARSA farklı rollerde oynar.
     # Her bölümde X/O rolleri değişir, böylece rol avantajı dengelenir.
@@ -1022,6 +2427,7 @@ def train_cross_play(
                 train_o=True,
                 explore_x=True,
                 explore_o=True,
+                observers=observers,
             )
             q_scores.append(score_from_winner(winner, player_id=1))
             sarsa_scores.append(score_from_winner(winner, player_id=2))
@@ -1036,6 +2442,7 @@ def train_cross_play(
                 train_o=True,
                 explore_x=True,
                 explore_o=True,
+                observers=observers,
             )
             q_scores.append(score_from_winner(winner, player_id=2))
             sarsa_scores.append(score_from_winner(winner, player_id=1))
@@ -1047,105 +2454,1833 @@ def train_cross_play(
             log_cross_progress(
                 label, episode + 1, episodes, q_scores, sarsa_scores, log_window
             )
-    return q_scores, sarsa_scores
-
-
-def evaluate_matchup(env, pair_a, pair_b, games):
-    # Değerlendirme: keşif kapalı, salt performans ölçümü.
-    # Adil karşılaştırma için her maçta X/O rolleri değiştiririz.
-    scores = []
-    for game in range(games):
-        if game % 2 == 0:
-            winner = play_episode(
-                env,
-                pair_a.agent_x,
-                pair_b.agent_o,
-                train_x=False,
-                train_o=False,
-                explore_x=False,
-                explore_o=False,
+        if event_log is not None and (episode + 1) % event_log.interval == 0:
+            event_log.emit_interval(
+                f"{label} (Q)",
+                episode + 1,
+                episodes,
+                q_scores,
+                log_window,
+                q_pair.agent_x,
             )
-            scores.append(score_from_winner(winner, player_id=1))
-        else:
-            winner = play_episode(
-                env,
-                pair_b.agent_x,
-                pair_a.agent_o,
-                train_x=False,
-                train_o=False,
-                explore_x=False,
-                explore_o=False,
+            event_log.emit_interval(
+                f"{label} (SARSA)",
+                episode + 1,
+                episodes,
+                sarsa_scores,
+                log_window,
+                sarsa_pair.agent_x,
             )
-            scores.append(score_from_winner(winner, player_id=2))
-    return summarize_scores(scores)
+        if quality is not None and (episode + 1) % quality.interval == 0:
+            quality.record(f"{label} (Q)", episode + 1, q_pair.agent_x, q_pair.agent_o)
+            quality.record(
+                f"{label} (SARSA)", episode + 1, sarsa_pair.agent_x, sarsa_pair.agent_o
+            )
+    return q_scores, sarsa_scores
 
 
-def collect_action_counts(env, agent, opponent_agent, games, agent_first=True):
-    # Isı haritası için ajan hamlelerinin hangi hücrelerde yoğunlaştığını ölçer.
-    action_counts = np.zeros(9, dtype=np.int32)
-    for _ in range(games):
-        if agent_first:
-            play_episode(
-                env,
-                agent,
-                opponent_agent,
-                train_x=False,
-                train_o=False,
-                explore_x=False,
-                explore_o=False,
-                track_actions=action_counts,
-                track_player_id=1,
-            )
-        else:
-            play_episode(
-                env,
-                opponent_agent,
-                agent,
-                train_x=False,
-                train_o=False,
-                explore_x=False,
-                explore_o=False,
-                track_actions=action_counts,
-                track_player_id=2,
-            )
-    return action_counts
+# Aktör–öğrenen geçiş kaydı: update() çağrısı başına 17 baytlık kompakt satır.
+# next_state / next_action terminalde -1 (None yerine). greedy: next_action aktörün
+# politikasına göre greedy miydi (Watkins Q(λ) iz kesme kararı öğrenende yok).
+TRANSITION_DTYPE = np.dtype(
+    [
+        ("player", np.uint8),
+        ("state", np.int32),
+        ("action", np.int8),
+        ("reward", np.float32),
+        ("next_state", np.int32),
+        ("next_action", np.int8),
+        ("done", np.bool_),
+        ("greedy", np.bool_),
+    ]
+)
 
 
-def q_variance(agent):
-    if hasattr(agent, "q"):
-        return float(np.var(agent.q))
+class TransitionRecorder(Agent):
+    """
+    Aktör tarafında politika ajanını saran ve güncellemeleri kaydeden ajan.
+
+    play_episode bu ajanın update() metodunu öğrenen bir ajanınkiyle aynı
+    argümanlarla çağırır; öğrenmek yerine argümanlar tampona yazılır. Öğrenen
+    süreç aynı çağrıları aynı sırayla gerçek ajana uygular.
+    """
+
+    is_learning = True
+
+    def __init__(self, policy, player, buffer):
+        super().__init__()
+        self.policy = policy
+        self.player = player
+        self.buffer = buffer
+        self.greedy = True
+
+    def select_action(self, state, valid_moves, board, player, explore=True):
+        action = self.policy.select_action(state, valid_moves, board, player, explore)
+        # Q(λ) politikası seçimin greedy olup olmadığını işaretler; diğerleri için True.
+        self.greedy = getattr(self.policy, "greedy_choice", True)
+        return action
+
+    def update(
+        self, state, action, reward, next_state=None, next_action=None, done=False
+    ):
+        self.buffer.append(
+            (
+                self.player,
+                state,
+                action,
+                reward,
+                -1 if next_state is None else next_state,
+                -1 if next_action is None else next_action,
+                done,
+                self.greedy,
+            )
+        )
+
+
+def _actor_main(actor_id, spec, queue):
+    """
+    Aktör süreci: paylaşımlı bellekteki politika anlık görüntüsüyle bölüm üretir.
+
+    Her sync_episodes bölümde paylaşımlı tablolar yerel kopyaya alınır (sürüm
+    değiştiyse). Yayın bir seqlock ile korunur: öğrenen yazarken sürüm tektir,
+    bitince çifttir; kopyadan sonra sürüm değiştiyse veya tekse kopya tekrarlanır,
+    böylece anlık görüntü iki yayının satırlarını karıştırmaz. Her batch_episodes
+    bölümde kompakt geçiş dizisi ve kazananlar kuyruğa gönderilir. Son mesaj
+    ("done", aktör_id, bölüm, süre) istatistiğidir.
+    """
+    random.seed(spec["seed"] + actor_id)
+    env = TicTacToeEnv()
+    header_shm = shared_memory.SharedMemory(name=spec["header"])
+    header = np.ndarray((3,), dtype=np.float64, buffer=header_shm.buf)
+    table_shms = [shared_memory.SharedMemory(name=name) for name in spec["tables"]]
+    shared = [
+        np.ndarray(spec["shape"], dtype=np.float32, buffer=shm.buf)
+        for shm in table_shms
+    ]
+    agent_cls = LEARNING_AGENT_CLASSES[spec["algorithm"]]
+    policies = [
+        agent_cls(f"actor{actor_id}-{role}", spec["shape"][0], 0.0, 1.0, 0.0, 0.0, 1.0)
+        for role in ("X", "O")
+    ]
+    buffer = []
+    recorders = [
+        TransitionRecorder(policy, player, buffer)
+        for policy, player in zip(policies, (1, 2))
+    ]
+    version = None
+    winners = []
+    started = time.perf_counter()
+    try:
+        for episode in range(spec["episodes"]):
+            if episode % spec["sync_episodes"] == 0 and header[0] != version:
+                while True:
+                    before = header[0]
+                    if before % 2:
+                        # Öğrenen şu an yayınlıyor: işlemciyi bırakıp yeniden dene.
+                        time.sleep(0)
+                        continue
+                    snapshot = [table.copy() for table in shared]
+                    epsilons = header[1:].copy()
+                    if header[0] == before:
+                        break
+                    time.sleep(0)
+                version = before
+                for policy, table, epsilon in zip(policies, snapshot, epsilons):
+                    policy.q = table
+                    policy.epsilon = float(epsilon)
+            winners.append(play_episode(env, recorders[0], recorders[1]))
+            if (
+                len(winners) == spec["batch_episodes"]
+                or episode + 1 == spec["episodes"]
+            ):
+                queue.put(("batch", np.array(buffer, dtype=TRANSITION_DTYPE), winners))
+                buffer.clear()
+                winners = []
+        queue.put(("done", actor_id, spec["episodes"], time.perf_counter() - started))
+    finally:
+        header_shm.close()
+        for shm in table_shms:
+            shm.close()
+
+
+def apply_transitions(batch, agent_x, agent_o):
+    # Öğrenen tarafı: kompakt geçişler kayıt sırasıyla gerçek ajanlara uygulanır.
+    # Sıralı uygulama bilinçlidir: yığında aynı (s, a) çifti ve bir güncellemenin
+    # hedefi olan durum sık tekrarlanır; vektörize (np.add.at) toplu güncelleme
+    # aynı eski değerden hesaplanan adımları üst üste ekleyip play_episode'daki
+    # sıralı TD semantiğini bozar ve izli/planlayıcı/int16 ajanlarla çalışmaz.
+    agents = (None, agent_x, agent_o)
+    for row in batch.tolist():
+        player, state, action, reward, next_state, next_action, done, greedy = row
+        agent = agents[player]
+        if hasattr(agent, "greedy_choice"):
+            agent.greedy_choice = greedy
+        agent.update(
+            state,
+            action,
+            reward,
+            next_state=None if next_state < 0 else next_state,
+            next_action=None if next_action < 0 else next_action,
+            done=done,
+        )
+
+
+def train_actor_learner(
+    env,
+    agent_x,
+    agent_o,
+    episodes,
+    actors,
+    batch_episodes=16,
+    sync_episodes=64,
+    seed=42,
+    log_interval=0,
+    log_window=200,
+    label="Self-play",
+    event_log=None,
+    quality=None,
+):
+    """
+    Self-play'in dağıtık sürümü: çok sayıda aktör süreci ve tek öğrenen.
+
+    play_episode'da simülasyon ve öğrenme aynı iş parçacığındadır. Bu modda:
+    - Aktörler (multiprocessing.Process) paylaşımlı bellekteki (SharedMemory)
+      politika anlık görüntüsüyle bölüm oynar ve kompakt geçiş yığınlarını
+      (TRANSITION_DTYPE) bir multiprocessing.Queue üzerinden gönderir.
+    - Öğrenen (ana süreç) yığınları gerçek ajanlara uygular, epsilon'u tüketilen
+      bölüm başına azaltır ve her sync_episodes bölümde yeni parametreleri
+      (tablolar + epsilon + sürüm) paylaşımlı belleğe yayınlar.
+
+    Aktörler birkaç yayın gerisinden oynayabilir (off-policy gecikme) ve yığınların
+    varış sırası süreç zamanlamasına bağlıdır; bu nedenle sonuçlar sıralı
+    self-play ile birebir aynı değildir. Yalnızca 3x3 tahtada (süreçler arası
+    ortak STATE_INDEX) kullanılabilir.
+
+    Dönüş:
+        tuple: (scores, throughput) — throughput aktör ve öğrenen hızlarını ayrı verir
+    """
+    if not is_classic_board(env):
+        raise ValueError("Aktör–öğrenen modu yalnızca 3x3 tahtada kullanılabilir")
+    tables = [
+        q_table_array(agent, env.n_states).astype(np.float32)
+        for agent in (agent_x, agent_o)
+    ]
+    header_shm = shared_memory.SharedMemory(create=True, size=3 * 8)
+    table_shms = [
+        shared_memory.SharedMemory(create=True, size=table.nbytes) for table in tables
+    ]
+    header = np.ndarray((3,), dtype=np.float64, buffer=header_shm.buf)
+    shared = [
+        np.ndarray(table.shape, dtype=np.float32, buffer=shm.buf)
+        for table, shm in zip(tables, table_shms)
+    ]
+
+    def publish(version):
+        # Seqlock: yazım boyunca sürüm tek, bitince çift (aktörler tutarlı kopyalar).
+        header[0] = 2 * version + 1
+        for agent, view in zip((agent_x, agent_o), shared):
+            view[:] = q_table_array(agent, env.n_states)
+        header[1:] = (agent_x.epsilon, agent_o.epsilon)
+        header[0] = 2 * version + 2
+
+    publish(0)
+    context = mp.get_context()
+    queue = context.Queue(maxsize=4 * actors)
+    spec = {
+        "header": header_shm.name,
+        "tables": [shm.name for shm in table_shms],
+        "shape": tables[0].shape,
+        "algorithm": type(agent_x).__name__,
+        "batch_episodes": batch_episodes,
+        "sync_episodes": sync_episodes,
+        "seed": seed,
+    }
+    processes = []
+    for actor_id in range(actors):
+        # Bölümler aktörlere olabildiğince eşit dağıtılır.
+        share = episodes // actors + (1 if actor_id < episodes % actors else 0)
+        processes.append(
+            context.Process(
+                target=_actor_main,
+                args=(actor_id, {**spec, "episodes": share}, queue),
+                daemon=True,
+            )
+        )
+
+    scores = []
+    actor_stats = []
+    transitions = 0
+    learner_seconds = 0.0
+    started = time.perf_counter()
+    try:
+        for process in processes:
+            process.start()
+        finished = 0
+        while finished < actors:
+            try:
+                message = queue.get(timeout=1.0)
+            except Empty:
+                # Çöken aktörün "done" mesajı hiç gelmez: sonsuza dek beklenmez.
+                failed = [
+                    process.exitcode
+                    for process in processes
+                    if process.exitcode not in (None, 0)
+                ]
+                if failed:
+                    raise RuntimeError(f"Aktör süreci hata ile sonlandı: {failed}")
+                continue
+            if message[0] == "done":
+                finished += 1
+                actor_stats.append(message[1:])
+                continue
+            _, batch, winners = message
+            applied = time.perf_counter()
+            apply_transitions(batch, agent_x, agent_o)
+            learner_seconds += time.perf_counter() - applied
+            transitions += len(batch)
+            for winner in winners:
+                scores.append(score_from_winner(winner, player_id=1))
+                agent_x.decay_epsilon()
+                agent_o.decay_epsilon()
+                episode = len(scores)
+                if log_interval and (
+                    episode % log_interval == 0 or episode == episodes
+                ):
+                    log_training_progress(label, episode, episodes, scores, log_window)
+                if event_log is not None and episode % event_log.interval == 0:
+                    event_log.emit_interval(
+                        label, episode, episodes, scores, log_window, agent_x
+                    )
+                if quality is not None and episode % quality.interval == 0:
+                    quality.record(label, episode, agent_x, agent_o)
+                if episode % sync_episodes == 0:
+                    publish(episode // sync_episodes)
+        for process in processes:
+            process.join()
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for shm in [header_shm, *table_shms]:
+            shm.close()
+            shm.unlink()
+
+    wall_seconds = time.perf_counter() - started
+    throughput = {
+        "actors": actors,
+        "episodes": len(scores),
+        "wall_seconds": wall_seconds,
+        "actor_episodes_per_sec": [
+            count / seconds if seconds else None
+            for _, count, seconds in sorted(actor_stats)
+        ],
+        "total_actor_episodes_per_sec": len(scores) / wall_seconds,
+        "learner_transitions_per_sec": (
+            transitions / learner_seconds if learner_seconds else None
+        ),
+        "learner_busy_fraction": learner_seconds / wall_seconds,
+    }
+    return scores, throughput
+
+
+def play_matchup_games(env, pair_a, pair_b, start, count, observers=None):
+    # Değerlendirme: keşif kapalı, salt performans ölçümü.
+    # Adil karşılaştırma için her maçta X/O rolleri değiştiririz; rol oyunun
+    # genel sırasına (start + i) göre belirlenir, böylece yığınlar dengede kalır.
+    scores = []
+    for game in range(start, start + count):
+        if game % 2 == 0:
+            winner = play_episode(
+                env,
+                pair_a.agent_x,
+                pair_b.agent_o,
+                train_x=False,
+                train_o=False,
+                explore_x=False,
+                explore_o=False,
+                observers=observers,
+            )
+            scores.append(score_from_winner(winner, player_id=1))
+        else:
+            winner = play_episode(
+                env,
+                pair_b.agent_x,
+                pair_a.agent_o,
+                train_x=False,
+                train_o=False,
+                explore_x=False,
+                explore_o=False,
+                observers=observers,
+            )
+            scores.append(score_from_winner(winner, player_id=2))
+    return scores
+
+
+def evaluate_matchup(env, pair_a, pair_b, games, observers=None, score_log=None):
+    # score_log (liste) verilirse oyun başına skorlar (pair_a açısından) eklenir.
+    scores = play_matchup_games(env, pair_a, pair_b, 0, games, observers)
+    if score_log is not None:
+        score_log.extend(scores)
+    return summarize_scores(scores)
+
+
+def wilson_interval(successes, total, z):
+    # Oran için Wilson skor aralığı (küçük n ve 0/1'e yakın oranlarda da geçerli).
+    if total == 0:
+        return 0.0, 1.0
+    rate = successes / total
+    denominator = 1 + z * z / total
+    center = (rate + z * z / (2 * total)) / denominator
+    half = z * math.sqrt(rate * (1 - rate) / total + z * z / (4 * total * total))
+    half /= denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+def sprt_llr(wins, losses, delta):
+    # Wald SPRT log-olabilirlik oranı: belirleyici oyunlarda (beraberlikler hariç)
+    # H1: P(kazanma) = 0.5 + delta, H0: P(kazanma) = 0.5 - delta.
+    p1, p0 = 0.5 + delta, 0.5 - delta
+    return wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+
+
+def evaluate_matchup_adaptive(
+    env,
+    pair_a,
+    pair_b,
+    max_games,
+    batch=50,
+    ci_width=0.1,
+    confidence=0.95,
+    sprt_delta=0.1,
+    observers=None,
+    score_log=None,
+):
+    """
+    Ardışık test ile uyarlanır değerlendirme: sonuç belli olunca durur.
+
+    Oyunlar batch'lik yığınlarla oynanır (X/O dönüşümü korunur). Her yığından
+    sonra kazanma/beraberlik/mağlubiyet oranları için Wilson aralıkları hesaplanır.
+    Üç aralığın da genişliği ci_width altına inerse ("width") veya belirleyici
+    oyunlarda Wald SPRT karar verirse ("sprt") karşılaşma durur. α = β =
+    1 - confidence alınır. Hiçbiri olmazsa max_games oyunda durur ("max_games").
+
+    Argümanlar:
+        env: Ortam
+        pair_a (AgentPair): Skorların ait olduğu taraf
+        pair_b (AgentPair): Rakip
+        max_games (int): Oyun üst sınırı (tournament_games)
+        batch (int): Durma kuralı denetimleri arasındaki oyun sayısı
+        ci_width (float): Hedef aralık genişliği (üst - alt)
+        confidence (float): Aralık güven düzeyi ve SPRT hata oranları
+        sprt_delta (float): SPRT hipotezlerinin 0.5'ten sapması
+        observers (list|None): play_episode gözlemcileri
+        score_log (list|None): Verilirse oyun başına skorlar eklenir
+
+    Dönüş:
+        dict: summarize_scores() alanları + games, stop, sprt ("A", "B" veya
+        "undecided") ve win/draw/loss_ci_low/high
+    """
+    if batch < 1:
+        raise ValueError("batch en az 1 olmalıdır")
+    if not 0.0 < confidence < 1.0 or not 0.0 < sprt_delta < 0.5:
+        raise ValueError("confidence (0, 1), sprt_delta (0, 0.5) aralığında olmalıdır")
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    error = 1 - confidence
+    upper = math.log((1 - error) / error)
+    lower = math.log(error / (1 - error))
+    scores = []
+    stop = "max_games"
+    decision = "undecided"
+    while len(scores) < max_games:
+        count = min(batch, max_games - len(scores))
+        scores.extend(
+            play_matchup_games(env, pair_a, pair_b, len(scores), count, observers)
+        )
+        summary = summarize_scores(scores)
+        llr = sprt_llr(summary["wins"], summary["losses"], sprt_delta)
+        if llr >= upper or llr <= lower:
+            stop = "sprt"
+            decision = "A" if llr >= upper else "B"
+            break
+        intervals = [
+            wilson_interval(summary[key], len(scores), z)
+            for key in ("wins", "draws", "losses")
+        ]
+        if all(high - low <= ci_width for low, high in intervals):
+            stop = "width"
+            break
+    if score_log is not None:
+        score_log.extend(scores)
+    summary = summarize_scores(scores)
+    summary["games"] = len(scores)
+    summary["stop"] = stop
+    summary["sprt"] = decision
+    for key, name in (("wins", "win"), ("draws", "draw"), ("losses", "loss")):
+        low, high = wilson_interval(summary[key], len(scores), z)
+        summary[f"{name}_ci_low"] = low
+        summary[f"{name}_ci_high"] = high
+    return summary
+
+
+def collect_action_counts(env, agent, opponent_agent, games, agent_first=True):
+    # Isı haritası için ajan hamlelerinin hangi hücrelerde yoğunlaştığını ölçer.
+    action_counts = np.zeros(env.n_actions, dtype=np.int32)
+    for _ in range(games):
+        if agent_first:
+            play_episode(
+                env,
+                agent,
+                opponent_agent,
+                train_x=False,
+                train_o=False,
+                explore_x=False,
+                explore_o=False,
+                track_actions=action_counts,
+                track_player_id=1,
+            )
+        else:
+            play_episode(
+                env,
+                opponent_agent,
+                agent,
+                train_x=False,
+                train_o=False,
+                explore_x=False,
+                explore_o=False,
+                track_actions=action_counts,
+                track_player_id=2,
+            )
+    return action_counts
+
+
+def q_variance(agent, n_states=None):
+    # n_states verilirse yalnızca indekslenmiş satırlar (büyüme kapasitesi hariç) sayılır.
+    if not hasattr(agent, "q"):
+        return None
+    scale = getattr(agent, "q_scale", None) or 1.0
+    if isinstance(agent.q, (SparseQTable, CSRQTable)):
+        # Seyrek tabloda açılmamış satırlar, CSR'de yasal olmayan hücreler örtük
+        # sıfırdır: varyans toplamlardan hesaplanır.
+        values = agent.q.stored_values().astype(np.float64) * scale
+        total = max(n_states or len(agent.q), len(agent.q)) * agent.q.n_actions
+        mean = values.sum() / total
+        return float((values**2).sum() / total - mean**2)
+    return float(np.var(agent.q[:n_states].astype(np.float64) * scale))
+
+
+def greedy_actions(q_table, legal_mask):
+    # Vektörize greedy politika: her satırda yasal aksiyonlar arasında argmax
+    # (eşitlikte ilk indeks). Yasal aksiyonu olmayan satırlar için -1.
+    masked = np.where(legal_mask, q_table.astype(np.float32), -np.inf)
+    actions = np.argmax(masked, axis=1)
+    actions[~legal_mask.any(axis=1)] = -1
+    return actions
+
+
+def precision_drift(reference, tournament_log, agents, env):
+    """
+    Düşük hassasiyetli çalışmanın float32 referansından ne kadar saptığını ölçer.
+
+    Aynı tohumla float32 çalıştırılan referans deneyle karşılaştırılır:
+    - Turnuva: her karşılaşma için kazanma/beraberlik/mağlubiyet oranı farkı
+    - Greedy politika: en az bir tablonun ziyaret ettiği (sıfır olmayan) ve yasal
+      aksiyonu olan durumlarda greedy aksiyonun aynı kalma oranı
+
+    Argümanlar:
+        reference (ExperimentResult): float32 referans çalışmanın sonucu
+        tournament_log (dict): Düşük hassasiyetli çalışmanın turnuva özeti
+        agents (dict): Düşük hassasiyetli çalışmanın öğrenen ajanları (ad -> ajan)
+        env: Ortam (durum sayısı ve yasal aksiyon maskesi için)
+
+    Dönüş:
+        dict: {"tournament": {...}, "policy": {...}}
+    """
+    tournament = {}
+    for label, summary in tournament_log.items():
+        ref_summary = reference.payload["tournament"].get(label)
+        if ref_summary is None:
+            continue
+        tournament[label] = {
+            key: summary[key] - ref_summary[key]
+            for key in ("win_rate", "draw_rate", "loss_rate")
+        }
+
+    # Lazy indeksli tahtalarda iki çalışma farklı durumlar görebilir; ortak önek kullanılır.
+    n_states = min(env.n_states, reference.env.n_states)
+    legal = env.legal_action_mask()[:n_states]
+    policy = {}
+    for name, agent in agents.items():
+        ref_table = q_action_values(reference.agents[name], n_states)
+        table = q_action_values(agent, n_states)
+        visited = (np.any(ref_table != 0, axis=1) | np.any(table != 0, axis=1)) & (
+            legal.any(axis=1)
+        )
+        same = greedy_actions(ref_table, legal) == greedy_actions(table, legal)
+        compared = int(visited.sum())
+        policy[name] = {
+            "compared_states": compared,
+            "greedy_agreement": float(same[visited].mean()) if compared else None,
+            "max_abs_q_error": (
+                float(np.max(np.abs(ref_table - table.astype(np.float32))))
+                if n_states
+                else 0.0
+            ),
+        }
+    return {"tournament": tournament, "policy": policy}
+
+
+# ============================================================================
+# OPTİMAL REFERANS (Sabit Rakibe Karşı Değer İterasyonu)
+# ============================================================================
+
+# Değer iterasyonunun desteklediği sabit rakipler.
+OPTIMAL_OPPONENTS = ("random", "minimax")
+
+
+def minimax_optimal_actions(transitions=None):
+    """
+    Her durumda sıradaki oyuncu için minimax-optimal aksiyon maskesi, (n_states, 9).
+
+    Oyun değeri sıradaki oyuncunun bakışıyla hesaplanır: terminalde son hamleyi
+    yapan kazandıysa -1, beraberlikte 0. Grafik döngüsüz, derinlik en fazla 9;
+    vektörize geri yayılım birkaç taramada kesinleşir.
+    """
+    next_state, _, winner = transitions or STATE_TRANSITIONS
+    legal = LEGAL_ACTIONS
+    terminal_value = np.where((winner == 1) | (winner == 2), -1.0, 0.0)
+    value = terminal_value.copy()
+    safe_next = np.where(legal, next_state, 0)
+    for _ in range(10):
+        child = np.where(legal, -value[safe_next], -np.inf)
+        updated = np.where(winner == 0, child.max(axis=1), terminal_value)
+        if np.array_equal(updated, value):
+            break
+        value = updated
+    child = np.where(legal, -value[safe_next], -np.inf)
+    return legal & (child == value[:, None])
+
+
+def reachable_states(transitions=None):
+    # Boş tahtadan yasal hamlelerle ulaşılabilen durumlar (katman katman genişletme).
+    next_state, _, _ = transitions or STATE_TRANSITIONS
+    reachable = np.zeros(len(next_state), dtype=bool)
+    reachable[STATE_INDEX[(0,) * 9]] = True
+    frontier = reachable.copy()
+    while frontier.any():
+        children = np.zeros_like(reachable)
+        children[next_state[frontier][LEGAL_ACTIONS[frontier]]] = True
+        frontier = children & ~reachable
+        reachable |= frontier
+    return reachable
+
+
+def opponent_policy(opponent, transitions):
+    """
+    Sabit rakibin her durumdaki aksiyon olasılıkları, (n_states, 9).
+
+    - "random": yasal aksiyonlar arasında düzgün dağılım (RandomAgent)
+    - "minimax": minimax-optimal aksiyonlar arasında düzgün dağılım; MinimaxAgent
+      eşit değerli en iyi aksiyonlar arasından rastgele seçer
+    """
+    if opponent == "random":
+        best = LEGAL_ACTIONS
+    elif opponent == "minimax":
+        best = minimax_optimal_actions(transitions)
+    else:
+        raise ValueError(f"Bilinmeyen sabit rakip: {opponent}")
+    counts = best.sum(axis=1, keepdims=True)
+    return np.divide(best, counts, out=np.zeros(best.shape), where=counts > 0)
+
+
+def optimal_q_table(opponent, gamma, transitions=None):
+    """
+    Sabit bir rakibe karşı optimal Q* tablosunu değer iterasyonu ile hesaplar.
+
+    Sabit rakip ortamın bir parçası sayılırsa ajan için olağan bir MDP kalır:
+    ajan a'ya oynar; kazanırsa +1, beraberlikte 0; aksi halde rakip politikasına
+    göre hamle yapar; rakip kazanırsa -1, aksi halde ajan yeni durumda
+    γ max_a' Q*(s',a') alır (play_episode'daki ödül ve iskonto ile aynı).
+
+    Tablo BaseLearningAgent.q ile aynı (n_states, 9) düzenindedir. Her satır o
+    durumda sırası gelen oyuncunun (X veya O) bakışıyla hesaplandığı için tek tablo
+    hem X hem O ajanını kapsar. Tüm 5478 durum üzerinde vektörize taramalar yapılır;
+    oyun grafiği döngüsüz olduğundan en fazla 5 ajan hamlesi derinliğinde kesin
+    sonuca ulaşılır. Yasal olmayan aksiyonlar ve terminal satırlar 0'dır.
+
+    Argümanlar:
+        opponent (str): "random" veya "minimax"
+        gamma (float): İndirgeme faktörü (ajanların gamma'sı ile aynı olmalı)
+        transitions (tuple|None): Geçiş tabloları (varsayılan STATE_TRANSITIONS)
+
+    Dönüş:
+        np.ndarray: (n_states, 9) float64 Q* tablosu
+    """
+    transitions = transitions or STATE_TRANSITIONS
+    next_state, _, winner = transitions
+    legal = LEGAL_ACTIONS
+    policy = opponent_policy(opponent, transitions)
+    safe_next = np.where(legal, next_state, 0)
+
+    # Ajan hamlesinden sonraki durumun sonucu: ajan kazandı (+1), berabere (0), devam.
+    agent_won = np.isin(winner, (1, 2))
+    ongoing = winner == 0
+    q = np.zeros(legal.shape)
+    for _ in range(10):
+        value = np.where(legal, q, -np.inf).max(axis=1)
+        value[~ongoing] = 0.0
+        # Rakip hamlesi sonrası: rakip kazandı (-1), berabere (0) veya γ V(s').
+        after_opponent = np.where(
+            agent_won, -1.0, np.where(ongoing, gamma * value, 0.0)
+        )
+        opponent_value = (policy * after_opponent[safe_next]).sum(axis=1)
+        outcome = np.where(agent_won, 1.0, np.where(ongoing, opponent_value, 0.0))
+        updated = np.where(legal, outcome[safe_next], 0.0)
+        if np.array_equal(updated, q):
+            break
+        q = updated
+    return q
+
+
+def optimality_metrics(pair, q_star, transitions, tol=1e-9):
+    """
+    Öğrenilmiş ajan çiftinin Q* tablosuna uzaklığı (ucuz, tamamen vektörize).
+
+    X ajanı X'in, O ajanı O'nun sırası olan terminal olmayan durumlarda ölçülür:
+    - mean_abs_q_error: yasal (durum, aksiyon) çiftlerinde ortalama |Q - Q*|
+    - greedy_agreement: greedy aksiyonun Q*-optimal aksiyonlardan biri olma oranı
+    """
+    _, mover, _ = transitions
+    legal = LEGAL_ACTIONS
+    n_states = len(mover)
+    optimal = (
+        q_star >= np.where(legal, q_star, -np.inf).max(axis=1, keepdims=True) - tol
+    )
+    errors = []
+    agreement = []
+    for agent, player in ((pair.agent_x, 1), (pair.agent_o, 2)):
+        rows = (mover == player) & legal.any(axis=1)
+        table = q_action_values(agent, n_states)[rows].astype(np.float64)
+        errors.append(np.abs(table - q_star[rows])[legal[rows]])
+        greedy = greedy_actions(table, legal[rows])
+        agreement.append(optimal[rows][np.arange(len(greedy)), greedy])
+    return {
+        "mean_abs_q_error": float(np.concatenate(errors).mean()),
+        "greedy_agreement": float(np.concatenate(agreement).mean()),
+    }
+
+
+class OptimalBaseline:
+    """
+    Sabit rakiplere karşı Q* tabloları ve aşama başına hata ölçütleri.
+
+    Q* tabloları çalışma başında bir kez hesaplanır (milisaniyeler); ölçütler her
+    aşama sonunda öğrenen çiftler için yeniden hesaplanır. Yalnızca 3x3 tahtada
+    (tam sayılmış durum uzayı) kullanılabilir.
+    """
+
+    def __init__(self, gamma, opponents=OPTIMAL_OPPONENTS):
+        self.transitions = STATE_TRANSITIONS
+        self.tables = {
+            opponent: optimal_q_table(opponent, gamma, self.transitions)
+            for opponent in opponents
+        }
+
+    def metrics(self, pairs):
+        return {
+            name: {
+                opponent: optimality_metrics(pair, q_star, self.transitions)
+                for opponent, q_star in self.tables.items()
+            }
+            for name, pair in pairs.items()
+        }
+
+    def save(self, output_dir, filename="optimal_q.npz"):
+        path = Path(output_dir) / filename
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path,
+            **{opponent: q.astype(np.float32) for opponent, q in self.tables.items()},
+        )
+        return path
+
+
+class PolicyQualityTracker:
+    """
+    Eğitim sırasında periyodik politika kalitesi: minimax-optimal hamle oranı.
+
+    Hareketli kazanma oranı rakibi de ölçer; bu ölçüt yalnızca ajana bakar. Her
+    interval bölümde, ajanın oynadığı roldeki (X veya O) erişilebilir ve terminal
+    olmayan her durumda greedy aksiyonun minimax-optimal aksiyonlardan biri olup
+    olmadığı Q tablosu üzerinde tek vektörize geçişle kontrol edilir.
+
+    Optimal maske ve erişilebilir durumlar başlangıçta bir kez hesaplanır; her
+    kayıt yalnızca ~2700 satırlık bir argmax'tır (yüzlerce kez çalıştırılabilir).
+    Eğriler {etiket: {"episodes": [...], "optimal_rate": [...]}} biçimindedir.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self.curves = {}
+        _, mover, _ = STATE_TRANSITIONS
+        decision = reachable_states() & LEGAL_ACTIONS.any(axis=1)
+        optimal = minimax_optimal_actions()
+        self.roles = {}
+        for player in (1, 2):
+            rows = np.flatnonzero(decision & (mover == player))
+            self.roles[player] = (rows, LEGAL_ACTIONS[rows], optimal[rows])
+
+    def optimal_rate(self, agent_x=None, agent_o=None):
+        hits = 0
+        total = 0
+        for agent, player in ((agent_x, 1), (agent_o, 2)):
+            if agent is None:
+                continue
+            rows, legal, optimal = self.roles[player]
+            if isinstance(getattr(agent, "q", None), CSRQTable):
+                # CSR: argmax doğrudan seçili satırların yasal değerleri üzerinde.
+                greedy = agent.q.legal_argmax(rows)
+            else:
+                table = q_action_values(agent, VALID_STATE_COUNT)[rows]
+                greedy = greedy_actions(table, legal)
+            hits += int(optimal[np.arange(len(rows)), greedy].sum())
+            total += len(rows)
+        return hits / total if total else 0.0
+
+    def record(self, label, episode, agent_x=None, agent_o=None):
+        curve = self.curves.setdefault(label, {"episodes": [], "optimal_rate": []})
+        curve["episodes"].append(episode)
+        curve["optimal_rate"].append(self.optimal_rate(agent_x, agent_o))
+
+
+def policy_quality_tracker(config, env):
+    # Yalnızca 3x3 tahtada (tam sayılmış durum uzayı) ve interval > 0 iken açılır.
+    if config.quality_interval > 0 and is_classic_board(env):
+        return PolicyQualityTracker(config.quality_interval)
     return None
 
 
-def save_json(output_dir, payload, filename="results.json"):
-    # Deney çıktısını JSON'a kaydeder.
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    path = output_path / filename
-    with path.open("w", encoding="utf-8") as handle:
-        json.dump(payload, handle, indent=2)
-    return path
+class VisitationCounter:
+    """
+    Aşama ve ajan başına durum ziyaret sayaçları (play_episode gözlemcisi).
+
+    Her (aşama, ajan) için önceden ayrılmış bir int64 dizi tutulur; hamle başına
+    maliyet tek bir dict araması ve dizi artırımıdır. m×n×k tahtalarda tembel
+    indeks büyüdükçe dizi kapasitesi ikiye katlanır. Her interval bölümde ajan
+    başına ziyaret edilen durum sayısı ve o anki epsilon kaydedilir; böylece
+    kapsamanın keşif azaldıkça nasıl değiştiği izlenebilir.
+
+    Özet (summary) ajanın oynadığı roldeki (X veya O) karar durumlarına göre
+    kapsama yüzdesi, ziyaret entropisi (bit) ve derinliğe (taş sayısı) göre
+    ziyaret edilmeyen durum sayılarını üretir. m×n×k'de payda yalnızca
+    indekslenmiş (en az bir kez görülmüş) durumlardır.
+    """
+
+    def __init__(self, n_states, interval=500):
+        self.capacity = max(n_states, LAZY_INITIAL_CAPACITY)
+        self.interval = interval
+        self.phases = {}
+        self.phase = None
+        self.counts = None
+
+    def begin(self, label):
+        self.phase = self.phases.setdefault(
+            label, {"counts": {}, "roles": {}, "curves": {}, "episodes": 0}
+        )
+        self.counts = self.phase["counts"]
+
+    def on_step(self, agent, player, state, action):
+        counts = self.counts.get(agent)
+        if counts is None:
+            counts = self.counts[agent] = np.zeros(self.capacity, dtype=np.int64)
+            self.phase["roles"][agent] = player
+        if state >= len(counts):
+            counts = self.counts[agent] = np.concatenate(
+                [
+                    counts,
+                    np.zeros(max(state + 1, 2 * len(counts)) - len(counts), np.int64),
+                ]
+            )
+        counts[state] += 1
+
+    def on_end(self, winner):
+        self.phase["episodes"] += 1
+        episodes = self.phase["episodes"]
+        if self.interval and episodes % self.interval == 0:
+            for agent, counts in self.counts.items():
+                curve = self.phase["curves"].setdefault(
+                    agent, {"episodes": [], "visited_states": [], "epsilon": []}
+                )
+                curve["episodes"].append(episodes)
+                curve["visited_states"].append(int(np.count_nonzero(counts)))
+                curve["epsilon"].append(getattr(agent, "epsilon", None))
+
+    def decision_states(self, env):
+        # Rol başına karar durumları maskesi: (oyuncu -> bool dizisi), ve derinlikler.
+        if is_classic_board(env):
+            _, mover, _ = STATE_TRANSITIONS
+            live = reachable_states() & LEGAL_ACTIONS.any(axis=1)
+            depth = np.count_nonzero(STATE_BOARDS, axis=1)
+        else:
+            boards = env.state_index.boards()
+            mover = np.where(
+                (boards == 1).sum(axis=1) == (boards == 2).sum(axis=1), 1, 2
+            )
+            live = env.legal_action_mask().any(axis=1)
+            depth = np.count_nonzero(boards, axis=1)
+        return {player: live & (mover == player) for player in (1, 2)}, depth
+
+    @staticmethod
+    def agent_names(phase):
+        # Rapor adı: ajan adı; aynı adlı ajanlar (ör. iki Random) rolle ayrılır.
+        names = {
+            agent: getattr(agent, "name", type(agent).__name__)
+            for agent in phase["counts"]
+        }
+        repeated = [
+            name for name in names.values() if list(names.values()).count(name) > 1
+        ]
+        for agent, name in names.items():
+            if name in repeated:
+                names[agent] = f"{name} ({'X' if phase['roles'][agent] == 1 else 'O'})"
+        return names
+
+    def summary(self, env):
+        masks, depth = self.decision_states(env)
+        report = {}
+        for label, phase in self.phases.items():
+            if not phase["counts"]:
+                continue
+            names = self.agent_names(phase)
+            phase_report = {}
+            for agent, counts in phase["counts"].items():
+                mask = masks[phase["roles"][agent]]
+                visits = np.zeros(len(mask), dtype=np.int64)
+                size = min(len(mask), len(counts))
+                visits[:size] = counts[:size]
+                decision_visits = visits[mask]
+                total = int(decision_visits.sum())
+                probabilities = decision_visits[decision_visits > 0] / max(total, 1)
+                unvisited = mask & (visits == 0)
+                phase_report[names[agent]] = {
+                    "player": "X" if phase["roles"][agent] == 1 else "O",
+                    "decision_states": int(mask.sum()),
+                    "visited_states": int(probabilities.size),
+                    "coverage": probabilities.size / max(int(mask.sum()), 1),
+                    "visits": total,
+                    "entropy_bits": float(
+                        -(probabilities * np.log2(probabilities)).sum()
+                    ),
+                    "unvisited_states": int(unvisited.sum()),
+                    "unvisited_by_depth": {
+                        int(d): int(n)
+                        for d, n in zip(
+                            *np.unique(depth[unvisited], return_counts=True)
+                        )
+                    },
+                    "curve": phase["curves"].get(agent),
+                }
+            report[label] = phase_report
+        return report
+
+    def dump(self, directory):
+        # Ham sayaçlar: aşama/ajan başına bir .npy (dosya adı: aşama__ajan.npy).
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for label, phase in self.phases.items():
+            names = self.agent_names(phase)
+            for agent, counts in phase["counts"].items():
+                stem = "".join(
+                    char if char.isalnum() else "_"
+                    for char in f"{label}__{names[agent]}"
+                )
+                path = directory / f"{stem}.npy"
+                np.save(path, counts)
+                paths.append(path)
+        return paths
+
+
+class EventLog:
+    """
+    Uzun eğitimler için yalnızca ekleme yapılan (append-only), tamponlu JSONL olay akışı.
+
+    Her satır bir olaydır: {"event": tür, "time": unix zamanı, ...alanlar}. Olaylar
+    bellekte biriktirilir ve flush_every olay veya flush_seconds saniye dolunca tek
+    yazımla diske aktarılır; böylece eğitim döngüsü her bölümde disk beklemez.
+    Çökme durumunda en fazla son tampon kaybolur (atexit ile normal/istisnalı
+    çıkışlarda tampon yine yazılır).
+
+    Olay Türleri:
+    -------------
+    - run_start: config ile birlikte çalışma başlangıcı
+    - phase_start / phase_end: aşama işaretleri
+    - interval: eğitim döngüsünden pencere özeti (event_interval bölümde bir)
+    - training_summary: aşama sonu eğitim özeti (results.json "training")
+    - tournament: karşılaşma sonucu (results.json "tournament")
+    - profile: aşama süresi, bölüm/saniye ve tepe bellek örneği
+    - section: results.json'un diğer üst düzey bölümleri
+    - run_end: çalışma sonu
+
+    results_from_events() bu akıştan results.json içeriğini yeniden kurar.
+    """
+
+    def __init__(self, path, interval=100, flush_every=64, flush_seconds=5.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.interval = max(1, interval)
+        self.flush_every = max(1, flush_every)
+        self.flush_seconds = flush_seconds
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._handle = self.path.open("a", encoding="utf-8")
+        atexit.register(self.close)
+
+    def emit(self, kind, **fields):
+        # Olay hemen serileştirilir (sonradan değişen nesnelerden etkilenmez).
+        self.extend([json.dumps({"event": kind, "time": time.time(), **fields})])
+
+    def extend(self, lines):
+        # Serileştirilmiş olay satırlarını ekler (aşama süreçlerinden gelenler dahil).
+        self._buffer.extend(lines)
+        if (
+            len(self._buffer) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def emit_interval(self, phase, episode, total, scores, window, agent=None):
+        # Eğitim döngüsü ara özeti: son pencere üzerinden oranlar ve mevcut epsilon.
+        window = min(window, len(scores))
+        self.emit(
+            "interval",
+            phase=phase,
+            episode=episode,
+            total=total,
+            epsilon=getattr(agent, "epsilon", None),
+            **summarize_scores(scores[-window:]),
+        )
+
+    def flush(self):
+        if self._handle is None:
+            return
+        if self._buffer:
+            self._handle.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self._handle.flush()
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._handle is None:
+            return
+        self.flush()
+        self._handle.close()
+        self._handle = None
+        atexit.unregister(self.close)
+
+
+class PhaseEventBuffer(EventLog):
+    """
+    Aşama süreci için dosyasız olay tamponu (EventLog arayüzü).
+
+    Olaylar EventLog ile aynı biçimde serileştirilip lines listesinde tutulur. Ana
+    süreç aşamayı bildirim sırasında işlerken satırları EventLog.extend() ile akışa
+    ekler; böylece paralel aşamaların olayları (phase_start, interval, profile,
+    phase_end) sıralı çalıştırmadakiyle aynı sırada yazılır. Zaman damgaları olayın
+    süreçteki gerçek zamanıdır, bu yüzden akışta artan sırada olmayabilir.
+    """
+
+    def __init__(self, interval):
+        self.interval = max(1, interval)
+        self.lines = []
+
+    def extend(self, lines):
+        self.lines.extend(lines)
+
+
+def open_event_log(config):
+    # Config'e göre olay akışını açar; kapalıysa None (eğitim döngüsü maliyetsiz).
+    if not config.event_log:
+        return None
+    return EventLog(
+        Path(config.output_dir) / "events.jsonl",
+        interval=config.event_interval,
+        flush_every=config.event_flush_every,
+        flush_seconds=config.event_flush_seconds,
+    )
+
+
+@contextmanager
+def logged_phase(event_log, phase, episodes=None):
+    # Aşama işaretleri ve profil örneği: süre, bölüm/saniye, tepe bellek.
+    if event_log is None:
+        yield
+        return
+    event_log.emit("phase_start", phase=phase, episodes=episodes)
+    start = time.perf_counter()
+    yield
+    seconds = time.perf_counter() - start
+    event_log.emit(
+        "profile",
+        phase=phase,
+        seconds=seconds,
+        episodes=episodes,
+        episodes_per_sec=(episodes / seconds) if episodes and seconds > 0 else None,
+        max_rss_kb=(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            if resource is not None
+            else None
+        ),
+    )
+    event_log.emit("phase_end", phase=phase)
+
+
+def results_from_events(path):
+    """
+    JSONL olay akışından results.json içeriğini yeniden kurar.
+
+    Dosyaya birden fazla çalışma eklenmişse yalnızca son run_start sonrası kullanılır.
+    Yarıda kalmış (çökmüş) bir çalışmada o ana kadar biten aşamalar döner.
+
+    Argümanlar:
+        path (str|Path): events.jsonl yolu
+
+    Dönüş:
+        dict: {"config", "training", "tournament", ...diğer bölümler, "complete"}
+    """
+    payload = {}
+    with Path(path).open(encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                # Çökme sırasında yarım yazılmış son satır atlanır.
+                continue
+            kind = event.get("event")
+            if kind == "run_start":
+                payload = {"config": event["config"], "training": {}, "tournament": {}}
+            elif kind == "training_summary":
+                payload.setdefault("training", {})[event["label"]] = event["summary"]
+            elif kind == "tournament":
+                payload.setdefault("tournament", {})[event["matchup"]] = event[
+                    "summary"
+                ]
+            elif kind == "optimality":
+                payload.setdefault("optimality", {})[event["phase"]] = event["metrics"]
+            elif kind == "section":
+                payload[event["name"]] = event["data"]
+            elif kind == "run_end":
+                payload["complete"] = True
+    payload.setdefault("complete", False)
+    return payload
+
+
+# Yörünge kaydı: bölüm başına sabit genişlikli indeks satırı (12 bayt).
+# offset: states/actions dosyalarındaki ilk hamle, length: hamle sayısı,
+# winner: 1/2/DRAW, tag: aşama/karşılaşma etiketi (meta.json'daki tags listesi).
+EPISODE_DTYPE = np.dtype(
+    [("offset", "<u8"), ("length", "<u2"), ("winner", "u1"), ("tag", "u1")]
+)
+TRAJECTORY_FILES = {
+    "states": ("states.u16", np.dtype("<u2")),
+    "actions": ("actions.u8", np.dtype("u1")),
+    "episodes": ("episodes.bin", EPISODE_DTYPE),
+}
+
+
+class TrajectoryRecorder:
+    """
+    Eğitim ve turnuva oyunlarını kompakt ikili yörünge günlüğüne ekler.
+
+    play_episode gözlemcisi olarak her hamlede (durum, aksiyon) çiftini, bölüm
+    sonunda kazananı alır. Veriler üç düz dosyaya yazılır:
+    - states.u16: hamleden önceki durum indeksi (uint16, hamle başına 2 bayt)
+    - actions.u8: seçilen hücre (uint8, hamle başına 1 bayt)
+    - episodes.bin: EPISODE_DTYPE ofset indeksi (bölüm başına 12 bayt)
+
+    Hamleler Python listelerinde biriktirilir ve flush_episodes bölümde bir kez
+    numpy dizisine çevrilip dosya sonuna eklenir; hamle başına maliyet iki
+    list.append'tir. Sıradaki oyuncu hamle sırasından (X, O, X, ...) çıkar.
+    m×n×k tahtalarda tembel indeks sırası çalışmaya özgü olduğundan kapanışta
+    durum kodları (state_codes.npy) da yazılır.
+    """
+
+    def __init__(self, directory, env, flush_episodes=4096):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.env = env
+        self.flush_episodes = flush_episodes
+        self.handles = {
+            key: (self.directory / filename).open("wb")
+            for key, (filename, _) in TRAJECTORY_FILES.items()
+        }
+        self.tags = []
+        self.label = ""
+        self.tag = None
+        self.offset = 0
+        self.states = []
+        self.actions = []
+        self.episodes = []
+        self.episode_start = 0
+
+    def begin(self, label):
+        # Sonraki bölümler bu etiketle kaydedilir (aşama veya turnuva eşleşmesi).
+        # Etiket ilk bölümde listeye girer; bölümsüz etiketler meta.json'a yazılmaz.
+        self.label = label
+        self.tag = None
+
+    def on_step(self, agent, player, state, action):
+        self.states.append(state)
+        self.actions.append(action)
+
+    def on_end(self, winner):
+        if self.tag is None:
+            if self.label not in self.tags:
+                if len(self.tags) == 256:
+                    raise ValueError("Yörünge günlüğü en fazla 256 etiket destekler")
+                self.tags.append(self.label)
+            self.tag = self.tags.index(self.label)
+        length = len(self.states) - self.episode_start
+        self.episodes.append(
+            (self.offset + self.episode_start, length, winner, self.tag)
+        )
+        self.episode_start = len(self.states)
+        if len(self.episodes) >= self.flush_episodes:
+            self.flush()
+
+    def flush(self):
+        if not self.episodes:
+            return
+        states = np.array(self.states[: self.episode_start], dtype=np.int64)
+        if states.size and states.max() > np.iinfo(np.uint16).max:
+            raise ValueError("Durum indeksi uint16 aralığını aşıyor (> 65535)")
+        states.astype("<u2").tofile(self.handles["states"])
+        np.array(self.actions[: self.episode_start], dtype="u1").tofile(
+            self.handles["actions"]
+        )
+        np.array(self.episodes, dtype=EPISODE_DTYPE).tofile(self.handles["episodes"])
+        self.offset += self.episode_start
+        # Yarım kalan bölüm (varsa) bir sonraki yazıma taşınır.
+        del self.states[: self.episode_start]
+        del self.actions[: self.episode_start]
+        self.episodes = []
+        self.episode_start = 0
+
+    def close(self):
+        self.flush()
+        for handle in self.handles.values():
+            handle.close()
+        meta = {
+            "rows": self.env.rows,
+            "cols": self.env.cols,
+            "k": self.env.k,
+            "tags": self.tags,
+            "moves": self.offset,
+        }
+        if not is_classic_board(self.env):
+            np.save(
+                self.directory / "state_codes.npy", self.env.state_index.code_array()
+            )
+        (self.directory / "meta.json").write_text(
+            json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+        return self.directory
+
+
+class TrajectoryLog:
+    """
+    TrajectoryRecorder günlüğünün np.memmap tabanlı okuyucusu (sıfır kopya).
+
+    Dosyalar bellek eşlemeli açılır; dilimler diske dayalı görünümlerdir, bu
+    yüzden milyonlarca bölüm RAM'e yüklenmeden taranabilir:
+
+        log = TrajectoryLog("outputs/trajectories")
+        states, actions, winner, tag = log.episode(0)
+        for chunk in log.chunks(100_000): ...
+    """
+
+    def __init__(self, directory):
+        self.directory = Path(directory)
+        meta_path = self.directory / "meta.json"
+        self.meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        self.tags = self.meta["tags"]
+        arrays = {}
+        for key, (filename, dtype) in TRAJECTORY_FILES.items():
+            path = self.directory / filename
+            # Boş dosya memmap ile açılamaz; boş dizi aynı arayüzü sağlar.
+            if path.stat().st_size:
+                arrays[key] = np.memmap(path, dtype=dtype, mode="r")
+            else:
+                arrays[key] = np.zeros(0, dtype=dtype)
+        self.states = arrays["states"]
+        self.actions = arrays["actions"]
+        self.episodes = arrays["episodes"]
+
+    def __len__(self):
+        return len(self.episodes)
+
+    def episode(self, index):
+        # (durumlar, aksiyonlar, kazanan, etiket) — durum/aksiyon dizileri görünümdür.
+        record = self.episodes[index]
+        start = int(record["offset"])
+        stop = start + int(record["length"])
+        return (
+            self.states[start:stop],
+            self.actions[start:stop],
+            int(record["winner"]),
+            self.tags[record["tag"]],
+        )
+
+    def chunks(self, episodes_per_chunk):
+        # Ardışık bölüm blokları: (bölüm indeksi görünümü, durumlar, aksiyonlar).
+        # Blok içindeki offset'ler blok başına göre yeniden hesaplanmaz; kullanıcı
+        # offset - ilk offset ile blok içi konuma geçer.
+        for start in range(0, len(self.episodes), episodes_per_chunk):
+            records = self.episodes[start : start + episodes_per_chunk]
+            first = int(records["offset"][0])
+            last = int(records["offset"][-1]) + int(records["length"][-1])
+            yield records, self.states[first:last], self.actions[first:last]
+
+
+def trajectory_transitions(records, states, actions):
+    """
+    Bir yörünge bloğunu play_episode'un update() çağrılarına karşılık gelen
+    TRANSITION_DTYPE satırlarına çevirir (vektörize, Python döngüsü yok).
+
+    Bölümdeki t. hamleyi yapan oyuncu t çiftse X, tekse O'dur. Hamle t için:
+    - t son hamle ise: terminal, ödül kazandıysa +1, beraberlikte 0
+    - t sondan bir önceki hamle ise: terminal, rakip kazandıysa -1, yoksa 0
+    - aksi halde: ödül 0, sonraki durum/aksiyon aynı oyuncunun t+2. hamlesi
+
+    Argümanlar:
+        records: EPISODE_DTYPE bölüm satırları (TrajectoryLog.chunks bloğu)
+        states, actions: Bloğun ilk bölümünden başlayan hamle dizileri
+
+    Dönüş:
+        np.ndarray: TRANSITION_DTYPE geçişleri (greedy alanı her zaman True)
+    """
+    lengths = records["length"].astype(np.int64)
+    starts = records["offset"].astype(np.int64) - int(records["offset"][0])
+    episode = np.repeat(np.arange(len(records)), lengths)
+    position = np.arange(len(episode)) - starts[episode]
+    remaining = lengths[episode] - position
+    winner = records["winner"][episode]
+    player = np.where(position % 2 == 0, 1, 2).astype(np.uint8)
+    done = remaining <= 2
+    reward = np.zeros(len(episode), dtype=np.float32)
+    last = remaining == 1
+    reward[last & (winner == player)] = 1.0
+    reward[(remaining == 2) & (winner != DRAW)] = -1.0
+    following = np.minimum(np.arange(len(episode)) + 2, max(len(episode) - 1, 0))
+    transitions = np.zeros(len(episode), dtype=TRANSITION_DTYPE)
+    transitions["player"] = player
+    transitions["state"] = states
+    transitions["action"] = actions
+    transitions["reward"] = reward
+    # uint16/uint8 kayıtlar -1 işaretinden önce işaretli tipe genişletilir.
+    transitions["next_state"] = np.where(done, -1, states[following].astype(np.int32))
+    transitions["next_action"] = np.where(done, -1, actions[following].astype(np.int8))
+    transitions["done"] = done
+    transitions["greedy"] = True
+    return transitions
+
+
+OFFLINE_METHODS = ("fqi", "sweep")
+
+
+def fit_offline(
+    log,
+    algorithm,
+    n_states,
+    legal_mask,
+    alpha=1.0,
+    gamma=0.95,
+    iterations=30,
+    method="fqi",
+    chunk_episodes=65536,
+    tags=None,
+):
+    """
+    Kayıtlı yörüngelerden simülasyonsuz (offline) tablo Q-Learning / SARSA.
+
+    Günlük TrajectoryLog.chunks ile bloklar halinde okunur; bellekte yalnızca
+    bir blok ve iki Q tablosu (X ve O) tutulur, bu yüzden günlük RAM'den büyük
+    olabilir. Her blokta hedefler vektörize hesaplanır:
+    - Q-Learning: r + γ max_a' Q(s',a') (yalnızca yasal a')
+    - SARSA: r + γ Q(s',a') (kayıttaki a')
+    ve aynı (s,a) çiftinin hedefleri np.bincount ile ortalanır.
+
+    Yöntemler:
+    - fqi: Tablo fitted-Q-iteration; hedefler tüm günlük boyunca sabit Q ile
+      toplanır, tarama sonunda Q(s,a) ← Q + α (ortalama hedef - Q) uygulanır.
+      α = 1 saf FQI'dir (ampirik Bellman yedeklemesi).
+    - sweep: Toplu tarama; aynı güncelleme her blok sonunda uygulanır, sonraki
+      bloklar güncel tabloyu görür (daha hızlı yayılım, blok boyutuna bağlı).
+
+    Dönüş:
+        (tablolar, artıklar, ziyaret): {1: Q_X, 2: Q_O} float64 tablolar, tarama
+        başına en büyük |ortalama hedef - Q| ve ziyaret edilen (s,a) sayısı
+    """
+    if algorithm not in ("q", "sarsa"):
+        raise ValueError(f"Bilinmeyen offline algoritma: {algorithm}")
+    if method not in OFFLINE_METHODS:
+        raise ValueError(f"Bilinmeyen offline yöntem: {method}")
+    n_actions = legal_mask.shape[1]
+    size = n_states * n_actions
+    tables = {player: np.zeros((n_states, n_actions)) for player in (1, 2)}
+    tag_ids = None
+    if tags is not None:
+        tag_ids = [index for index, tag in enumerate(log.tags) if tag in tags]
+    sums = {player: np.zeros(size) for player in (1, 2)}
+    counts = {player: np.zeros(size) for player in (1, 2)}
+    visited = {player: np.zeros(size, dtype=bool) for player in (1, 2)}
+    residuals = []
+
+    def apply(player):
+        # Ortalama hedefe doğru α adımı; dönüş: bu adımdaki en büyük |hata|.
+        seen = counts[player] > 0
+        flat = tables[player].reshape(-1)
+        error = sums[player][seen] / counts[player][seen] - flat[seen]
+        flat[seen] += alpha * error
+        visited[player] |= seen
+        sums[player][:] = 0.0
+        counts[player][:] = 0.0
+        return float(np.abs(error).max()) if error.size else 0.0
+
+    for _ in range(iterations):
+        residual = 0.0
+        for records, states, actions in log.chunks(chunk_episodes):
+            transitions = trajectory_transitions(records, states, actions)
+            if tag_ids is not None:
+                keep = np.isin(np.repeat(records["tag"], records["length"]), tag_ids)
+                transitions = transitions[keep]
+            for player in (1, 2):
+                rows = transitions[transitions["player"] == player]
+                if not len(rows):
+                    continue
+                table = tables[player]
+                target = rows["reward"].astype(np.float64)
+                live = ~rows["done"]
+                next_states = rows["next_state"][live]
+                if algorithm == "q":
+                    future = np.where(
+                        legal_mask[next_states], table[next_states], -np.inf
+                    )
+                    target[live] += gamma * future.max(axis=1)
+                else:
+                    target[live] += (
+                        gamma * table[next_states, rows["next_action"][live]]
+                    )
+                flat = rows["state"].astype(np.int64) * n_actions + rows["action"]
+                sums[player] += np.bincount(flat, weights=target, minlength=size)
+                counts[player] += np.bincount(flat, minlength=size)
+                if method == "sweep":
+                    residual = max(residual, apply(player))
+        if method == "fqi":
+            residual = max(apply(1), apply(2))
+        residuals.append(residual)
+    coverage = int(visited[1].sum() + visited[2].sum())
+    return tables, residuals, coverage
+
+
+def offline_env(log):
+    # Günlüğün tahtası için ortam; m×n×k'de durum kodları kayıt sırasıyla indekslenir.
+    meta = log.meta
+    dims = (meta["rows"], meta["cols"], meta["k"])
+    if dims == CLASSIC_DIMS:
+        return TicTacToeEnv()
+    env = MNKEnv(*dims)
+    for code in np.load(log.directory / "state_codes.npy"):
+        env.state_index.index_code(int(code))
+    return env
+
+
+def offline_agent_pair(name, agent_cls, prefix, tables, alpha, gamma):
+    # Offline tablolardan keşfi kapalı (epsilon=0) ajan çifti; turnuvada kullanılır.
+    agents = []
+    for role, player in (("X", 1), ("O", 2)):
+        table = tables[player]
+        agent = agent_cls(
+            f"{prefix}-{role}",
+            table.shape[0],
+            alpha,
+            gamma,
+            0.0,
+            0.0,
+            1.0,
+            n_actions=table.shape[1],
+        )
+        agent.q = table.astype(np.float32)
+        agents.append(agent)
+    return AgentPair(name, agents[0], agents[1])
+
+
+def atomic_write(path, write, binary=False):
+    # Geçici dosyaya yazıp os.replace ile yerine koyar: okuyucular (ve çökme
+    # sonrası kalan dosya) hiçbir zaman yarım yazılmış içerik görmez.
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(
+        f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+    )
+    try:
+        if binary:
+            with temporary.open("wb") as handle:
+                write(handle)
+        else:
+            with temporary.open("w", newline="", encoding="utf-8") as handle:
+                write(handle)
+        os.replace(temporary, path)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+    return path
+
+
+class ArtifactWriter:
+    """
+    Artefakt serileştirme ve dosya yazımını arka plan iş parçacığına taşır.
+
+    submit() işi sınırlı bir kuyruğa ekler ve hemen döner; kuyruk doluysa
+    (max_pending iş) çağıran bekler, böylece bekleyen veri miktarı sınırlı kalır.
+    Tek bir işçi iş parçacığı işleri sırayla çalıştırır. Dosyalar atomic_write
+    ile yazılır. flush() kuyruk boşalana kadar bekler ve işçide oluşan ilk
+    hatayı yeniden fırlatır; süreç çıkışında close() (atexit) kalan işleri yazar.
+
+    Gönderilen veriler iş bitene kadar değiştirilmemelidir (kopyalanmaz).
+    """
+
+    def __init__(self, max_pending=16):
+        self.queue = Queue(maxsize=max_pending)
+        self.errors = []
+        self.thread = threading.Thread(
+            target=self._run, name="artifact-writer", daemon=True
+        )
+        self.thread.start()
+        atexit.register(self.close)
+
+    def _run(self):
+        while True:
+            job = self.queue.get()
+            try:
+                if job is None:
+                    return
+                function, args, kwargs = job
+                function(*args, **kwargs)
+            # Hata ana iş parçacığında flush() ile yüzeye çıkar.
+            except Exception as error:
+                self.errors.append(error)
+            finally:
+                self.queue.task_done()
+
+    def submit(self, function, *args, **kwargs):
+        if not self.thread.is_alive():
+            raise RuntimeError("Artefakt yazıcısı kapatıldı")
+        self.queue.put((function, args, kwargs))
+
+    def flush(self):
+        self.queue.join()
+        if self.errors:
+            error = self.errors[0]
+            self.errors = []
+            raise error
+
+    def close(self):
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        atexit.unregister(self.close)
+        if self.errors:
+            for error in self.errors:
+                print(f"Uyarı: artefakt yazılamadı: {error}", file=sys.stderr)
+            self.errors = []
+
+
+# Süreç başına tek yazıcı: ardışık deneyler (ör. --compare-precision) aynı kuyruğu
+# paylaşır, önceki çalışmanın dosyaları yazılırken sonraki eğitim başlar.
+_ARTIFACT_WRITER = {}
+
+
+def artifact_writer():
+    writer = _ARTIFACT_WRITER.get("writer")
+    if writer is None or not writer.thread.is_alive():
+        writer = _ARTIFACT_WRITER["writer"] = ArtifactWriter()
+    return writer
+
+
+def save_json(output_dir, payload, filename="results.json", writer=None):
+    # Deney çıktısını JSON'a kaydeder (atomik; writer verilirse arka planda).
+    path = Path(output_dir) / filename
+
+    def write(handle):
+        json.dump(payload, handle, indent=2)
+
+    if writer is not None:
+        writer.submit(atomic_write, path, write)
+        return path
+    return atomic_write(path, write)
+
+
+def save_csv(output_dir, rows, filename="tournament.csv", writer=None):
+    # Turnuva özetini CSV formatında saklar (atomik; writer verilirse arka planda).
+    path = Path(output_dir) / filename
+
+    def write(handle):
+        csv_writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
+        csv_writer.writeheader()
+        csv_writer.writerows(rows)
+
+    if writer is not None:
+        writer.submit(atomic_write, path, write)
+        return path
+    return atomic_write(path, write)
+
+
+class ResultCache:
+    """
+    Config'e göre içerik adresli (content-addressed) aşama sonuç önbelleği.
+
+    Aynı Config ile tekrar çalıştırmalarda (ör. grafikleri yeniden üretmek için)
+    tam eğitimin bedelini tekrar ödememek için her aşamanın çıktısı (skorlar,
+    turnuva özeti) ve aşama sonundaki durum (ajanlar/Q tabloları, ortam, RNG)
+    anahtarı altında pickle olarak saklanır.
+
+    Anahtar (phase_cache_key):
+    -------------------------
+    sha256(CACHE_VERSION (modül kaynağının özeti) + aşama adı + ilgili asdict(config) alanları + önceki
+    aşamanın anahtarı). Zincirleme sayesinde bir aşamanın girdisi değişirse o
+    aşama ve sonrakiler yeniden çalışır, öncekiler önbellekten gelir.
+
+    LRU Tahliyesi:
+    -------------
+    Her isabette dosyanın değişiklik zamanı güncellenir; toplam boyut max_bytes'ı
+    aşınca en eski kullanılan girdiler silinir.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return self.directory / f"{key}.pkl"
+
+    def load(self, key):
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            with path.open("rb") as handle:
+                entry = pickle.load(handle)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # Bozuk veya eski sürüm girdi: yok sayılır ve yeniden üretilir.
+            return None
+        os.utime(path)  # LRU: son kullanım zamanı
+        return entry
+
+    def store(self, key, entry):
+        # Atomik yazım: geçici dosya + yeniden adlandırma (yarım girdi kalmaz).
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        path = self._path(key)
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = sorted(
+            (entry.stat().st_mtime, entry.stat().st_size, entry)
+            for entry in self.directory.glob("*.pkl")
+        )
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in entries:
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self):
+        for entry in self.directory.glob("*.pkl"):
+            entry.unlink(missing_ok=True)
 
 
-def save_csv(output_dir, rows, filename="tournament.csv"):
-    # Turnuva özetini CSV formatında saklar.
-    output_path = Path(output_dir)
-    output_path.mkdir(parents=True, exist_ok=True)
-    path = output_path / filename
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
-    return path
+def open_result_cache(config):
+    # Config'e göre önbelleği açar; kapalıysa veya kod sürümü bilinmiyorsa None.
+    if not config.cache or CACHE_VERSION is None:
+        return None
+    return ResultCache(config.cache_dir, int(config.cache_max_mb * 1024 * 1024))
+
+
+# Önbellek anahtarına girmeyen alanlar: sonuçları etkilemeyen çıktı/log ayarları.
+# moving_avg_window ve convergence_threshold özetleri skorlar üzerinden sonradan
+# hesaplandığı için anahtara girmez.
+CACHE_EXCLUDED_FIELDS = {
+    "output_dir",
+    "log_interval",
+    "moving_avg_window",
+    "convergence_threshold",
+    "event_log",
+    "event_interval",
+    "event_flush_every",
+    "event_flush_seconds",
+    "cache",
+    "cache_dir",
+    "cache_max_mb",
+    "save_agents",
+    "optimal_baseline",
+    "record_trajectories",
+    "trajectory_flush_episodes",
+    "history_points",
+    "history_downsample",
+    "background_io",
+    "bundle",
+    "bundle_compress",
+    "plot_format",
+    "plot_dpi",
+    "plot_workers",
+    "phase_workers",
+    "visitation",
+    "visitation_interval",
+    "visitation_dump",
+}
+
+# Aşamaya özgü sayım alanları: yalnızca ilgili aşamanın anahtarına girer.
+PHASE_COUNT_FIELDS = {
+    "self_play_episodes",
+    "cross_play_episodes",
+    "baseline_episodes",
+    "tournament_games",
+}
+
+# Sayım alanına bağlı ek ayarlar: yalnızca o sayım alanını kullanan aşamalara girer.
+PHASE_SPECIFIC_FIELDS = {
+    "tournament_games": {
+        "tournament_adaptive",
+        "tournament_batch",
+        "tournament_ci_width",
+        "tournament_confidence",
+        "tournament_sprt_delta",
+    },
+}
+
+
+def phase_cache_key(config, phase, count_field, previous_key):
+    # Aşama anahtarı: kod sürümü + modül adı + aşama + ilgili config alanları +
+    # önceki aşama. Girdiler canlı ajan/ortam nesnelerini pickle'lar; sınıf yolu
+    # modül adını (__main__ veya tictactoe_rl) içerdiği için farklı giriş
+    # noktalarının girdileri birbirine karışmaz.
+    other_fields = {
+        name
+        for field, names in PHASE_SPECIFIC_FIELDS.items()
+        if field != count_field
+        for name in names
+    }
+    fields = {
+        name: value
+        for name, value in asdict(config).items()
+        if name not in CACHE_EXCLUDED_FIELDS
+        and name not in other_fields
+        and (name not in PHASE_COUNT_FIELDS or name == count_field)
+    }
+    blob = json.dumps(
+        [CACHE_VERSION, __name__, phase, fields, previous_key],
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
 
 
 def moving_average(scores, window):
-    # Eğitim izleme: galibiyetlerin hareketli ortalaması.
+    # Eğitim izleme: galibiyetlerin hareketli ortalaması (kümülatif toplamla O(n)).
     if len(scores) < window:
-        return []
-    values = np.array([1 if score == 1 else 0 for score in scores], dtype=np.float32)
-    kernel = np.ones(window, dtype=np.float32) / window
-    return np.convolve(values, kernel, mode="valid").tolist()
+        return np.zeros(0, dtype=np.float32)
+    wins = np.concatenate([[0], np.cumsum(np.asarray(scores) == 1)])
+    return ((wins[window:] - wins[:-window]) / window).astype(np.float32)
+
+
+HISTORY_DOWNSAMPLE_CHOICES = ("lttb", "minmax")
+
+
+def lttb_indices(values, points):
+    """
+    Largest-Triangle-Three-Buckets: eğrinin şeklini koruyan points örnek indeksi.
+
+    İlk ve son nokta sabittir; aradaki noktalar points - 2 kovaya bölünür ve her
+    kovadan, önceki seçilen nokta ile sonraki kovanın ortalamasıyla en büyük
+    üçgeni oluşturan nokta seçilir. Tepe ve çukurlar (ani düşüşler) korunur.
+    Döngü kova başınadır (points kez), kova içi alan hesabı vektörizedir.
+    """
+    n = len(values)
+    if points >= n or points < 3:
+        return np.arange(n)
+    x = np.arange(n, dtype=np.float64)
+    y = np.asarray(values, dtype=np.float64)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    previous = 0
+    for bucket in range(points - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        mean_x = x[stop:next_stop].mean()
+        mean_y = y[stop:next_stop].mean()
+        area = np.abs(
+            (x[previous] - mean_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (mean_y - y[previous])
+        )
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def minmax_indices(values, points):
+    # Min/maks kovaları: points / 2 kovanın her birinden en küçük ve en büyük nokta.
+    n = len(values)
+    if points >= n or points < 2:
+        return np.arange(n)
+    values = np.asarray(values)
+    # Uç noktalar ayrıca eklendiği için kova sayısı points / 2 - 1 (toplam ≤ points).
+    edges = np.linspace(0, n, max(points // 2 - 1, 1) + 1).astype(np.int64)
+    picks = [0, n - 1]
+    for start, stop in zip(edges[:-1], edges[1:]):
+        segment = values[start:stop]
+        picks += [start + int(segment.argmin()), start + int(segment.argmax())]
+    return np.unique(picks)
+
+
+def training_history(scores, window, points=2000, method="lttb"):
+    """
+    Eğitim geçmişi: hareketli ortalama kazanma oranı, points noktaya indirgenmiş.
+
+    Tam seri yalnızca bu fonksiyon içinde vardır; saklanan ve çizilen geçmiş
+    {"episodes": int64 dizi, "win_rate": float32 dizi} biçimindedir. episodes,
+    ortalama penceresinin bittiği bölümdür. points = 0 indirgemeyi kapatır.
+    """
+    series = moving_average(scores, window)
+    if points and len(series) > points:
+        picker = lttb_indices if method == "lttb" else minmax_indices
+        index = picker(series, points)
+    else:
+        index = np.arange(len(series))
+    return {"episodes": index + window, "win_rate": series[index]}
+
+
+def save_figure(path, dpi):
+    # Etkin şekli atomik olarak kaydeder; biçim dosya uzantısından alınır.
+    atomic_write(
+        path,
+        lambda handle: plt.savefig(
+            handle,
+            format=Path(path).suffix[1:],
+            dpi=dpi,
+            bbox_inches="tight",
+            facecolor="white",
+        ),
+        binary=True,
+    )
 
 
 def apply_plot_style():
@@ -1169,7 +4304,7 @@ def apply_plot_style():
     return None
 
 
-def plot_training(histories, output_dir):
+def plot_training(histories, output_dir, fmt="png", dpi=300):
     # Görselleştirme: eğitim sürecinde kazanma oranı trendi (Seaborn ile)
     if plt is None:
         return None
@@ -1179,16 +4314,29 @@ def plot_training(histories, output_dir):
 
     fig, ax = plt.subplots(figsize=(12, 6))
 
-    # DataFrame oluşturma ve seaborn ile çizim
-    data = []
-    for label, series in histories.items():
-        if not series:
-            continue
-        for i, value in enumerate(series):
-            data.append({"Bölüm": i, "Kazanma Oranı": value, "Yöntem": label})
+    # Geçmişler indirgenmiş NumPy dizileridir; DataFrame sütunları doğrudan
+    # birleştirilir (nokta başına Python nesnesi oluşturulmaz).
+    valid_items = [
+        (label, history)
+        for label, history in histories.items()
+        if len(history["win_rate"])
+    ]
 
-    if data and pd is not None and sns is not None:
-        df = pd.DataFrame(data)
+    if valid_items and pd is not None and sns is not None:
+        df = pd.DataFrame(
+            {
+                "Bölüm": np.concatenate(
+                    [history["episodes"] for _, history in valid_items]
+                ),
+                "Kazanma Oranı": np.concatenate(
+                    [history["win_rate"] for _, history in valid_items]
+                ),
+                "Yöntem": np.repeat(
+                    [label for label, _ in valid_items],
+                    [len(history["win_rate"]) for _, history in valid_items],
+                ),
+            }
+        )
         sns.lineplot(
             data=df,
             x="Bölüm",
@@ -1199,15 +4347,20 @@ def plot_training(histories, output_dir):
             alpha=0.9,
             ax=ax,
         )
-    elif data:
+    elif valid_items:
         # Fallback: pandas/seaborn yoksa manuel çizim
         from itertools import cycle
 
         colors = palette if palette is not None else ["blue", "orange", "green", "red"]
-        valid_items = [(label, series) for label, series in histories.items() if series]
-        for (label, series), color in zip(valid_items, cycle(colors)):
-            x_values = np.arange(len(series))
-            ax.plot(x_values, series, label=label, linewidth=2, alpha=0.9, color=color)
+        for (label, history), color in zip(valid_items, cycle(colors)):
+            ax.plot(
+                history["episodes"],
+                history["win_rate"],
+                label=label,
+                linewidth=2,
+                alpha=0.9,
+                color=color,
+            )
     else:
         # Çizilecek veri yok
         return None
@@ -1221,13 +4374,47 @@ def plot_training(histories, output_dir):
     sns.despine(ax=ax)
 
     plt.tight_layout()
-    path = output_path / "training.png"
-    plt.savefig(path, dpi=300, bbox_inches="tight", facecolor="white")
+    path = output_path / f"training.{fmt}"
+    save_figure(path, dpi)
+    plt.close()
+    return path
+
+
+def plot_policy_quality(quality, output_dir, fmt="png", dpi=300):
+    # Görselleştirme: eğitim boyunca minimax-optimal greedy hamle oranı.
+    # Kazanma oranı geçmişlerinden ayrı çizilir: x ekseni ölçüm bölümleridir
+    # (her quality_interval bölümde bir nokta) ve ölçüt rakipten bağımsızdır.
+    if plt is None or not quality:
+        return None
+    apply_plot_style()
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    fig, ax = plt.subplots(figsize=(12, 6))
+    for label, curve in quality.items():
+        ax.plot(
+            curve["episodes"],
+            curve["optimal_rate"],
+            label=label,
+            linewidth=2,
+            alpha=0.9,
+        )
+    ax.set_title("Minimax-Optimal Hamle Oranı", pad=20, fontweight="bold")
+    ax.set_xlabel("Bölüm", labelpad=10)
+    ax.set_ylabel("Optimal Durum Oranı", labelpad=10)
+    ax.legend(frameon=True, fancybox=True, shadow=True, loc="lower right")
+    ax.grid(True, alpha=0.3)
+    if sns is not None:
+        sns.despine(ax=ax)
+
+    plt.tight_layout()
+    path = output_path / f"policy_quality.{fmt}"
+    save_figure(path, dpi)
     plt.close()
     return path
 
 
-def plot_tournament(tournament, output_dir):
+def plot_tournament(tournament, output_dir, fmt="png", dpi=300):
     # Turnuva sonuçları: kazanma/beraberlik/mağlubiyet oranlarını yığılı çubuk gösterir (Seaborn ile)
     if plt is None:
         return None
@@ -1315,20 +4502,25 @@ def plot_tournament(tournament, output_dir):
     sns.despine(ax=ax)
 
     plt.tight_layout()
-    path = output_path / "tournament.png"
-    plt.savefig(path, dpi=300, bbox_inches="tight", facecolor="white")
+    path = output_path / f"tournament.{fmt}"
+    save_figure(path, dpi)
     plt.close()
     return path
 
 
-def plot_action_heatmap(action_counts, title, output_dir, filename):
-    # Ajanın hangi hücreleri tercih ettiğini gösteren 3x3 ısı haritası (Seaborn ile)
+def plot_action_heatmap(
+    action_counts, title, output_dir, filename, shape=(3, 3), fmt="png", dpi=300
+):
+    # Ajanın hangi hücreleri tercih ettiğini gösteren ısı haritası (Seaborn ile)
+    # shape: tahta boyutu (satır, sütun); varsayılan klasik 3x3.
+    # filename uzantısı fmt ile belirlenir (ör. "heatmap_q" -> heatmap_q.svg).
     if plt is None:
         return None
     apply_plot_style()
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
-    grid = np.array(action_counts, dtype=np.int32).reshape(3, 3)
+    rows, cols = shape
+    grid = np.array(action_counts, dtype=np.int32).reshape(rows, cols)
 
     fig, ax = plt.subplots(figsize=(6, 5))
 
@@ -1355,8 +4547,8 @@ def plot_action_heatmap(action_counts, title, output_dir, filename):
         # Fallback matplotlib
         im = ax.imshow(grid, cmap="viridis")
         plt.colorbar(im, ax=ax)
-        for row_index in range(3):
-            for col_index in range(3):
+        for row_index in range(rows):
+            for col_index in range(cols):
                 value = int(grid[row_index, col_index])
                 ax.text(
                     col_index,
@@ -1374,21 +4566,133 @@ def plot_action_heatmap(action_counts, title, output_dir, filename):
     ax.set_ylabel("Satır", labelpad=10)
 
     # Tick etiketlerini ayarla
-    ax.set_xticks(np.arange(3) + 0.5)
-    ax.set_yticks(np.arange(3) + 0.5)
-    ax.set_xticklabels([1, 2, 3])
-    ax.set_yticklabels([1, 2, 3])
+    ax.set_xticks(np.arange(cols) + 0.5)
+    ax.set_yticks(np.arange(rows) + 0.5)
+    ax.set_xticklabels(range(1, cols + 1))
+    ax.set_yticklabels(range(1, rows + 1))
 
     sns.despine(ax=ax)
 
     plt.tight_layout()
-    path = output_path / filename
-    plt.savefig(path, dpi=300, bbox_inches="tight", facecolor="white")
+    path = output_path / f"{Path(filename).stem}.{fmt}"
+    save_figure(path, dpi)
     plt.close()
     return path
 
 
-def print_summary(training, tournament):
+PLOT_FORMATS = ("png", "svg", "pdf", "jpg")
+# Çizim girdilerinin özetleri: {dosya adı: sha256}; girdisi değişmeyen grafik atlanır.
+PLOT_HASH_FILE = ".plot_hashes.json"
+
+
+def _plot_worker_init():
+    # Çizim işçileri etkileşimsiz Agg arka ucuyla çalışır (ekran/GUI gerekmez).
+    if plt is not None:
+        plt.switch_backend("Agg")
+
+
+def _plot_worker_render(task):
+    function, kwargs = task
+    path = function(**kwargs)
+    return str(path) if path else None
+
+
+def render_plots(tasks, output_dir, fmt="png", dpi=300, workers=0):
+    """
+    Grafikleri süreç havuzunda paralel çizer; girdisi değişmeyenleri atlar.
+
+    Her görev (ad, çizim fonksiyonu, argümanlar) üçlüsüdür. Fonksiyon adı,
+    argümanlar, biçim ve DPI'nın sha256 özeti output_dir/.plot_hashes.json
+    içindeki kayıtla aynıysa ve dosya duruyorsa grafik yeniden çizilmez. Kalan
+    grafikler Agg arka uçlu işçilerde eşzamanlı çizilir; tek grafik kaldığında
+    veya workers = 1 iken havuz açılmaz.
+
+    Argümanlar:
+        tasks (list): (ad, fonksiyon, kwargs); ad çıktı dosyasının gövdesidir
+        output_dir (str|Path): Çıktı klasörü
+        fmt (str): Dosya biçimi (PLOT_FORMATS)
+        dpi (int): Raster biçimler için çözünürlük
+        workers (int): Süreç sayısı (0 = grafik sayısı kadar, en fazla CPU sayısı)
+
+    Dönüş:
+        list[Path]: Çizilen veya güncel olduğu için atlanan grafik yolları
+    """
+    if plt is None:
+        return []
+    if threading.current_thread() is not threading.main_thread():
+        # Arka plan yazıcısından çağrıldı: GUI arka uçları ana iş parçacığı ister.
+        _plot_worker_init()
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+    hash_path = output_path / PLOT_HASH_FILE
+    try:
+        hashes = json.loads(hash_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        hashes = {}
+
+    paths = []
+    pending = []
+    for name, function, kwargs in tasks:
+        filename = f"{name}.{fmt}"
+        digest = hashlib.sha256(
+            pickle.dumps((function.__name__, kwargs, fmt, dpi), protocol=4)
+        ).hexdigest()
+        if hashes.get(filename) == digest and (output_path / filename).exists():
+            paths.append(output_path / filename)
+            continue
+        hashes.pop(filename, None)
+        task_kwargs = {**kwargs, "output_dir": output_dir, "fmt": fmt, "dpi": dpi}
+        pending.append((filename, digest, (function, task_kwargs)))
+
+    workers = min(len(pending), workers or os.cpu_count() or 1)
+    if workers <= 1:
+        rendered = [_plot_worker_render(task) for _, _, task in pending]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_plot_worker_init
+        ) as pool:
+            rendered = list(pool.map(_plot_worker_render, [t for _, _, t in pending]))
+    for (filename, digest, _), path in zip(pending, rendered):
+        if path:
+            hashes[filename] = digest
+            paths.append(Path(path))
+    atomic_write(hash_path, lambda handle: json.dump(hashes, handle, indent=2))
+    return paths
+
+
+# Isı haritası grafikleri: (dosya gövdesi, ajan çifti, başlık).
+HEATMAP_PLOTS = (
+    ("heatmap_q", "Q-Learning", "Q-Learning Hücre Tercihleri"),
+    ("heatmap_sarsa", "SARSA", "SARSA Hücre Tercihleri"),
+)
+
+
+def experiment_plot_tasks(histories, tournament, quality, heatmaps, shape):
+    # Deney grafiklerinin render_plots görevleri (run_experiment ve report ortak).
+    # heatmaps: ajan çifti adı -> X ve O hamle sayılarının toplamı.
+    tasks = [
+        ("training", plot_training, {"histories": histories}),
+        ("tournament", plot_tournament, {"tournament": tournament}),
+        ("policy_quality", plot_policy_quality, {"quality": quality}),
+    ]
+    for filename, pair_name, title in HEATMAP_PLOTS:
+        if pair_name in heatmaps:
+            tasks.append(
+                (
+                    filename,
+                    plot_action_heatmap,
+                    {
+                        "action_counts": heatmaps[pair_name],
+                        "title": title,
+                        "filename": filename,
+                        "shape": shape,
+                    },
+                )
+            )
+    return tasks
+
+
+def print_summary(training, tournament, optimality=None):
     print("Eğitim Özeti")
     for label, summary in training.items():
         print(
@@ -1402,25 +4706,830 @@ def print_summary(training, tournament):
             f"- {label}: kazanma {summary['win_rate']:.2%}, beraberlik {summary['draw_rate']:.2%}, "
             f"mağlubiyet {summary['loss_rate']:.2%}"
         )
+        if "games" in summary:
+            # Uyarlanır turnuva: kullanılan oyun, durma nedeni ve kazanma aralığı.
+            print(
+                f"  {summary['games']} oyun ({summary['stop']}), kazanma aralığı "
+                f"[{summary['win_ci_low']:.2%}, {summary['win_ci_high']:.2%}]"
+            )
 
+    if optimality:
+        # Son aşamadan sonra Q*'a uzaklık (her çift, her sabit rakip için).
+        print("\nOptimal Referans (Q*)")
+        for name, by_opponent in list(optimality.values())[-1].items():
+            for opponent, metrics in by_opponent.items():
+                print(
+                    f"- {name} vs {opponent}: |Q - Q*| {metrics['mean_abs_q_error']:.3f}, "
+                    f"greedy uyumu {metrics['greedy_agreement']:.2%}"
+                )
 
-def run_experiment(config, plot=False):
-    # Deney akışı: ajan kurulumu, eğitim, değerlendirme ve çıktı kaydı.
-    # Bu fonksiyon, tüm çıktıları (JSON/CSV/grafikler) aynı isimlerle üretir.
-    env = TicTacToeEnv()
-    random.seed(config.seed)
-    np.random.seed(config.seed)
 
-    # Durum sayısı: geçerli tahta konfigürasyonları (yaklaşık 5.478).
-    n_states = VALID_STATE_COUNT
-    q_pair = build_agent_pair("Q-Learning", QLearningAgent, "Q", n_states, config)
-    sarsa_pair = build_agent_pair("SARSA", SarsaAgent, "S", n_states, config)
+# Kayıtlı ajan dosyalarındaki algoritma adı -> sınıf eşlemesi (lig ve yükleme için).
+LEARNING_AGENT_CLASSES = {
+    "QLearningAgent": QLearningAgent,
+    "SarsaAgent": SarsaAgent,
+    "QLambdaAgent": QLambdaAgent,
+    "SarsaLambdaAgent": SarsaLambdaAgent,
+    "AfterstateQLearningAgent": AfterstateQLearningAgent,
+    "AfterstateSarsaAgent": AfterstateSarsaAgent,
+    "DynaQAgent": DynaQAgent,
+    "PrioritizedSweepingAgent": PrioritizedSweepingAgent,
+}
 
-    training_log = {}
-    histories = {}
 
+def save_agent_pair(pair, env, path, writer=None):
+    """
+    Öğrenmiş bir ajan çiftini (X ve O tabloları) sıkıştırılmış .npz olarak kaydeder.
+
+    Q tabloları depolama türünden bağımsız olarak yoğun float32 biçimde yazılır.
+    Tembel indeksli m×n×k tahtalarda indeks sırası çalışmaya özgü olduğu için
+    durumların taban-3 kodları da kaydedilir; yükleyici bunları hedef ortamın
+    indeksine yeniden eşler. Ziyaret sayıları tutuluyorsa visits_x / visits_o
+    (uint32) dizileri de eklenir.
+
+    Argümanlar:
+        pair (AgentPair): Kaydedilecek öğrenen ajan çifti
+        env: Ajanların eğitildiği ortam
+        path (str|Path): Hedef .npz dosyası
+        writer (ArtifactWriter|None): Verilirse sıkıştırma ve yazma arka planda
+            yapılır (diziler önce kopyalanır)
+
+    Dönüş:
+        Path: Yazılan dosya yolu
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "name": pair.name,
+        "algorithm": type(pair.agent_x).__name__,
+        "alpha": pair.agent_x.alpha,
+        "gamma": pair.agent_x.gamma,
+        "rows": env.rows,
+        "cols": env.cols,
+        "k": env.k,
+    }
+    arrays = {
+        "q_x": q_table_array(pair.agent_x, env.n_states).astype(np.float32),
+        "q_o": q_table_array(pair.agent_o, env.n_states).astype(np.float32),
+    }
+    for key, agent in (("visits_x", pair.agent_x), ("visits_o", pair.agent_o)):
+        if getattr(agent, "visits", None) is not None:
+            visits = agent.visits
+            if isinstance(visits, (SparseQTable, CSRQTable)):
+                arrays[key] = visits.to_dense(env.n_states)
+            else:
+                arrays[key] = visits[: env.n_states].copy()
+    if not is_classic_board(env):
+        arrays["state_codes"] = env.state_index.code_array()
+
+    def write(handle):
+        np.savez_compressed(handle, meta=json.dumps(meta), **arrays)
+
+    if writer is not None:
+        writer.submit(atomic_write, path, write, binary=True)
+        return path
+    return atomic_write(path, write, binary=True)
+
+
+def load_agent_pair(path, env):
+    """
+    save_agent_pair() ile kaydedilmiş bir ajan çiftini verilen ortam için yükler.
+
+    Yüklenen ajanlar yoğun float32 Q tablosu kullanır ve keşif kapalıdır (epsilon=0).
+    m×n×k tahtalarda kayıtlı durum kodları ortamın LazyStateIndex'ine eşlenir.
+
+    Argümanlar:
+        path (str|Path): .npz dosyası
+        env: Hedef ortam (tahta boyutu kayıtla aynı olmalı)
+
+    Dönüş:
+        AgentPair: Adı dosya adından (uzantısız) gelen ajan çifti
+    """
+    path = Path(path)
+    with np.load(path) as data:
+        meta = json.loads(str(data["meta"]))
+        if (meta["rows"], meta["cols"], meta["k"]) != (env.rows, env.cols, env.k):
+            raise ValueError(
+                f"{path}: tahta boyutu uyuşmuyor "
+                f"({meta['rows']}x{meta['cols']}x{meta['k']})"
+            )
+        tables = {"q_x": data["q_x"], "q_o": data["q_o"]}
+        codes = data["state_codes"] if "state_codes" in data else None
+    agent_cls = LEARNING_AGENT_CLASSES[meta["algorithm"]]
+    n_actions = tables["q_x"].shape[1]
+    if codes is not None:
+        # Kayıttaki indeks sırası -> bu ortamın tembel indeksi.
+        index = np.array(
+            [env.state_index.index_code(int(code)) for code in codes], dtype=np.int64
+        )
+        for key, table in tables.items():
+            remapped = np.zeros(
+                (max(env.n_states, LAZY_INITIAL_CAPACITY), n_actions), dtype=np.float32
+            )
+            remapped[index] = table
+            tables[key] = remapped
+    agents = []
+    for role, key in (("X", "q_x"), ("O", "q_o")):
+        agent = agent_cls(
+            f"{path.stem}-{role}",
+            tables[key].shape[0],
+            meta["alpha"],
+            meta["gamma"],
+            0.0,
+            0.0,
+            1.0,
+            n_actions=n_actions,
+        )
+        agent.q = tables[key]
+        agents.append(agent)
+    return AgentPair(path.stem, agents[0], agents[1])
+
+
+def is_agent_file(path):
+    # save_agent_pair() çıktısı mı? (meta üyesi olan .npz; Q* ve paketlerde yoktur)
+    with zipfile.ZipFile(path) as archive:
+        return "meta.npy" in archive.namelist()
+
+
+BUNDLE_FILE = "artifacts.npz"
+BUNDLE_VERSION = 1
+
+
+def bundle_arrays(env, agents, scores, tournament_scores, histories, heatmaps):
+    """
+    Bir çalışmanın sayısal artefaktlarını paket anahtarlarına göre toplar.
+
+    Anahtarlar "grup/ad" biçimindedir: q/<ajan>, visits/<ajan>, scores/<aşama>,
+    tournament/<karşılaşma>, history/<aşama>/episodes|win_rate ve heatmap/<ajan>.
+    m×n×k tahtalarda tembel indeksin taban-3 durum kodları state_codes olarak eklenir.
+    Tüm diziler kopyadır; paket arka planda yazılırken ajanlar değişebilir.
+    """
+    arrays = {}
+    for agent in agents:
+        arrays[f"q/{agent.name}"] = q_table_array(agent, env.n_states).astype(
+            np.float32
+        )
+        visits = getattr(agent, "visits", None)
+        if visits is not None:
+            if isinstance(visits, (SparseQTable, CSRQTable)):
+                arrays[f"visits/{agent.name}"] = visits.to_dense(env.n_states)
+            else:
+                arrays[f"visits/{agent.name}"] = visits[: env.n_states].copy()
+    for label, values in scores.items():
+        arrays[f"scores/{label}"] = np.asarray(values, dtype=np.int8)
+    for label, values in tournament_scores.items():
+        arrays[f"tournament/{label}"] = np.asarray(values, dtype=np.int8)
+    for label, history in histories.items():
+        for key, values in history.items():
+            arrays[f"history/{label}/{key}"] = np.array(values)
+    for name, counts in heatmaps.items():
+        arrays[f"heatmap/{name}"] = np.array(counts, dtype=np.int32)
+    if not is_classic_board(env):
+        arrays["state_codes"] = env.state_index.code_array()
+    return arrays
+
+
+def save_bundle(path, arrays, meta, compress=False, writer=None):
+    """
+    Sayısal artefaktları manifest ile birlikte tek bir .npz paketine yazar.
+
+    Varsayılan olarak üyeler sıkıştırılmadan saklanır; ArtifactBundle bu durumda
+    her diziyi dosyadan doğrudan bellek eşlemli (memmap) açar. compress=True
+    daha küçük dosya üretir, ancak diziler erişildiklerinde belleğe açılır.
+
+    Argümanlar:
+        path (str|Path): Hedef .npz dosyası
+        arrays (dict): Anahtar -> NumPy dizisi (bkz. bundle_arrays)
+        meta (dict): Manifeste eklenecek çalışma bilgileri
+        compress (bool): Üyeleri deflate ile sıkıştır
+        writer (ArtifactWriter|None): Verilirse yazım arka planda yapılır
+
+    Dönüş:
+        Path: Yazılan dosya yolu
+    """
+    path = Path(path)
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "compressed": compress,
+        **meta,
+        "arrays": {
+            key: {"shape": list(array.shape), "dtype": str(array.dtype)}
+            for key, array in arrays.items()
+        },
+    }
+    save = np.savez_compressed if compress else np.savez
+
+    def write(handle):
+        save(handle, manifest=json.dumps(manifest), **arrays)
+
+    if writer is not None:
+        writer.submit(atomic_write, path, write, binary=True)
+        return path
+    return atomic_write(path, write, binary=True)
+
+
+class ArtifactBundle:
+    """
+    save_bundle() ile yazılmış .npz paketine tembel, dizi başına erişim.
+
+    Açılışta yalnızca zip dizini ve manifest okunur. Sıkıştırılmamış üyeler
+    np.memmap ile salt-okunur eşlenir (veri diske dokunulana kadar okunmaz);
+    sıkıştırılmış üyeler ilk erişimde açılır. Okunan diziler önbelleğe alınır.
+
+    Kullanım:
+        with ArtifactBundle("outputs/artifacts.npz") as bundle:
+            q_x = bundle["q/Q-X"]
+            scores = bundle.group("scores")
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.archive = zipfile.ZipFile(self.path)
+        self.members = {
+            info.filename[: -len(".npy")]: info
+            for info in self.archive.infolist()
+            if info.filename.endswith(".npy")
+        }
+        self.arrays = {}
+        self.manifest = json.loads(str(self["manifest"]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        # Eşlenmiş diziler kendi dosya eşlemlerini tuttuğu için kapatmadan sonra da geçerlidir.
+        self.archive.close()
+
+    def __contains__(self, key):
+        return key in self.members
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return [key for key in self.members if key != "manifest"]
+
+    def __getitem__(self, key):
+        if key not in self.arrays:
+            if key not in self.members:
+                raise KeyError(f"{self.path}: paket üyesi yok: {key}")
+            self.arrays[key] = self._read(self.members[key])
+        return self.arrays[key]
+
+    def _read(self, info):
+        if info.compress_type == zipfile.ZIP_STORED:
+            array = self._memmap(info)
+            if array is not None:
+                return array
+        with self.archive.open(info) as handle:
+            return np.lib.format.read_array(handle, allow_pickle=False)
+
+    def _memmap(self, info):
+        # Yerel başlık (30 bayt + ad + ek alan) atlanarak .npy verisinin konumu bulunur.
+        with self.path.open("rb") as handle:
+            handle.seek(info.header_offset)
+            header = handle.read(30)
+            name_length, extra_length = struct.unpack("<HH", header[26:30])
+            handle.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(handle)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(handle)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(handle)
+            offset = handle.tell()
+        if dtype.hasobject or not shape or 0 in shape:
+            return None
+        return np.memmap(
+            self.path,
+            dtype=dtype,
+            mode="r",
+            offset=offset,
+            shape=shape,
+            order="F" if fortran else "C",
+        )
+
+    def group(self, prefix):
+        # "grup/ad" anahtarlarından {ad: dizi} sözlüğü (ör. group("q")).
+        prefix = f"{prefix}/"
+        return {
+            key[len(prefix) :]: self[key]
+            for key in self.keys()
+            if key.startswith(prefix)
+        }
+
+    def histories(self):
+        # history/<aşama>/<alan> anahtarlarından plot_training biçiminde sözlük.
+        histories = {}
+        for key, values in self.group("history").items():
+            label, field = key.rsplit("/", 1)
+            histories.setdefault(label, {})[field] = values
+        return histories
+
+
+# Lig işçi süreci durumu: her işçi tüm katılımcıları başlangıçta bir kez yükler.
+_LEAGUE_WORKER = {}
+
+
+def league_entry_pair(entry, env):
+    # Lig katılımcısı: kayıtlı ajan dosyası veya yerleşik "random"/"minimax" rakip.
+    if entry == "random":
+        return AgentPair("Random", RandomAgent(), RandomAgent())
+    if entry == "minimax":
+        return AgentPair("Minimax", MinimaxAgent(), MinimaxAgent())
+    return load_agent_pair(entry, env)
+
+
+def _league_worker_init(entries, dims):
+    env = MNKEnv(*dims) if dims != CLASSIC_DIMS else TicTacToeEnv()
+    _LEAGUE_WORKER["env"] = env
+    _LEAGUE_WORKER["pairs"] = [league_entry_pair(entry, env) for entry in entries]
+
+
+def _league_worker_match(task):
+    # Tek eşleşme: tohum (i, j)'ye bağlı olduğu için sonuç işçi sayısından bağımsızdır.
+    i, j, games, seed = task
+    random.seed(seed)
+    np.random.seed(seed % (2**32))
+    pairs = _LEAGUE_WORKER["pairs"]
+    summary = evaluate_matchup(_LEAGUE_WORKER["env"], pairs[i], pairs[j], games)
+    return i, j, summary
+
+
+def bradley_terry_ratings(wins, draws, losses, iterations=500, tol=1e-10):
+    """
+    Kazanma/beraberlik/mağlubiyet matrislerinden Bradley–Terry gücü ve Elo ölçeği.
+
+    Beraberlik yarım galibiyet sayılır. Hiç kaybetmeyen veya hiç kazanmayan
+    oyuncuların gücü sonsuza kaçmasın diye oynanan her eşleşmeye bir sanal
+    beraberlik eklenir. Güçler MM (minorization–maximization) yinelemesiyle
+    bulunur ve Elo ölçeğine çevrilir: 1500 + 400 * log10(p / geometrik ortalama).
+
+    Argümanlar:
+        wins, draws, losses (np.ndarray): (n, n) matrisler, [i, j] = i'nin j'ye karşı
+
+    Dönüş:
+        np.ndarray: (n,) Elo ölçeğinde puanlar
+    """
+    games = wins + draws + losses
+    played = games > 0
+    score = wins + 0.5 * draws + 0.5 * played
+    games = games + played
+    total_score = score.sum(axis=1)
+    strength = np.ones(len(wins))
+    for _ in range(iterations):
+        denom = (games / (strength[:, None] + strength[None, :])).sum(axis=1)
+        updated = np.where(denom > 0, total_score / np.maximum(denom, 1e-300), 1.0)
+        updated /= np.exp(np.mean(np.log(updated)))
+        converged = np.max(np.abs(updated - strength)) < tol
+        strength = updated
+        if converged:
+            break
+    return 1500.0 + 400.0 * np.log10(strength)
+
+
+def run_league(entries, games, workers=None, seed=42, dims=CLASSIC_DIMS):
+    """
+    Çok sayıda kayıtlı ajanı süreç havuzunda tam devre (round-robin) karşılaştırır.
+
+    Her katılımcı çifti (i < j) evaluate_matchup ile games oyun oynar (X/O dönüşümlü).
+    İşçiler tüm katılımcıları başlangıçta bir kez yükler; eşleşmeler havuza parça
+    parça dağıtıldığı için toplam süre çekirdek başına eşleşme sayısıyla doğrusal
+    ölçeklenir.
+
+    Argümanlar:
+        entries (list[str]): .npz yolları veya "random"/"minimax"
+        games (int): Eşleşme başına oyun sayısı
+        workers (int|None): Süreç sayısı (None = CPU sayısı)
+        seed (int): Eşleşme tohumlarının tabanı
+        dims (tuple): Tahta boyutu (rows, cols, k)
+
+    Dönüş:
+        dict: {"agents", "games_per_match", "wins", "draws", "losses", "ratings"}
+    """
+    n = len(entries)
+    tasks = [
+        (i, j, games, seed * 1_000_003 + i * 1009 + j)
+        for i in range(n)
+        for j in range(i + 1, n)
+    ]
+    wins = np.zeros((n, n), dtype=np.int64)
+    draws = np.zeros((n, n), dtype=np.int64)
+    losses = np.zeros((n, n), dtype=np.int64)
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_league_worker_init,
+        initargs=(entries, dims),
+    ) as pool:
+        for i, j, summary in pool.map(_league_worker_match, tasks, chunksize=chunksize):
+            wins[i, j] = losses[j, i] = summary["wins"]
+            draws[i, j] = draws[j, i] = summary["draws"]
+            losses[i, j] = wins[j, i] = summary["losses"]
+    names = league_names(entries)
+    ratings = bradley_terry_ratings(wins, draws, losses)
+    return {
+        "agents": names,
+        "games_per_match": games,
+        "wins": wins.tolist(),
+        "draws": draws.tolist(),
+        "losses": losses.tolist(),
+        "ratings": {name: float(rating) for name, rating in zip(names, ratings)},
+    }
+
+
+def expand_league_entries(raw_entries):
+    # Klasörler içindeki ajan dosyalarına açılır; "random"/"minimax" olduğu gibi kalır.
+    entries = []
+    for entry in raw_entries:
+        path = Path(entry)
+        if entry in ("random", "minimax"):
+            entries.append(entry)
+        elif path.is_dir():
+            # Klasördeki diğer .npz dosyaları (artifacts.npz, optimal_q.npz) atlanır.
+            entries.extend(
+                str(item) for item in sorted(path.rglob("*.npz")) if is_agent_file(item)
+            )
+        else:
+            entries.append(entry)
+    return entries
+
+
+def league_names(entries):
+    # Katılımcı adları: dosya adı; aynı adlı dosyalar varsa çalışma klasörü öne eklenir
+    # (ör. runs/seed1/agents/sarsa.npz -> "seed1/sarsa").
+    stems = [
+        entry.capitalize() if entry in ("random", "minimax") else Path(entry).stem
+        for entry in entries
+    ]
+    names = []
+    for entry, stem in zip(entries, stems):
+        name = stem
+        if stems.count(stem) > 1 and entry not in ("random", "minimax"):
+            path = Path(entry)
+            run_dir = (
+                path.parent.parent if path.parent.name == "agents" else path.parent
+            )
+            name = f"{run_dir.name}/{stem}"
+        while name in names:
+            name += "'"
+        names.append(name)
+    return names
+
+
+def save_league(output_dir, league):
+    # Lig çıktıları: league.json, eşleşme matrisi (league_matrix.csv) ve puanlar.
+    names = league["agents"]
+    json_path = save_json(output_dir, league, filename="league.json")
+    rows = []
+    for i, name in enumerate(names):
+        for j, other in enumerate(names):
+            if i == j:
+                continue
+            rows.append(
+                {
+                    "agent": name,
+                    "opponent": other,
+                    "wins": league["wins"][i][j],
+                    "draws": league["draws"][i][j],
+                    "losses": league["losses"][i][j],
+                }
+            )
+    matrix_path = save_csv(output_dir, rows, filename="league_matrix.csv")
+    ranked = sorted(league["ratings"].items(), key=lambda item: -item[1])
+    rating_rows = []
+    for rank, (name, rating) in enumerate(ranked, start=1):
+        i = names.index(name)
+        played = (
+            sum(league["wins"][i]) + sum(league["draws"][i]) + sum(league["losses"][i])
+        )
+        rating_rows.append(
+            {
+                "rank": rank,
+                "agent": name,
+                "rating": round(rating, 1),
+                "wins": sum(league["wins"][i]),
+                "draws": sum(league["draws"][i]),
+                "losses": sum(league["losses"][i]),
+                "games": played,
+            }
+        )
+    ratings_path = save_csv(output_dir, rating_rows, filename="league_ratings.csv")
+    return json_path, matrix_path, ratings_path
+
+
+# --- Harici bot maçları ---
+# Dış motorlar alt süreç olarak çalışır ve stdin/stdout üzerinden satır tabanlı bir
+# protokolle konuşur (her satır bir mesaj, alanlar boşlukla ayrılır):
+#   harness -> bot: "init <rows> <cols> <k>"   süreç başında; bot "ready" yanıtlar
+#   harness -> bot: "new <X|O>"                her oyun başında botun rolü
+#   harness -> bot: "move <X|O> <hücreler>"    hücreler satır sıralı ".XO" dizisi;
+#                                              bot tek satırda hücre indeksini yazar
+#   harness -> bot: "end <win|draw|loss>"      oyun sonu (botun açısından)
+#   harness -> bot: "quit"                     kapanış
+# Yalnızca "init" ve "move" yanıt bekler. Süre aşımı, yasal olmayan/okunamayan yanıt
+# veya sürecin kapanması oyunu botun hükmen mağlubiyeti yapar.
+
+BOT_MARKS = {0: ".", 1: "X", 2: "O"}
+BOT_FORFEITS = ("timeout", "illegal", "crash")
+
+
+class ExternalBot:
+    """
+    Satır protokolü konuşan tek bir harici bot süreci (asyncio alt süreci).
+
+    Süreç tembel başlatılır; süre aşımı veya çökme sonrası öldürülür ve sonraki
+    oyunda yeniden başlatılır (yanıtı gecikmiş bir sürecin akışı artık senkron
+    değildir). Hamle gecikmeleri (istek yazımından yanıt satırına) latencies
+    listesine saniye cinsinden eklenir.
+    """
+
+    def __init__(self, command, dims, move_time, startup_time):
+        self.command = command
+        self.dims = dims
+        self.move_time = move_time
+        self.startup_time = startup_time
+        self.process = None
+        self.latencies = []
+        self.restarts = 0
+
+    async def start(self):
+        self.process = await asyncio.create_subprocess_exec(
+            *shlex.split(self.command),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+        )
+        await self.send("init {} {} {}".format(*self.dims))
+        try:
+            reply = await self.receive(self.startup_time)
+        except asyncio.TimeoutError:
+            reply = f"{self.startup_time} sn içinde yanıt yok"
+        if reply != "ready":
+            await self.kill()
+            raise RuntimeError(f"{self.command}: 'ready' beklenirken {reply!r}")
+
+    async def send(self, line):
+        # Kapanmış sürece yazma hatası False döner (çağıran çökme sayar).
+        try:
+            self.process.stdin.write(f"{line}\n".encode())
+            await self.process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            return False
+        return True
+
+    async def receive(self, timeout):
+        # Tek yanıt satırı; süreç kapandıysa None, süre aşımında asyncio.TimeoutError.
+        line = await asyncio.wait_for(self.process.stdout.readline(), timeout)
+        return line.decode().strip() if line else None
+
+    async def request_move(self, board, player):
+        # (aksiyon, hata) döner; hata BOT_FORFEITS'ten biri veya None.
+        cells = "".join(BOT_MARKS[cell] for cell in board)
+        start = time.perf_counter()
+        if not await self.send(f"move {BOT_MARKS[player]} {cells}"):
+            return None, "crash"
+        try:
+            reply = await self.receive(self.move_time)
+        except asyncio.TimeoutError:
+            self.latencies.append(time.perf_counter() - start)
+            return None, "timeout"
+        self.latencies.append(time.perf_counter() - start)
+        if reply is None:
+            return None, "crash"
+        try:
+            action = int(reply)
+        except ValueError:
+            return None, "illegal"
+        if not 0 <= action < len(board) or board[action] != 0:
+            return None, "illegal"
+        return action, None
+
+    async def kill(self):
+        if self.process is not None and self.process.returncode is None:
+            self.process.kill()
+            await self.process.wait()
+        self.process = None
+
+    async def close(self):
+        # Nazik kapanış: "quit" + stdin kapatma; bot çıkmazsa öldürülür.
+        if self.process is None:
+            return
+        if await self.send("quit"):
+            self.process.stdin.close()
+        try:
+            await asyncio.wait_for(self.process.wait(), self.startup_time)
+        except asyncio.TimeoutError:
+            pass
+        await self.kill()
+
+
+async def play_external_game(env, bot, pair, bot_player):
+    """
+    Harici bot ile yerleşik/kayıtlı ajan arasında tek oyun (keşif ve eğitim kapalı).
+
+    Dönüş:
+        tuple: (skor, hata) — skor botun açısından 1/0/-1; hükmen mağlubiyette hata
+        BOT_FORFEITS'ten biridir, aksi halde None.
+    """
+    board = env.reset()
+    player = 1
+    if not await bot.send(f"new {BOT_MARKS[bot_player]}"):
+        return -1, "crash"
+    while True:
+        moves = valid_actions(board)
+        if player == bot_player:
+            action, error = await bot.request_move(board, player)
+            if error is not None:
+                return -1, error
+        else:
+            agent = pair.agent_x if player == 1 else pair.agent_o
+            state = env.encode_state(board)
+            action = agent.select_action(state, moves, board, player, explore=False)
+        board, winner, done = env.step(board, action, player)
+        if done:
+            score = score_from_winner(winner, bot_player)
+            await bot.send(f"end {('loss', 'draw', 'win')[score + 1]}")
+            return score, None
+        player = opponent(player)
+
+
+async def run_external_matchup(
+    env, command, pair, games, concurrency, move_time, startup_time
+):
+    """
+    Bir harici bot ile bir ajan arasında games oyunu eşzamanlı oynatır.
+
+    concurrency kadar bot süreci açılır; her süreç paylaşılan oyun sırasından
+    bir sonrakini alır, böylece yavaş bir süreç diğerlerini bekletmez. Roller
+    play_matchup_games gibi oyun sırasına göre değişir (çift oyunlarda bot X).
+
+    Dönüş:
+        tuple: (özet, gecikmeler) — özet evaluate_matchup ile aynı alanlara ek
+        olarak forfeits (hata türüne göre hükmen mağlubiyet), restarts ve
+        seconds içerir; gecikmeler hamle başına saniyedir.
+    """
+    scores = [0] * games
+    forfeits = dict.fromkeys(BOT_FORFEITS, 0)
+    schedule = iter(range(games))
+    bots = [
+        ExternalBot(command, (env.rows, env.cols, env.k), move_time, startup_time)
+        for _ in range(min(concurrency, games))
+    ]
+
+    async def worker(bot):
+        for game in schedule:
+            if bot.process is None:
+                await bot.start()
+            bot_player = 1 if game % 2 == 0 else 2
+            scores[game], error = await play_external_game(env, bot, pair, bot_player)
+            if error is not None:
+                forfeits[error] += 1
+            if error == "timeout":
+                await bot.kill()
+            elif error == "crash":
+                # Kendiliğinden çıkmış süreç öldürülmez, beklenir (kill() çıkmış
+                # süreci asyncio'nun çocuk izleyicisinden önce toplayabilir).
+                await bot.close()
+            if error in ("timeout", "crash"):
+                bot.restarts += 1
+
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(bot) for bot in bots))
+    finally:
+        await asyncio.gather(*(bot.close() for bot in bots))
+    summary = summarize_scores(scores)
+    summary["forfeits"] = forfeits
+    summary["restarts"] = sum(bot.restarts for bot in bots)
+    summary["seconds"] = time.perf_counter() - start
+    return summary, [latency for bot in bots for latency in bot.latencies]
+
+
+def bot_throughput(latencies, games, seconds):
+    # Bot başına hız: duvar saatine göre oyun/hamle hızı ve hamle gecikmesi (ms).
+    moves = len(latencies)
+    stats = {
+        "games": games,
+        "moves": moves,
+        "seconds": seconds,
+        "games_per_sec": games / seconds if seconds else 0.0,
+        "moves_per_sec": moves / seconds if seconds else 0.0,
+    }
+    if moves:
+        latency_ms = np.asarray(latencies) * 1000.0
+        p50, p95, p99 = np.percentile(latency_ms, [50, 95, 99])
+        stats.update(
+            latency_mean_ms=float(latency_ms.mean()),
+            latency_p50_ms=float(p50),
+            latency_p95_ms=float(p95),
+            latency_p99_ms=float(p99),
+            latency_max_ms=float(latency_ms.max()),
+        )
+    return stats
+
+
+async def run_external_matches(
+    env, commands, opponents, games, concurrency, move_time, startup_time
+):
+    """
+    Her harici botu her rakibe karşı oynatır ve bot başına hız raporu üretir.
+
+    Eşleşmeler sırayla oynanır (her biri concurrency kadar süreç kullanır), böylece
+    bir botun hız ölçümü diğer botların yükünden etkilenmez.
+
+    Argümanlar:
+        commands (list[str]): Bot komut satırları (shlex ile ayrıştırılır)
+        opponents (dict): {rakip adı: AgentPair} (league_entry_pair ile yüklenmiş)
+
+    Dönüş:
+        dict: {"matches": [...], "bots": {komut: hız istatistikleri}, ...}
+    """
+    matches = []
+    bots = {}
+    for command in commands:
+        latencies = []
+        seconds = 0.0
+        for name, pair in opponents.items():
+            summary, matchup_latencies = await run_external_matchup(
+                env, command, pair, games, concurrency, move_time, startup_time
+            )
+            matches.append({"bot": command, "opponent": name, **summary})
+            latencies.extend(matchup_latencies)
+            seconds += summary["seconds"]
+        bots[command] = bot_throughput(latencies, games * len(opponents), seconds)
+    return {
+        "games_per_match": games,
+        "concurrency": concurrency,
+        "move_time": move_time,
+        "matches": matches,
+        "bots": bots,
+    }
+
+
+def save_match(output_dir, report):
+    # Maç çıktıları: match.json ve eşleşme başına satırlar (match.csv).
+    json_path = save_json(output_dir, report, filename="match.json")
+    rows = []
+    for match in report["matches"]:
+        row = {key: value for key, value in match.items() if key != "forfeits"}
+        row.update(match["forfeits"])
+        rows.append(row)
+    csv_path = save_csv(output_dir, rows, filename="match.csv")
+    return json_path, csv_path
+
+
+# --- Deney aşamaları ---
+# Her aşama (env, pairs, config, event_log) alır; pairs = {"Q-Learning": AgentPair,
+# "SARSA": AgentPair}. Ajanlar yerinde güncellenir, çıktı olarak eğitim skorları
+# ({"scores": {etiket: skorlar}}) veya turnuva özeti ({"tournament": {...}}) döner.
+
+
+def with_quality(outputs, quality):
+    # Aşama çıktısına politika kalitesi eğrileri eklenir (önbelleğe de girer).
+    if quality is not None:
+        outputs["policy_quality"] = quality.curves
+    return outputs
+
+
+def actor_learner_self_play(env, pair, config, event_log, quality, label):
+    # Dağıtık self-play: aktör/öğrenen hızları aşama çıktısına eklenir.
+    scores, throughput = train_actor_learner(
+        env,
+        pair.agent_x,
+        pair.agent_o,
+        config.self_play_episodes,
+        config.actors,
+        batch_episodes=config.actor_batch_episodes,
+        sync_episodes=config.actor_sync_episodes,
+        seed=config.seed,
+        log_interval=config.log_interval,
+        log_window=config.moving_avg_window,
+        label=label,
+        event_log=event_log,
+        quality=quality,
+    )
+    print(
+        f"[{label}] {config.actors} aktör: "
+        f"{throughput['total_actor_episodes_per_sec']:.0f} bölüm/sn, öğrenen "
+        f"{throughput['learner_transitions_per_sec'] or 0:.0f} geçiş/sn "
+        f"(doluluk {throughput['learner_busy_fraction']:.0%})"
+    )
+    outputs = {"scores": {label: scores}, "actor_learner": {label: throughput}}
+    return with_quality(outputs, quality)
+
+
+def run_q_self_play(env, pairs, config, event_log, observers=None):
     # Self-play eğitimleri: her algoritma kendi kendine öğrenir.
-    q_self_scores = train_self_play(
+    quality = policy_quality_tracker(config, env)
+    q_pair = pairs["Q-Learning"]
+    if config.actors > 0:
+        return actor_learner_self_play(
+            env, q_pair, config, event_log, quality, "Q self-play"
+        )
+    scores = train_self_play(
         env,
         q_pair.agent_x,
         q_pair.agent_o,
@@ -1428,12 +5537,21 @@ def run_experiment(config, plot=False):
         log_interval=config.log_interval,
         log_window=config.moving_avg_window,
         label="Q self-play",
+        event_log=event_log,
+        quality=quality,
+        observers=observers,
     )
-    record_training_summary(
-        "Q self-play", q_self_scores, config, training_log, histories
-    )
+    return with_quality({"scores": {"Q self-play": scores}}, quality)
+
 
-    s_self_scores = train_self_play(
+def run_sarsa_self_play(env, pairs, config, event_log, observers=None):
+    quality = policy_quality_tracker(config, env)
+    sarsa_pair = pairs["SARSA"]
+    if config.actors > 0:
+        return actor_learner_self_play(
+            env, sarsa_pair, config, event_log, quality, "SARSA self-play"
+        )
+    scores = train_self_play(
         env,
         sarsa_pair.agent_x,
         sarsa_pair.agent_o,
@@ -1441,83 +5559,552 @@ def run_experiment(config, plot=False):
         log_interval=config.log_interval,
         log_window=config.moving_avg_window,
         label="SARSA self-play",
+        event_log=event_log,
+        quality=quality,
+        observers=observers,
     )
-    record_training_summary(
-        "SARSA self-play", s_self_scores, config, training_log, histories
-    )
+    return with_quality({"scores": {"SARSA self-play": scores}}, quality)
 
+
+def run_cross_play(env, pairs, config, event_log, observers=None):
     # Çapraz eğitim: Q-Learning ve SARSA farklı rollerde karşılaşır.
-    cross_q_scores, cross_s_scores = train_cross_play(
+    quality = policy_quality_tracker(config, env)
+    q_scores, sarsa_scores = train_cross_play(
         env,
-        q_pair,
-        sarsa_pair,
+        pairs["Q-Learning"],
+        pairs["SARSA"],
         config.cross_play_episodes,
         log_interval=config.log_interval,
         log_window=config.moving_avg_window,
         label="Cross-play",
+        event_log=event_log,
+        quality=quality,
+        observers=observers,
     )
-    record_training_summary(
-        "Cross-play (Q)", cross_q_scores, config, training_log, histories
-    )
-    record_training_summary(
-        "Cross-play (SARSA)", cross_s_scores, config, training_log, histories
+    return with_quality(
+        {"scores": {"Cross-play (Q)": q_scores, "Cross-play (SARSA)": sarsa_scores}},
+        quality,
     )
 
+
+def run_q_vs_random(env, pairs, config, event_log, observers=None):
     # Baz çizgi: rastgele ajana karşı öğrenme performansı.
-    q_random_scores = train_vs_random(
+    quality = policy_quality_tracker(config, env)
+    scores = train_vs_random(
         env,
-        q_pair.agent_x,
+        pairs["Q-Learning"].agent_x,
         config.baseline_episodes,
         agent_first=True,
         log_interval=config.log_interval,
         log_window=config.moving_avg_window,
         label="Q vs Random (X)",
+        event_log=event_log,
+        quality=quality,
+        observers=observers,
     )
-    record_training_summary(
-        "Q vs Random (X)", q_random_scores, config, training_log, histories
-    )
+    return with_quality({"scores": {"Q vs Random (X)": scores}}, quality)
+
 
-    s_random_scores = train_vs_random(
+def run_sarsa_vs_random(env, pairs, config, event_log, observers=None):
+    quality = policy_quality_tracker(config, env)
+    scores = train_vs_random(
         env,
-        sarsa_pair.agent_x,
+        pairs["SARSA"].agent_x,
         config.baseline_episodes,
         agent_first=True,
         log_interval=config.log_interval,
         log_window=config.moving_avg_window,
         label="SARSA vs Random (X)",
+        event_log=event_log,
+        quality=quality,
+        observers=observers,
     )
-    record_training_summary(
-        "SARSA vs Random (X)", s_random_scores, config, training_log, histories
-    )
+    return with_quality({"scores": {"SARSA vs Random (X)": scores}}, quality)
 
-    random_pair = AgentPair("Random", RandomAgent(), RandomAgent())
-    minimax_pair = AgentPair("Minimax", MinimaxAgent(), MinimaxAgent())
 
-    # Turnuva: öğrenen ajanlar, rastgele ve minimax karşılaştırmaları.
-    tournament_log = {
-        "Q vs Random": evaluate_matchup(
-            env, q_pair, random_pair, config.tournament_games
-        ),
-        "SARSA vs Random": evaluate_matchup(
-            env, sarsa_pair, random_pair, config.tournament_games
-        ),
-        "Q vs SARSA": evaluate_matchup(
-            env, q_pair, sarsa_pair, config.tournament_games
-        ),
-        "Q vs Minimax": evaluate_matchup(
-            env, q_pair, minimax_pair, config.tournament_games
+def builtin_pair(name):
+    # Turnuvanın öğrenmeyen rakipleri: her karşılaşma kendi örneğini kurar.
+    if name == "Random":
+        return AgentPair("Random", RandomAgent(), RandomAgent())
+    if name == "Minimax":
+        return AgentPair("Minimax", MinimaxAgent(), MinimaxAgent())
+    raise ValueError(f"Bilinmeyen yerleşik rakip: {name}")
+
+
+# Turnuva: öğrenen ajanlar, rastgele ve minimax karşılaştırmaları (etiket, A, B).
+TOURNAMENT_MATCHUPS = (
+    ("Q vs Random", "Q-Learning", "Random"),
+    ("SARSA vs Random", "SARSA", "Random"),
+    ("Q vs SARSA", "Q-Learning", "SARSA"),
+    ("Q vs Minimax", "Q-Learning", "Minimax"),
+    ("SARSA vs Minimax", "SARSA", "Minimax"),
+)
+
+
+def run_tournament_matchup(
+    env, pairs, config, event_log, observers=None, *, label, pair_a, pair_b
+):
+    # Tek turnuva karşılaşması: öğrenen tablolar yalnızca okunur.
+    scores = []
+    pair_a = pairs[pair_a] if pair_a in pairs else builtin_pair(pair_a)
+    pair_b = pairs[pair_b] if pair_b in pairs else builtin_pair(pair_b)
+    if config.tournament_adaptive:
+        summary = evaluate_matchup_adaptive(
+            env,
+            pair_a,
+            pair_b,
+            config.tournament_games,
+            batch=config.tournament_batch,
+            ci_width=config.tournament_ci_width,
+            confidence=config.tournament_confidence,
+            sprt_delta=config.tournament_sprt_delta,
+            observers=observers,
+            score_log=scores,
+        )
+    else:
+        summary = evaluate_matchup(
+            env, pair_a, pair_b, config.tournament_games, observers, score_log=scores
+        )
+    return {"tournament": {label: summary}, "tournament_scores": {label: scores}}
+
+
+@dataclass(frozen=True)
+class Phase:
+    # Deney aşaması: okuduğu ve güncellediği ajan çiftleri bağımlılıkları belirler.
+    name: str
+    count_field: str
+    run: object
+    reads: tuple = ()
+    writes: tuple = ()
+
+
+# Eğitim aşamaları bildirim sırasıyla (ad, bölüm sayısı alanı, çalıştırıcı, okuma,
+# yazma). Her aşama kendi tohumuyla çalışır; sonuçlar yalnızca bağımlı olduğu
+# aşamaların çıktısına bağlıdır (sıralı ve paralel çalıştırma aynı sonucu verir).
+EXPERIMENT_PHASES = (
+    Phase("Q self-play", "self_play_episodes", run_q_self_play, writes=("Q-Learning",)),
+    Phase(
+        "SARSA self-play", "self_play_episodes", run_sarsa_self_play, writes=("SARSA",)
+    ),
+    Phase(
+        "Cross-play",
+        "cross_play_episodes",
+        run_cross_play,
+        writes=("Q-Learning", "SARSA"),
+    ),
+    Phase(
+        "Q vs Random (X)", "baseline_episodes", run_q_vs_random, writes=("Q-Learning",)
+    ),
+    Phase(
+        "SARSA vs Random (X)",
+        "baseline_episodes",
+        run_sarsa_vs_random,
+        writes=("SARSA",),
+    ),
+)
+
+
+def experiment_phases(env):
+    # Eğitim aşamaları + karşılaşma başına turnuva aşamaları. Minimax yalnızca
+    # klasik 3x3 kurallarını bilir; büyük tahtalarda arama da pratik değildir.
+    phases = list(EXPERIMENT_PHASES)
+    for label, pair_a, pair_b in TOURNAMENT_MATCHUPS:
+        if "Minimax" in (pair_a, pair_b) and not is_classic_board(env):
+            continue
+        phases.append(
+            Phase(
+                f"Tournament: {label}",
+                "tournament_games",
+                partial(
+                    run_tournament_matchup, label=label, pair_a=pair_a, pair_b=pair_b
+                ),
+                reads=tuple(
+                    key for key in (pair_a, pair_b) if key in ("Q-Learning", "SARSA")
+                ),
+            )
+        )
+    return phases
+
+
+def phase_dependencies(phases, chain=False):
+    """
+    Her aşamanın bağımlı olduğu önceki aşamaların indeksleri.
+
+    Bir aşama, okuduğu veya güncellediği her ajan çiftinin son yazarına bağlıdır.
+    chain=True iken (tembel indeksli m×n×k tahtalar: durum sırası tüm oyun
+    geçmişine bağlıdır) her aşama bir öncekine bağlanır ve grafik zincire iner.
+    """
+    dependencies = []
+    last_writer = {}
+    for index, phase in enumerate(phases):
+        if chain:
+            dependencies.append({index - 1} if index else set())
+            continue
+        dependencies.append(
+            {
+                last_writer[key]
+                for key in (*phase.reads, *phase.writes)
+                if key in last_writer
+            }
+        )
+        for key in phase.writes:
+            last_writer[key] = index
+    return dependencies
+
+
+def seed_phase(seed, name):
+    # Aşama başına tohum: random ve np.random (seed, aşama adı) ile yeniden başlatılır.
+    digest = hashlib.sha256(f"{seed}:{name}".encode("utf-8")).digest()
+    value = int.from_bytes(digest[:4], "little")
+    random.seed(value)
+    np.random.seed(value)
+
+
+# Aşama süreçlerine paylaşımlı bellekle taşınan yoğun ajan dizileri.
+SHARED_AGENT_ARRAYS = ("q", "visits")
+
+
+def _share_pair(pair, blocks):
+    # Ana süreç: yoğun dizileri yeni SharedMemory bloklarına kopyalar; dizisiz
+    # (pickle'ı küçük) çift kopyası ve {(rol, alan): (blok, şekil, dtype)} döner.
+    agents = []
+    specs = {}
+    for role, agent in (("x", pair.agent_x), ("o", pair.agent_o)):
+        clone = copy.copy(agent)
+        for attr in SHARED_AGENT_ARRAYS:
+            array = getattr(agent, attr, None)
+            if not isinstance(array, np.ndarray) or not array.nbytes:
+                continue
+            block = shared_memory.SharedMemory(create=True, size=array.nbytes)
+            blocks[block.name] = block
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            specs[(role, attr)] = (block.name, array.shape, array.dtype.str)
+            setattr(clone, attr, None)
+        agents.append(clone)
+    return AgentPair(pair.name, agents[0], agents[1]), specs
+
+
+def _phase_worker_run(task):
+    """
+    Aşama süreci: ajan dizilerini paylaşımlı bellekten yerinde kullanarak aşamayı çalıştırır.
+
+    Güncellenen tablolar doğrudan paylaşımlı bloklara yazılır; geri dönen çiftler
+    dizisizdir (ana süreç blokları okur). Aşama bir diziyi yenisiyle değiştirdiyse
+    o dizi pickle ile geri gönderilir. Olay akışı açıksa aşamanın olayları
+    PhaseEventBuffer'da toplanıp satır listesi olarak döner.
+    """
+    phase, env, config, shared, event_interval = task
+    blocks = []
+    views = {}
+    pairs = {}
+    for key, (pair, specs) in shared.items():
+        for (role, attr), (name, shape, dtype) in specs.items():
+            block = shared_memory.SharedMemory(name=name)
+            blocks.append(block)
+            view = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+            views[(key, role, attr)] = view
+            setattr(getattr(pair, f"agent_{role}"), attr, view)
+        pairs[key] = pair
+    events = PhaseEventBuffer(event_interval) if event_interval else None
+    with logged_phase(events, phase.name, getattr(config, phase.count_field)):
+        seed_phase(config.seed, phase.name)
+        outputs = phase.run(env, pairs, config, events, None)
+    for (key, role, attr), view in views.items():
+        agent = getattr(pairs[key], f"agent_{role}")
+        if getattr(agent, attr) is view:
+            setattr(agent, attr, None)
+    del views
+    for block in blocks:
+        block.close()
+    lines = events.lines if events is not None else []
+    return outputs, {key: pairs[key] for key in phase.writes}, lines
+
+
+def schedule_phases(
+    phases, env, pairs, config, event_log=None, observers=(), cache=None, workers=1
+):
+    """
+    Aşama bağımlılık grafiğini çalıştırır; sonuçları bildirim sırasıyla verir.
+
+    workers <= 1 iken aşamalar bu süreçte sırayla çalışır. Aksi halde bağımlılıkları
+    tamamlanmış aşamalar süreç havuzunda eşzamanlı çalışır (ör. iki self-play,
+    iki baz çizgi ve turnuva karşılaşmaları); ajan tabloları paylaşımlı bellekle
+    taşınır. Sonuçlar her durumda bildirim sırasıyla işlenir: bir aşama verildiğinde
+    pairs, sıralı çalıştırmanın o noktadaki durumuyla aynıdır. Her aşama kendi
+    tohumuyla çalıştığı için çıktılar işçi sayısından bağımsızdır.
+
+    Önbellek anahtarı aşamanın ayarları ve bağımlı olduğu aşamaların anahtarlarından
+    kurulur; girdi yalnızca aşamanın güncellediği ajan çiftlerini saklar.
+
+    Argümanlar:
+        phases (list[Phase]): Bildirim sırasıyla aşamalar (bkz. experiment_phases)
+        env: Ortam
+        pairs (dict): Ajan çiftleri; yerinde güncellenir
+        config (Config): Deney ayarları
+        event_log (EventLog|None): Aşama işaretleri ve profil örnekleri
+        observers (list): play_episode gözlemcileri (yalnızca sıralı çalıştırma)
+        cache (ResultCache|None): Aşama önbelleği
+        workers (int): Süreç sayısı (1 = sıralı)
+
+    Yields:
+        (Phase, dict, env): Aşama, çıktıları ve aşamadan sonraki ortam
+    """
+    dependencies = phase_dependencies(phases, chain=not is_classic_board(env))
+    keys = [None] * len(phases)
+
+    def cache_lookup(index):
+        phase = phases[index]
+        keys[index] = phase_cache_key(
+            config,
+            phase.name,
+            phase.count_field,
+            [keys[dependency] for dependency in sorted(dependencies[index])],
+        )
+        return cache.load(keys[index]) if cache is not None else None
+
+    def report_cache_hit(index):
+        # Önbellek isabeti aşama işlendiği sırada bildirilir (paralelde de sıralı).
+        print(f"[cache] {phases[index].name}: önbellekten yüklendi")
+        if event_log is not None:
+            event_log.emit("cache_hit", phase=phases[index].name, key=keys[index])
+
+    def cache_store(index, outputs, env):
+        if cache is not None:
+            phase = phases[index]
+            cache.store(
+                keys[index],
+                {
+                    "outputs": outputs,
+                    "pairs": {key: pairs[key] for key in phase.writes},
+                    "env": env,
+                },
+            )
+
+    if workers <= 1:
+        for index, phase in enumerate(phases):
+            entry = cache_lookup(index)
+            if entry is not None:
+                report_cache_hit(index)
+                pairs.update(entry["pairs"])
+                env = entry["env"]
+                yield phase, entry["outputs"], env
+                continue
+            for observer in observers:
+                observer.begin(phase.name)
+            with logged_phase(
+                event_log, phase.name, getattr(config, phase.count_field)
+            ):
+                seed_phase(config.seed, phase.name)
+                outputs = phase.run(env, pairs, config, event_log, observers)
+            cache_store(index, outputs, env)
+            yield phase, outputs, env
+        return
+
+    finished = {}
+    running = {}
+    blocks = {}
+    specs = {}
+    committed = 0
+    pool = ProcessPoolExecutor(max_workers=workers)
+    try:
+        while committed < len(phases):
+            # Bağımlılıkları işlenmiş aşamalar sırayla başlatılır (önbellekte
+            # olanlar hemen tamamlanmış sayılır).
+            for index, phase in enumerate(phases):
+                if len(running) >= workers:
+                    break
+                if index in finished or index in blocks or index < committed:
+                    continue
+                if any(dependency >= committed for dependency in dependencies[index]):
+                    continue
+                entry = cache_lookup(index)
+                if entry is not None:
+                    finished[index] = (entry["outputs"], entry["pairs"], None)
+                    continue
+                blocks[index] = {}
+                shared = {}
+                specs[index] = {}
+                for key in dict.fromkeys((*phase.reads, *phase.writes)):
+                    shared[key] = _share_pair(pairs[key], blocks[index])
+                    specs[index][key] = shared[key][1]
+                event_interval = event_log.interval if event_log is not None else None
+                future = pool.submit(
+                    _phase_worker_run, (phase, env, config, shared, event_interval)
+                )
+                running[future] = index
+
+            if committed not in finished:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = running.pop(future)
+                    outputs, updated, lines = future.result()
+                    # Paylaşımlı bloklardaki güncel tablolar ajanlara kopyalanır.
+                    for key, pair in updated.items():
+                        for (role, attr), (name, _, _) in specs[index][key].items():
+                            agent = getattr(pair, f"agent_{role}")
+                            if getattr(agent, attr) is None:
+                                shape, dtype = specs[index][key][(role, attr)][1:]
+                                setattr(
+                                    agent,
+                                    attr,
+                                    np.ndarray(
+                                        shape,
+                                        dtype=dtype,
+                                        buffer=blocks[index][name].buf,
+                                    ).copy(),
+                                )
+                    for block in blocks.pop(index).values():
+                        block.close()
+                        block.unlink()
+                    finished[index] = (outputs, updated, lines)
+                continue
+
+            while committed in finished:
+                phase = phases[committed]
+                outputs, updated, lines = finished.pop(committed)
+                pairs.update(updated)
+                if lines is None:
+                    report_cache_hit(committed)
+                else:
+                    # Aşama sürecinin olayları bu noktada, bildirim sırasıyla yazılır.
+                    if event_log is not None:
+                        event_log.extend(lines)
+                    cache_store(committed, outputs, env)
+                committed += 1
+                yield phase, outputs, env
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        for phase_blocks in blocks.values():
+            for block in phase_blocks.values():
+                block.close()
+                block.unlink()
+
+
+def run_experiment(config, plot=False, reference=None):
+    # Deney akışı: ajan kurulumu, eğitim, değerlendirme ve çıktı kaydı.
+    # Bu fonksiyon, tüm çıktıları (JSON/CSV/grafikler) aynı isimlerle üretir.
+    # reference: aynı tohumla float32 çalıştırılmış deney (hassasiyet sapması için).
+    env = make_env(config)
+    random.seed(config.seed)
+    np.random.seed(config.seed)
+
+    # Durum sayısı: 3x3 için geçerli tahta konfigürasyonları (yaklaşık 5.478);
+    # m×n×k tahtalarda durumlar tembel indekslenir, tablo başlangıç kapasitesiyle açılır.
+    n_states = env.n_states or LAZY_INITIAL_CAPACITY
+    q_cls, sarsa_cls = learning_agent_classes(config)
+    pairs = {
+        "Q-Learning": build_agent_pair(
+            "Q-Learning", q_cls, "Q", n_states, config, env.n_actions
         ),
-        "SARSA vs Minimax": evaluate_matchup(
-            env, sarsa_pair, minimax_pair, config.tournament_games
+        "SARSA": build_agent_pair(
+            "SARSA", sarsa_cls, "S", n_states, config, env.n_actions
         ),
     }
 
+    training_log = {}
+    histories = {}
+    score_log = {}
+    tournament_log = {}
+    tournament_scores = {}
+    quality_log = {}
+    throughput_log = {}
+
+    # Olay akışı: aşama işaretleri, ara özetler ve turnuva sonuçları diske akar.
+    event_log = open_event_log(config)
+    if event_log is not None:
+        event_log.emit("run_start", config=asdict(config))
+
+    # Optimal referans: sabit rakiplere karşı Q* ve aşama başına uzaklık ölçütleri.
+    baseline = None
+    optimality_log = {}
+    if config.optimal_baseline and is_classic_board(env):
+        baseline = OptimalBaseline(config.gamma)
+
+    # play_episode gözlemcileri: yörünge kaydı ve durum ziyaret sayaçları.
+    # Önbellekten yüklenen aşamalar oynanmadığı için gözlemci varken önbellek atlanır.
+    observers = []
+    recorder = None
+    if config.record_trajectories:
+        recorder = TrajectoryRecorder(
+            Path(config.output_dir) / "trajectories",
+            env,
+            flush_episodes=config.trajectory_flush_episodes,
+        )
+        observers.append(recorder)
+    visitation = None
+    if config.visitation:
+        visitation = VisitationCounter(env.n_states, config.visitation_interval)
+        observers.append(visitation)
+
+    # Aşama grafiği: bağımsız aşamalar (iki self-play, iki baz çizgi, turnuva
+    # karşılaşmaları) phase_workers > 1 iken süreç havuzunda eşzamanlı çalışır.
+    # Gözlemciler ve aktör–öğrenen modu bu süreçte kalmayı gerektirir.
+    workers = config.phase_workers or os.cpu_count() or 1
+    if workers > 1 and (observers or config.actors > 0 or not is_classic_board(env)):
+        print("[phases] gözlemciler/aktörler/m×n×k nedeniyle aşamalar sıralı çalışıyor")
+        workers = 1
+
+    # Sonuç önbelleği: girdileri değişmemiş aşamalar yeniden çalıştırılmaz.
+    cache = open_result_cache(config) if not observers else None
+    for phase, outputs, env in schedule_phases(
+        experiment_phases(env),
+        env,
+        pairs,
+        config,
+        event_log,
+        observers,
+        cache,
+        workers,
+    ):
+        for label, scores in outputs.get("scores", {}).items():
+            score_log[label] = scores
+            record_training_summary(
+                label, scores, config, training_log, histories, event_log
+            )
+        tournament_scores.update(outputs.get("tournament_scores", {}))
+        for label, summary in outputs.get("tournament", {}).items():
+            tournament_log[label] = summary
+            if event_log is not None:
+                event_log.emit("tournament", matchup=label, summary=summary)
+        quality_log.update(outputs.get("policy_quality", {}))
+        throughput_log.update(outputs.get("actor_learner", {}))
+        if baseline is not None and "scores" in outputs:
+            optimality_log[phase.name] = baseline.metrics(pairs)
+            if event_log is not None:
+                event_log.emit(
+                    "optimality", phase=phase.name, metrics=optimality_log[phase.name]
+                )
+
+    q_pair = pairs["Q-Learning"]
+    sarsa_pair = pairs["SARSA"]
+    random_pair = AgentPair("Random", RandomAgent(), RandomAgent())
+
     # Q tablosu varyansı: öğrenmenin yayılımını izlemek için basit ölçüt.
+    learned_agents = (
+        q_pair.agent_x,
+        q_pair.agent_o,
+        sarsa_pair.agent_x,
+        sarsa_pair.agent_o,
+    )
     variance_log = {
-        "Q-X": q_variance(q_pair.agent_x),
-        "Q-O": q_variance(q_pair.agent_o),
-        "SARSA-X": q_variance(sarsa_pair.agent_x),
-        "SARSA-O": q_variance(sarsa_pair.agent_o),
+        "Q-X": q_variance(q_pair.agent_x, env.n_states),
+        "Q-O": q_variance(q_pair.agent_o, env.n_states),
+        "SARSA-X": q_variance(sarsa_pair.agent_x, env.n_states),
+        "SARSA-O": q_variance(sarsa_pair.agent_o, env.n_states),
+    }
+
+    # Bellek muhasebesi: ajan başına depolama türü, satır ve bayt sayısı.
+    memory_log = {agent.name: q_memory(agent) for agent in learned_agents}
+    memory_log["total_bytes"] = sum(
+        memory_log[agent.name]["bytes"] for agent in learned_agents
+    )
+
+    # Ziyaret sayıları açıksa ajan başına (s, a) kapsama istatistikleri.
+    legal_mask = env.legal_action_mask()
+    coverage_log = {
+        agent.name: visit_coverage(agent, env.n_states, legal_mask)
+        for agent in learned_agents
+        if agent.visits is not None
     }
 
     payload = {
@@ -1525,81 +6112,152 @@ def run_experiment(config, plot=False):
         "training": training_log,
         "tournament": tournament_log,
         "q_variance": variance_log,
+        "q_memory": memory_log,
+        "indexed_states": env.n_states,
     }
-
-    json_path = save_json(config.output_dir, payload)
+    # İndirgenmiş eğitim geçmişleri (grafikler bu noktalardan yeniden çizilebilir).
+    payload["histories"] = {
+        label: {key: values.tolist() for key, values in history.items()}
+        for label, history in histories.items()
+    }
+    if quality_log:
+        payload["policy_quality"] = quality_log
+    if coverage_log:
+        payload["visit_coverage"] = coverage_log
+    if visitation is not None:
+        payload["visitation"] = visitation.summary(env)
+        if config.visitation_dump:
+            visitation.dump(Path(config.output_dir) / "visitation")
+    if throughput_log:
+        payload["actor_learner"] = throughput_log
+    if baseline is not None:
+        payload["optimality"] = optimality_log
+    agents = {agent.name: agent for agent in learned_agents}
+    if reference is not None:
+        payload["precision_drift"] = precision_drift(
+            reference, tournament_log, agents, env
+        )
+    if event_log is not None:
+        # Eğitim/turnuva dışındaki bölümler de akışa yazılır (yeniden kurulum için).
+        for name, data in payload.items():
+            if name not in ("config", "training", "tournament", "optimality"):
+                event_log.emit("section", name=name, data=data)
+
+    # Arka plan yazıcısı: dosyalar yazılırken çalışma (veya sonraki deney) sürer.
+    writer = artifact_writer() if config.background_io else None
+    json_path = save_json(config.output_dir, payload, writer=writer)
     csv_rows = [
         {"matchup": label, **summary} for label, summary in tournament_log.items()
     ]
-    csv_path = save_csv(config.output_dir, csv_rows)
+    csv_path = save_csv(config.output_dir, csv_rows, writer=writer)
+
+    # Isı haritaları için ajanların hamle frekansları toplanır (oyun oynatır,
+    # ana süreçte kalır); grafikler ve artefakt paketi aynı sayıları kullanır.
+    heatmap_counts = {}
+    if plot or config.bundle:
+        seed_phase(config.seed, "Heatmaps")
+        for agent, opponent_agent, agent_first in (
+            (q_pair.agent_x, random_pair.agent_o, True),
+            (q_pair.agent_o, random_pair.agent_x, False),
+            (sarsa_pair.agent_x, random_pair.agent_o, True),
+            (sarsa_pair.agent_o, random_pair.agent_x, False),
+        ):
+            heatmap_counts[agent.name] = collect_action_counts(
+                env,
+                agent,
+                opponent_agent,
+                config.tournament_games,
+                agent_first=agent_first,
+            )
 
     plot_paths = []
     if plot:
-        training_plot = plot_training(histories, config.output_dir)
-        tournament_plot = plot_tournament(tournament_log, config.output_dir)
-
-        # Isı haritaları için ajanların hamle frekansları toplanır.
-        q_counts_x = collect_action_counts(
-            env,
-            q_pair.agent_x,
-            random_pair.agent_o,
-            config.tournament_games,
-            agent_first=True,
-        )
-        q_counts_o = collect_action_counts(
-            env,
-            q_pair.agent_o,
-            random_pair.agent_x,
-            config.tournament_games,
-            agent_first=False,
-        )
-        sarsa_counts_x = collect_action_counts(
-            env,
-            sarsa_pair.agent_x,
-            random_pair.agent_o,
-            config.tournament_games,
-            agent_first=True,
-        )
-        sarsa_counts_o = collect_action_counts(
-            env,
-            sarsa_pair.agent_o,
-            random_pair.agent_x,
-            config.tournament_games,
-            agent_first=False,
+        # Çizimlerin kendisi render_plots ile paralel yapılır.
+        plot_tasks = experiment_plot_tasks(
+            histories,
+            tournament_log,
+            quality_log,
+            {
+                key: heatmap_counts[pair.agent_x.name]
+                + heatmap_counts[pair.agent_o.name]
+                for key, pair in pairs.items()
+            },
+            (env.rows, env.cols),
         )
+        plot_options = {
+            "fmt": config.plot_format,
+            "dpi": config.plot_dpi,
+            "workers": config.plot_workers,
+        }
+        if writer is not None:
+            writer.submit(render_plots, plot_tasks, config.output_dir, **plot_options)
+            print(f"Grafikler arka planda çiziliyor: {config.output_dir}")
+        else:
+            plot_paths = render_plots(plot_tasks, config.output_dir, **plot_options)
+
+    # Öğrenmiş ajan çiftleri lig ve sonraki analizler için kaydedilir.
+    agent_paths = []
+    if config.save_agents:
+        for key, pair in pairs.items():
+            filename = key.lower().replace("-", "_") + ".npz"
+            agent_paths.append(
+                save_agent_pair(
+                    pair, env, Path(config.output_dir) / "agents" / filename, writer
+                )
+            )
 
-        q_heatmap = plot_action_heatmap(
-            q_counts_x + q_counts_o,
-            "Q-Learning Hücre Tercihleri",
-            config.output_dir,
-            "heatmap_q.png",
-        )
-        sarsa_heatmap = plot_action_heatmap(
-            sarsa_counts_x + sarsa_counts_o,
-            "SARSA Hücre Tercihleri",
-            config.output_dir,
-            "heatmap_sarsa.png",
+    # Sayısal artefakt paketi: Q tabloları, ham skorlar, geçmişler, ısı haritaları.
+    bundle_path = None
+    if config.bundle:
+        bundle_path = save_bundle(
+            Path(config.output_dir) / BUNDLE_FILE,
+            bundle_arrays(
+                env,
+                learned_agents,
+                score_log,
+                tournament_scores,
+                histories,
+                heatmap_counts,
+            ),
+            {
+                "board": [env.rows, env.cols, env.k],
+                "indexed_states": env.n_states,
+                "seed": config.seed,
+                "pairs": {
+                    key: [pair.agent_x.name, pair.agent_o.name]
+                    for key, pair in pairs.items()
+                },
+            },
+            compress=config.bundle_compress,
+            writer=writer,
         )
 
-        plot_paths = [
-            path
-            for path in (
-                training_plot,
-                tournament_plot,
-                q_heatmap,
-                sarsa_heatmap,
-            )
-            if path
-        ]
+    trajectory_path = recorder.close() if recorder is not None else None
+
+    # Sabit rakiplere karşı Q* tabloları (ajan tablolarıyla aynı düzende).
+    optimal_path = baseline.save(config.output_dir) if baseline is not None else None
+
+    if event_log is not None:
+        event_log.emit("run_end")
+        event_log.close()
 
-    print_summary(training_log, tournament_log)
+    print_summary(training_log, tournament_log, optimality_log)
     print(f"\nSaved JSON: {json_path}")
     print(f"Saved CSV: {csv_path}")
     for path in plot_paths:
         print(f"Saved plot: {path}")
-
-
-def parse_args():
+    for path in agent_paths:
+        print(f"Saved agents: {path}")
+    if optimal_path is not None:
+        print(f"Saved Q*: {optimal_path}")
+    if bundle_path is not None:
+        print(f"Saved bundle: {bundle_path}")
+    if trajectory_path is not None:
+        print(f"Saved trajectories: {trajectory_path}")
+    return ExperimentResult(payload, agents, env)
+
+
+def parse_args(argv=None):
     # CLI ayarları: rapor varsayılanlarıyla uyumlu tutulur.
     # Parametreler eğitimin hızını, keşfi ve çıktıları yönetir.
     parser = argparse.ArgumentParser(description="Tic-Tac-Toe Q-Learning vs SARSA")
@@ -1610,12 +6268,70 @@ def parse_args():
     parser.add_argument("--epsilon-start", type=float, default=1.0)
     parser.add_argument("--epsilon-end", type=float, default=0.01)
     parser.add_argument("--epsilon-decay", type=float, default=0.995)
+    parser.add_argument(
+        "--step-size",
+        choices=STEP_SIZE_CHOICES,
+        default="constant",
+        help="Adım büyüklüğü: sabit alpha, 1/N(s,a) veya 1/N(s,a)^ω (ziyaret sayılı).",
+    )
+    parser.add_argument("--step-size-power", type=float, default=0.8)
+    parser.add_argument(
+        "--visit-counts",
+        action="store_true",
+        help="Sabit alpha ile de N(s,a) sayaçlarını tutar (kapsama istatistikleri).",
+    )
+    # λ > 0: SARSA(λ) ve Watkins Q(λ) (seyrek uygunluk izleri).
+    parser.add_argument("--trace-lambda", type=float, default=0.0)
+    parser.add_argument(
+        "--planning",
+        choices=("none", "dyna", "prioritized"),
+        default="none",
+        help="Q-Learning için model tabanlı planlama: Dyna-Q veya öncelikli süpürme.",
+    )
+    parser.add_argument("--planning-steps", type=int, default=10)
+    parser.add_argument("--planning-theta", type=float, default=1e-4)
+    parser.add_argument(
+        "--compare-planning",
+        action="store_true",
+        help="Deneyden önce planlama modlarının Random'a karşı yakınsamasını karşılaştırır.",
+    )
+    parser.add_argument(
+        "--actors",
+        type=int,
+        default=0,
+        help="Self-play'i bu kadar aktör süreci + tek öğrenen ile çalıştırır (0 = kapalı).",
+    )
+    parser.add_argument("--actor-batch-episodes", type=int, default=16)
+    parser.add_argument("--actor-sync-episodes", type=int, default=64)
+    parser.add_argument(
+        "--phase-workers",
+        type=int,
+        default=1,
+        help="Bağımsız aşamaları bu kadar süreçte eşzamanlı çalıştırır "
+        "(1 = sıralı, 0 = CPU sayısı; sonuçlar aynıdır).",
+    )
+    parser.add_argument(
+        "--afterstate",
+        action="store_true",
+        help="Hamle sonrası tahta değerlerini öğrenen afterstate ajanlarını kullanır.",
+    )
     # Bölüm sayıları: self-play, çapraz eğitim ve random baz çizgisi.
     parser.add_argument("--self-play-episodes", type=int, default=5000)
     parser.add_argument("--cross-play-episodes", type=int, default=5000)
     parser.add_argument("--baseline-episodes", type=int, default=3000)
     # Turnuva, eğitim sonrası değerlendirme oyun sayısıdır.
     parser.add_argument("--tournament-games", type=int, default=500)
+    parser.add_argument(
+        "--adaptive-tournament",
+        dest="tournament_adaptive",
+        action="store_true",
+        help="Karşılaşmaları yığınlarla oynar; aralıklar daralınca veya SPRT "
+        "karar verince durur (--tournament-games üst sınırdır).",
+    )
+    parser.add_argument("--tournament-batch", type=int, default=50)
+    parser.add_argument("--tournament-ci-width", type=float, default=0.1)
+    parser.add_argument("--tournament-confidence", type=float, default=0.95)
+    parser.add_argument("--tournament-sprt-delta", type=float, default=0.1)
     # Hareketli ortalama penceresi eğitim grafiğini pürüzsüzleştirir.
     parser.add_argument("--moving-avg-window", type=int, default=200)
     parser.add_argument(
@@ -1625,6 +6341,89 @@ def parse_args():
         help="Eğitim sırasında çıktı aralığı (0 = kapalı).",
     )
     parser.add_argument("--convergence-threshold", type=float, default=0.8)
+    # Tahta boyutu: varsayılan klasik 3x3x3; örn. 4x4x4 veya 5x5x4 denenebilir.
+    parser.add_argument("--board-rows", type=int, default=3)
+    parser.add_argument("--board-cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    # Q depolama: dense (varsayılan) veya yalnızca ziyaret edilen durumlar için sparse.
+    parser.add_argument("--q-storage", choices=Q_STORAGE_CHOICES, default="dense")
+    # Q saklama tipi: float16/int16 belleği yarıya indirir (güncellemeler float64).
+    parser.add_argument("--q-dtype", choices=Q_DTYPE_CHOICES, default="float32")
+    parser.add_argument("--q-int16-scale", type=float, default=DEFAULT_INT16_Q_SCALE)
+    parser.add_argument(
+        "--compare-precision",
+        action="store_true",
+        help="Aynı tohumla float32 referansı da çalıştırıp turnuva ve greedy politika "
+        "sapmasını results.json'a yazar.",
+    )
+    # Olay akışı: output_dir/events.jsonl (uzun eğitimlerde ilerleme ve çökme güvencesi).
+    parser.add_argument(
+        "--no-event-log",
+        dest="event_log",
+        action="store_false",
+        help="events.jsonl olay akışını kapatır.",
+    )
+    parser.add_argument("--event-interval", type=int, default=100)
+    parser.add_argument("--event-flush-every", type=int, default=64)
+    parser.add_argument("--event-flush-seconds", type=float, default=5.0)
+    # Sonuç önbelleği: aynı Config ile tekrar çalıştırmada eğitim atlanır.
+    parser.add_argument(
+        "--no-cache",
+        dest="cache",
+        action="store_false",
+        help="Önbelleği atla (okuma/yazma yapılmaz).",
+    )
+    parser.add_argument(
+        "--clear-cache",
+        action="store_true",
+        help="Çalıştırmadan önce önbellek klasörünü temizler.",
+    )
+    parser.add_argument("--cache-dir", type=str, default=".rl_cache")
+    parser.add_argument("--cache-max-mb", type=float, default=512.0)
+    parser.add_argument(
+        "--no-save-agents",
+        dest="save_agents",
+        action="store_false",
+        help="Ajan çiftlerini (outputs/agents/*.npz) kaydetmez.",
+    )
+    parser.add_argument(
+        "--quality-interval",
+        type=int,
+        default=100,
+        help="Her N bölümde minimax-optimal greedy hamle oranını ölçer (0 = kapalı).",
+    )
+    parser.add_argument(
+        "--history-points",
+        type=int,
+        default=2000,
+        help="Eğitim geçmişi başına saklanan/çizilen nokta sayısı (0 = tümü).",
+    )
+    parser.add_argument(
+        "--history-downsample", choices=HISTORY_DOWNSAMPLE_CHOICES, default="lttb"
+    )
+    parser.add_argument(
+        "--visitation",
+        action="store_true",
+        help="Aşama/ajan başına durum ziyaret kapsamasını results.json'a yazar.",
+    )
+    parser.add_argument("--visitation-interval", type=int, default=500)
+    parser.add_argument(
+        "--visitation-dump",
+        action="store_true",
+        help="Ham ziyaret sayaçlarını visitation/*.npy olarak kaydeder.",
+    )
+    parser.add_argument(
+        "--record-trajectories",
+        action="store_true",
+        help="Eğitim ve turnuva oyunlarını ikili yörünge günlüğüne kaydeder.",
+    )
+    parser.add_argument("--trajectory-flush-episodes", type=int, default=4096)
+    parser.add_argument(
+        "--no-optimal-baseline",
+        dest="optimal_baseline",
+        action="store_false",
+        help="Sabit rakiplere karşı Q* hesaplamasını ve hata ölçütlerini kapatır.",
+    )
     parser.add_argument("--seed", type=int, default=42)
     parser.add_argument("--output-dir", type=str, default="outputs")
     # Görselleştirme varsayılan olarak açık; gerekirse --no-plot ile kapatılır.
@@ -1642,28 +6441,545 @@ def parse_args():
         help="Görselleştirmeyi kapatır.",
     )
     parser.set_defaults(plot=True)
-    return parser.parse_args()
+    parser.add_argument("--plot-format", choices=PLOT_FORMATS, default="png")
+    parser.add_argument(
+        "--no-background-io",
+        dest="background_io",
+        action="store_false",
+        help="Artefaktları arka plan iş parçacığı yerine sırayla yazar.",
+    )
+    parser.add_argument(
+        "--no-bundle",
+        dest="bundle",
+        action="store_false",
+        help="Q tabloları/skorlar/geçmişler için artifacts.npz paketini yazmaz.",
+    )
+    parser.add_argument(
+        "--bundle-compress",
+        action="store_true",
+        help="Artefakt paketini sıkıştırır (diziler bellek eşlemli açılamaz).",
+    )
+    parser.add_argument("--plot-dpi", type=int, default=300)
+    parser.add_argument(
+        "--plot-workers",
+        type=int,
+        default=0,
+        help="Grafikleri çizen süreç sayısı (0 = otomatik, 1 = sıralı).",
+    )
+    args = parser.parse_args(argv)
+    # Uyarlanır turnuva: yığın boşsa döngü ilerlemez, güven 1 iken SPRT sınırı sonsuzdur.
+    if args.tournament_batch < 1:
+        raise SystemExit("--tournament-batch en az 1 olmalı")
+    if not 0.0 < args.tournament_confidence < 1.0:
+        raise SystemExit("--tournament-confidence (0, 1) aralığında olmalı")
+    if not 0.0 < args.tournament_sprt_delta < 0.5:
+        raise SystemExit("--tournament-sprt-delta (0, 0.5) aralığında olmalı")
+    if args.tournament_ci_width <= 0.0:
+        raise SystemExit("--tournament-ci-width pozitif olmalı")
+    return args
+
+
+def rebuild_results_command(argv):
+    # Alt komut: events.jsonl akışından results.json'u yeniden üretir.
+    parser = argparse.ArgumentParser(
+        prog="tictactoe_rl.py rebuild-results",
+        description="JSONL olay akışından results.json üretir.",
+    )
+    parser.add_argument("events", type=str, help="events.jsonl yolu")
+    parser.add_argument(
+        "--output",
+        type=str,
+        default=None,
+        help="Çıktı dosyası (varsayılan: olay dosyasının klasöründe results.json).",
+    )
+    args = parser.parse_args(argv)
+    payload = results_from_events(args.events)
+    output = (
+        Path(args.output) if args.output else Path(args.events).parent / "results.json"
+    )
+    path = save_json(output.parent, payload, filename=output.name)
+    if not payload["complete"]:
+        print("Uyarı: çalışma tamamlanmamış; yalnızca biten aşamalar yazıldı.")
+    print(f"Saved JSON: {path}")
+
+
+REPORT_OUTPUTS = ("summary", "csv", "training", "tournament", "heatmaps", "quality")
+
+
+def report_command(argv):
+    # Alt komut: kayıtlı artefaktlardan grafikleri, CSV'yi ve özeti yeniden üretir.
+    # Yalnızca istenen çıktının ihtiyacı okunur: özet/CSV/turnuva results.json'dan,
+    # ısı haritaları (ve varsa tam dtype'lı geçmişler) artifacts.npz'den gelir.
+    parser = argparse.ArgumentParser(
+        prog="tictactoe_rl.py report",
+        description="Önceki bir çalışmanın artefaktlarından raporu yeniden üretir.",
+    )
+    parser.add_argument("run_dir", type=str, help="results.json içeren çalışma klasörü")
+    parser.add_argument(
+        "--only",
+        nargs="+",
+        choices=REPORT_OUTPUTS,
+        default=list(REPORT_OUTPUTS),
+        help="Yalnızca bu çıktıları üretir (varsayılan: hepsi).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        type=str,
+        default=None,
+        help="Çıktı klasörü (varsayılan: çalışma klasörü).",
+    )
+    parser.add_argument("--plot-format", choices=PLOT_FORMATS, default="png")
+    parser.add_argument("--plot-dpi", type=int, default=300)
+    parser.add_argument("--plot-workers", type=int, default=0)
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Girdisi değişmemiş grafikleri de yeniden çizer (ör. çizim kodu değiştiyse).",
+    )
+    args = parser.parse_args(argv)
+
+    run_dir = Path(args.run_dir)
+    output_dir = Path(args.output_dir) if args.output_dir else run_dir
+    outputs = set(args.only)
+    results_path = run_dir / "results.json"
+    if not results_path.exists():
+        raise SystemExit(f"{results_path} bulunamadı.")
+    results = json.loads(results_path.read_text(encoding="utf-8"))
+    tournament = results.get("tournament", {})
+
+    bundle = None
+    bundle_path = run_dir / BUNDLE_FILE
+    if outputs & {"training", "heatmaps"} and bundle_path.exists():
+        bundle = ArtifactBundle(bundle_path)
+
+    tasks = []
+    if "training" in outputs:
+        if bundle is not None:
+            histories = {
+                label: {key: np.array(values) for key, values in history.items()}
+                for label, history in bundle.histories().items()
+            }
+        else:
+            histories = {
+                label: {key: np.array(values) for key, values in history.items()}
+                for label, history in results.get("histories", {}).items()
+            }
+        tasks.append(("training", plot_training, {"histories": histories}))
+    if "tournament" in outputs:
+        tasks.append(("tournament", plot_tournament, {"tournament": tournament}))
+    if "quality" in outputs:
+        tasks.append(
+            (
+                "policy_quality",
+                plot_policy_quality,
+                {"quality": results.get("policy_quality", {})},
+            )
+        )
+    if "heatmaps" in outputs:
+        if bundle is None:
+            print(f"Uyarı: {bundle_path} yok; ısı haritaları atlandı.")
+        else:
+            counts = bundle.group("heatmap")
+            rows, cols, _ = bundle.manifest["board"]
+            heatmaps = {
+                key: sum(np.array(counts[name]) for name in names)
+                for key, names in bundle.manifest["pairs"].items()
+                if all(name in counts for name in names)
+            }
+            tasks.extend(
+                task
+                for task in experiment_plot_tasks({}, {}, {}, heatmaps, (rows, cols))
+                if task[1] is plot_action_heatmap
+            )
+    if bundle is not None:
+        bundle.close()
+
+    if tasks and args.force:
+        hash_path = output_dir / PLOT_HASH_FILE
+        if hash_path.exists():
+            hashes = json.loads(hash_path.read_text(encoding="utf-8"))
+            for name, _, _ in tasks:
+                hashes.pop(f"{name}.{args.plot_format}", None)
+            atomic_write(hash_path, lambda handle: json.dump(hashes, handle, indent=2))
+    plot_paths = render_plots(
+        tasks, output_dir, args.plot_format, args.plot_dpi, args.plot_workers
+    )
+
+    csv_path = None
+    if "csv" in outputs and tournament:
+        csv_rows = [
+            {"matchup": label, **summary} for label, summary in tournament.items()
+        ]
+        csv_path = save_csv(output_dir, csv_rows)
+
+    if "summary" in outputs:
+        print_summary(
+            results.get("training", {}), tournament, results.get("optimality")
+        )
+        print()
+    if csv_path is not None:
+        print(f"Saved CSV: {csv_path}")
+    for path in plot_paths:
+        print(f"Saved plot: {path}")
+
+
+def league_command(argv):
+    # Alt komut: kayıtlı ajanlar arasında tam devre lig ve Bradley–Terry/Elo puanları.
+    parser = argparse.ArgumentParser(
+        prog="tictactoe_rl.py league",
+        description="Kayıtlı ajanlar arasında tam devre lig (süreç havuzunda).",
+    )
+    parser.add_argument(
+        "entries",
+        nargs="+",
+        help=".npz ajan dosyaları veya klasörleri (içindeki *.npz); "
+        "yerleşik rakipler için 'random' / 'minimax'.",
+    )
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--board-rows", type=int, default=3)
+    parser.add_argument("--board-cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--output-dir", type=str, default="outputs/league")
+    args = parser.parse_args(argv)
+
+    entries = expand_league_entries(args.entries)
+    if len(entries) < 2:
+        raise SystemExit("Lig için en az iki katılımcı gerekir.")
+    dims = (args.board_rows, args.board_cols, args.win_length)
+    if "minimax" in entries and dims != CLASSIC_DIMS:
+        raise SystemExit("Minimax yalnızca klasik 3x3 tahtada kullanılabilir.")
+
+    start = time.perf_counter()
+    league = run_league(entries, args.games, args.workers, args.seed, dims)
+    elapsed = time.perf_counter() - start
+    paths = save_league(args.output_dir, league)
+
+    n = len(entries)
+    print(f"Lig: {n} katılımcı, {n * (n - 1) // 2} eşleşme, {elapsed:.1f} sn")
+    for name, rating in sorted(league["ratings"].items(), key=lambda item: -item[1]):
+        print(f"- {name}: {rating:.1f}")
+    for path in paths:
+        print(f"Saved: {path}")
+
+
+def match_command(argv):
+    # Alt komut: harici bot süreçlerini kayıtlı/yerleşik ajanlara karşı oynatır.
+    parser = argparse.ArgumentParser(
+        prog="tictactoe_rl.py match",
+        description="Harici botları (stdin/stdout satır protokolü) ajanlara karşı "
+        "eşzamanlı oyunlarla dener.",
+    )
+    parser.add_argument(
+        "bots",
+        nargs="+",
+        help="Bot komut satırları (tırnak içinde, ör. 'python bots/greedy.py').",
+    )
+    parser.add_argument(
+        "--opponents",
+        nargs="+",
+        default=["outputs/agents"],
+        help=".npz ajan dosyaları veya klasörleri; yerleşik rakipler için "
+        "'random' / 'minimax'.",
+    )
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Eşleşme başına eşzamanlı oyun (bot süreci) sayısı.",
+    )
+    parser.add_argument(
+        "--move-time",
+        type=float,
+        default=1.0,
+        help="Hamle başına süre sınırı (sn); aşılırsa bot hükmen kaybeder.",
+    )
+    parser.add_argument(
+        "--startup-time",
+        type=float,
+        default=10.0,
+        help="Bot sürecinin 'ready' yanıtı için süre sınırı (sn).",
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--board-rows", type=int, default=3)
+    parser.add_argument("--board-cols", type=int, default=3)
+    parser.add_argument("--win-length", type=int, default=3)
+    parser.add_argument("--output-dir", type=str, default="outputs/match")
+    args = parser.parse_args(argv)
+
+    entries = expand_league_entries(args.opponents)
+    if not entries:
+        raise SystemExit("Maç için en az bir rakip gerekir.")
+    if args.games < 1 or args.concurrency < 1:
+        raise SystemExit("--games ve --concurrency pozitif olmalı")
+    if args.move_time <= 0 or args.startup_time <= 0:
+        raise SystemExit("--move-time ve --startup-time pozitif olmalı")
+    dims = (args.board_rows, args.board_cols, args.win_length)
+    if "minimax" in entries and dims != CLASSIC_DIMS:
+        raise SystemExit("Minimax yalnızca klasik 3x3 tahtada kullanılabilir.")
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    env = MNKEnv(*dims) if dims != CLASSIC_DIMS else TicTacToeEnv()
+    opponents = {
+        name: league_entry_pair(entry, env)
+        for name, entry in zip(league_names(entries), entries)
+    }
+    try:
+        report = asyncio.run(
+            run_external_matches(
+                env,
+                args.bots,
+                opponents,
+                args.games,
+                args.concurrency,
+                args.move_time,
+                args.startup_time,
+            )
+        )
+    except (OSError, RuntimeError) as exc:
+        raise SystemExit(f"Bot başlatılamadı: {exc}")
+    paths = save_match(args.output_dir, report)
+
+    for match in report["matches"]:
+        forfeits = ", ".join(
+            f"{kind}={count}" for kind, count in match["forfeits"].items() if count
+        )
+        print(
+            f"{match['bot']} vs {match['opponent']}: "
+            f"W {match['win_rate']:.3f} / D {match['draw_rate']:.3f} / "
+            f"L {match['loss_rate']:.3f}"
+            + (f" (hükmen: {forfeits})" if forfeits else "")
+        )
+    for command, stats in report["bots"].items():
+        latency = (
+            f", gecikme ort {stats['latency_mean_ms']:.1f} ms, "
+            f"p95 {stats['latency_p95_ms']:.1f} ms, maks {stats['latency_max_ms']:.1f} ms"
+            if stats["moves"]
+            else ""
+        )
+        print(
+            f"- {command}: {stats['games_per_sec']:.1f} oyun/sn, "
+            f"{stats['moves_per_sec']:.1f} hamle/sn{latency}"
+        )
+    for path in paths:
+        print(f"Saved: {path}")
+
+
+def offline_command(argv):
+    # Alt komut: kayıtlı yörüngelerden yeniden oynamadan Q-Learning/SARSA eğitimi.
+    parser = argparse.ArgumentParser(
+        prog="tictactoe_rl.py offline",
+        description="Kayıtlı yörüngelerden offline toplu Q-Learning / SARSA.",
+    )
+    parser.add_argument("trajectories", type=str, help="trajectories/ klasörü")
+    parser.add_argument("--algorithm", choices=("q", "sarsa", "both"), default="both")
+    parser.add_argument("--method", choices=OFFLINE_METHODS, default="fqi")
+    parser.add_argument("--alpha", type=float, default=1.0)
+    parser.add_argument("--gamma", type=float, default=0.95)
+    parser.add_argument("--iterations", type=int, default=30)
+    parser.add_argument("--chunk-episodes", type=int, default=65536)
+    parser.add_argument(
+        "--tags",
+        nargs="+",
+        default=None,
+        help="Yalnızca bu etiketli bölümler (ör. 'Q self-play' 'Cross-play').",
+    )
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", type=str, default="outputs/offline")
+    args = parser.parse_args(argv)
+    if not 0.0 < args.alpha <= 1.0:
+        raise SystemExit("--alpha (0, 1] aralığında olmalı")
+    if not 0.0 <= args.gamma <= 1.0:
+        raise SystemExit("--gamma [0, 1] aralığında olmalı")
+
+    random.seed(args.seed)
+    np.random.seed(args.seed)
+    log = TrajectoryLog(args.trajectories)
+    env = offline_env(log)
+    n_states = max(env.n_states, 1)
+    legal_mask = env.legal_action_mask()
+    algorithms = ("q", "sarsa") if args.algorithm == "both" else (args.algorithm,)
+    specs = {
+        "q": ("Q-Learning", QLearningAgent, "Offline-Q", "offline_q"),
+        "sarsa": ("SARSA", SarsaAgent, "Offline-SARSA", "offline_sarsa"),
+    }
 
+    pairs = {}
+    fits = {}
+    for algorithm in algorithms:
+        name, agent_cls, prefix, filename = specs[algorithm]
+        start = time.perf_counter()
+        tables, residuals, coverage = fit_offline(
+            log,
+            algorithm,
+            n_states,
+            legal_mask,
+            alpha=args.alpha,
+            gamma=args.gamma,
+            iterations=args.iterations,
+            method=args.method,
+            chunk_episodes=args.chunk_episodes,
+            tags=args.tags,
+        )
+        elapsed = time.perf_counter() - start
+        pairs[name] = offline_agent_pair(
+            name, agent_cls, prefix, tables, args.alpha, args.gamma
+        )
+        path = save_agent_pair(
+            pairs[name], env, Path(args.output_dir) / "agents" / f"{filename}.npz"
+        )
+        fits[name] = {
+            "residuals": residuals,
+            "visited_pairs": coverage,
+            "seconds": elapsed,
+        }
+        print(
+            f"[{name}] {args.iterations} tarama, {elapsed:.2f} sn, "
+            f"son artık {residuals[-1] if residuals else 0.0:.2e}"
+        )
+        print(f"Saved agents: {path}")
 
-def main():
-    args = parse_args()
+    payload = {
+        "source": str(log.directory),
+        "episodes": len(log),
+        "moves": int(log.meta["moves"]),
+        "method": args.method,
+        "alpha": args.alpha,
+        "gamma": args.gamma,
+        "iterations": args.iterations,
+        "tags": args.tags,
+        "fits": fits,
+    }
+    if is_classic_board(env):
+        payload["optimality"] = OptimalBaseline(args.gamma).metrics(pairs)
+
+    tournament_log = {}
+    if args.games > 0:
+        # Mevcut turnuva kodu: eksik algoritma varsa yalnızca ilgili eşleşmeler.
+        random_pair = AgentPair("Random", RandomAgent(), RandomAgent())
+        minimax_pair = AgentPair("Minimax", MinimaxAgent(), MinimaxAgent())
+        matchups = []
+        for name, short in (("Q-Learning", "Q"), ("SARSA", "SARSA")):
+            if name in pairs:
+                matchups.append((f"{short} vs Random", pairs[name], random_pair))
+                if is_classic_board(env):
+                    matchups.append((f"{short} vs Minimax", pairs[name], minimax_pair))
+        if len(pairs) == 2:
+            matchups.append(("Q vs SARSA", pairs["Q-Learning"], pairs["SARSA"]))
+        for label, pair_a, pair_b in matchups:
+            tournament_log[label] = evaluate_matchup(env, pair_a, pair_b, args.games)
+        payload["tournament"] = tournament_log
+        csv_rows = [
+            {"matchup": label, **summary} for label, summary in tournament_log.items()
+        ]
+        print(f"Saved CSV: {save_csv(args.output_dir, csv_rows)}")
+    optimality = payload.get("optimality")
+    print_summary({}, tournament_log, {"offline": optimality} if optimality else None)
+    print(f"Saved JSON: {save_json(args.output_dir, payload, 'offline.json')}")
+
+
+# Alt komutlar: ilk argüman bunlardan biriyse deney yerine ilgili komut çalışır.
+SUBCOMMANDS = {
+    "rebuild-results": rebuild_results_command,
+    "league": league_command,
+    "report": report_command,
+    "offline": offline_command,
+    "match": match_command,
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv[1:])
+        return
+    args = parse_args(argv)
     config = Config(
         alpha=args.alpha,
         gamma=args.gamma,
         epsilon_start=args.epsilon_start,
         epsilon_end=args.epsilon_end,
         epsilon_decay=args.epsilon_decay,
+        step_size=args.step_size,
+        step_size_power=args.step_size_power,
+        visit_counts=args.visit_counts,
+        trace_lambda=args.trace_lambda,
+        afterstate=args.afterstate,
+        planning=args.planning,
+        planning_steps=args.planning_steps,
+        planning_theta=args.planning_theta,
         self_play_episodes=args.self_play_episodes,
+        actors=args.actors,
+        actor_batch_episodes=args.actor_batch_episodes,
+        actor_sync_episodes=args.actor_sync_episodes,
+        phase_workers=args.phase_workers,
         cross_play_episodes=args.cross_play_episodes,
         baseline_episodes=args.baseline_episodes,
         tournament_games=args.tournament_games,
+        tournament_adaptive=args.tournament_adaptive,
+        tournament_batch=args.tournament_batch,
+        tournament_ci_width=args.tournament_ci_width,
+        tournament_confidence=args.tournament_confidence,
+        tournament_sprt_delta=args.tournament_sprt_delta,
         moving_avg_window=args.moving_avg_window,
+        history_points=args.history_points,
+        history_downsample=args.history_downsample,
         log_interval=args.log_interval,
         convergence_threshold=args.convergence_threshold,
+        board_rows=args.board_rows,
+        board_cols=args.board_cols,
+        win_length=args.win_length,
+        q_storage=args.q_storage,
+        q_dtype=args.q_dtype,
+        q_int16_scale=args.q_int16_scale,
+        event_log=args.event_log,
+        event_interval=args.event_interval,
+        event_flush_every=args.event_flush_every,
+        event_flush_seconds=args.event_flush_seconds,
+        cache=args.cache,
+        cache_dir=args.cache_dir,
+        cache_max_mb=args.cache_max_mb,
+        save_agents=args.save_agents,
+        background_io=args.background_io,
+        bundle=args.bundle,
+        bundle_compress=args.bundle_compress,
+        plot_format=args.plot_format,
+        plot_dpi=args.plot_dpi,
+        plot_workers=args.plot_workers,
+        optimal_baseline=args.optimal_baseline,
+        visitation=args.visitation or args.visitation_dump,
+        visitation_interval=args.visitation_interval,
+        visitation_dump=args.visitation_dump,
+        record_trajectories=args.record_trajectories,
+        trajectory_flush_episodes=args.trajectory_flush_episodes,
+        quality_interval=args.quality_interval,
         seed=args.seed,
         output_dir=args.output_dir,
     )
-    run_experiment(config, plot=args.plot)
+    if args.clear_cache:
+        ResultCache(config.cache_dir, 0).clear()
+    if args.compare_planning:
+        # Planlayıcılar ile düz Q-Learning: Random'a karşı yakınsama bölümleri.
+        save_json(config.output_dir, compare_planning(config), "planning.json")
+    reference = None
+    if args.compare_precision and config.q_dtype != "float32":
+        # Referans: aynı ayarlar ve tohum, yalnızca float32 saklama (alt klasöre).
+        reference = run_experiment(
+            replace(
+                config,
+                q_dtype="float32",
+                output_dir=str(Path(config.output_dir) / "float32_reference"),
+            ),
+            plot=False,
+        )
+    run_experiment(config, plot=args.plot, reference=reference)
+    if config.background_io:
+        # Kuyruktaki artefaktlar yazılmadan çıkılmaz; yazma hataları burada yüzeye çıkar.
+        artifact_writer().flush()
 
 
 if __name__ == "__main__":